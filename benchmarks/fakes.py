@@ -0,0 +1,119 @@
+import fnmatch
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from utils.tracing import get_tracer
+
+# Files and directories the real tools leave behind, keyed by a command pattern.
+# Later handlers (and resume validation) rely on them being present.
+DEFAULT_ARTIFACTS = {
+    "git init*": [".git/"],
+    "*django startproject*": ["manage.py", "app/__init__.py", "app/settings.py", "app/urls.py"],
+    "*pipenv install *": ["Pipfile", "Pipfile.lock", ".venv/"],
+    "*requirements > requirements.txt*": ["requirements.txt"],
+    "*compile*requirements.in*": ["requirements.txt"],
+    "*venv*.venv*": [".venv/"],
+    "cp requirements.txt constraints.txt*": ["constraints.txt"],
+    "*pyproject.toml*": ["pyproject.toml"],
+    "*alembic init*": ["migrations/env.py"],
+    # Frontend scaffolds run in the project root and name the frontend directory
+    "npx create-react-app * --use-npm": ["frontend/package.json", "frontend/package-lock.json",
+                                         "frontend/src/index.tsx", "frontend/node_modules/"],
+    "npx create-react-app *": ["frontend/package.json", "frontend/yarn.lock", "frontend/src/index.tsx",
+                               "frontend/node_modules/"],
+    "cd frontend && pnpm import*": ["frontend/pnpm-lock.yaml"],
+    "* create vite*": ["frontend/package.json", "frontend/src/main.tsx"],
+    "cd frontend && * npm install": ["frontend/package-lock.json", "frontend/node_modules/"],
+    "cd frontend && * yarn install": ["frontend/yarn.lock", "frontend/node_modules/"],
+    "cd frontend && * pnpm install": ["frontend/pnpm-lock.yaml", "frontend/node_modules/"],
+    "npm install*": ["node_modules/.package-lock.json"],
+    "yarn add *": ["node_modules/.yarn-integrity"],
+    "pnpm add *": ["node_modules/.modules.yaml"],
+}
+
+
+class FakeCommandRunner:
+    """
+    Deterministic stand-in for `utils.helpers.run_command`.
+
+    Each command sleeps for a configurable duration instead of running, then creates
+    the artifacts the real tool would have produced. Durations are matched with
+    fnmatch patterns against the command line; the first match wins.
+    """
+
+    def __init__(self, durations=None, default_duration=0.0, artifacts=None):
+        """
+        :param durations: Mapping of command pattern to simulated seconds.
+        :param default_duration: Seconds for commands matching no pattern.
+        :param artifacts: Mapping of command pattern to relative paths to create ('/' suffix for directories).
+        """
+        self.durations = durations or {}
+        self.default_duration = default_duration
+        self.artifacts = DEFAULT_ARTIFACTS if artifacts is None else artifacts
+        self.calls = []
+
+    def __call__(self, command, description, cwd=None):
+        with get_tracer().span(description, category="command", command=command, cwd=str(cwd or "")) as span:
+            duration = self._match(self.durations, command, self.default_duration)
+            time.sleep(duration)
+            for relative in self._match(self.artifacts, command, []):
+                self._create(Path(cwd or "."), relative)
+            span.set_attributes(exit_code=0, stdout_bytes=0, stderr_bytes=0, simulated=True)
+        self.calls.append({"command": command, "description": description, "duration": duration})
+
+    @staticmethod
+    def _match(table, command, default):
+        for pattern, value in table.items():
+            if fnmatch.fnmatch(command, pattern):
+                return value
+        return default
+
+    @staticmethod
+    def _create(root, relative):
+        path = root / relative
+        if relative.endswith("/"):
+            path.mkdir(parents=True, exist_ok=True)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.touch()
+
+
+class FakeChatClient:
+    """
+    Stand-in for the OpenAI client exposing `chat.completions.create`.
+
+    Replies with a canned refinement of the last user message after a fixed latency
+    and reports token usage the way the API does.
+    """
+
+    def __init__(self, latency=0.0, responses=None):
+        """
+        :param latency: Seconds each completion takes.
+        :param responses: Optional list of canned responses, used in rotation.
+        """
+        self.latency = latency
+        self.responses = responses or []
+        self.requests = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, **kwargs):
+        time.sleep(self.latency)
+        self.requests += 1
+        if self.responses:
+            content = self.responses[(self.requests - 1) % len(self.responses)]
+        else:
+            # "Project name: My Project" -> "My Project"
+            last_user = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+            content = last_user.split(": ", 1)[-1]
+        prompt_tokens = sum(len(m["content"].split()) for m in messages)
+        completion_tokens = len(content.split())
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens,
+                prompt_tokens_details=SimpleNamespace(cached_tokens=0),
+            ),
+        )
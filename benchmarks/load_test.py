@@ -0,0 +1,171 @@
+"""
+Drive concurrent AIManager sessions against an OpenAI-compatible endpoint.
+
+By default a local stub server is started in-process:
+
+    python -m benchmarks.load_test --sessions 16 --turns 5 --latency lognormal:0.3:0.4 --rate-limit-rate 0.02
+
+Use --base-url to target an already running server instead. Each session owns
+its own AIManager (memory, persona and client), so the run exercises the same
+code path as interactive use.
+"""
+import argparse
+import json
+import logging
+import math
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks.openai_stub_server import add_stub_arguments, start_server, state_from_args
+from llm.accounting.usage_ledger import get_run_ledger
+from utils.helpers import STATE_DIR
+
+DEFAULT_CONFIG = Path("llm/config/config.json")
+
+
+def percentile(values, fraction):
+    """
+    Nearest-rank percentile of a list of numbers.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def write_session_config(base_config, base_url, reflection, stream, directory):
+    """
+    Copy the AI configuration, pointed at the load-test endpoint.
+
+    Cold storage is dropped so concurrent sessions do not append to the same archive.
+    """
+    with open(base_config, "r") as f:
+        config = json.load(f)
+    config["base_url"] = base_url
+    config["stream"] = stream
+    config.pop("usage", None)  # Reported below rather than persisted
+    config.setdefault("reflection", {})["background"] = reflection
+    config.get("memory", {}).get("compaction", {}).pop("cold_storage_path", None)
+    path = Path(directory) / "config.json"
+    with open(path, "w") as f:
+        json.dump(config, f, indent=2)
+    return path
+
+
+def run_session(session_id, config_path, turns, start_barrier):
+    from llm.ai_manager import AIManager
+
+    try:
+        manager = AIManager(str(config_path))
+    except BaseException:
+        start_barrier.abort()  # Release the other sessions instead of deadlocking
+        raise
+    latencies, errors = [], 0
+    start_barrier.wait()
+    try:
+        for turn in range(turns):
+            started = time.perf_counter()
+            try:
+                manager.interact(f"Session {session_id} turn {turn}: describe the next setup step.")
+                latencies.append(time.perf_counter() - started)
+            except Exception as e:
+                errors += 1
+                logging.warning(f"Session {session_id} turn {turn} failed: {e}")
+    finally:
+        manager.shutdown()
+    return latencies, errors
+
+
+def run_load_test(config_path, sessions, turns):
+    """
+    Run `sessions` concurrent sessions of `turns` interactions each.
+
+    :return: Summary with latency percentiles (seconds) and throughput.
+    """
+    start_barrier = threading.Barrier(sessions + 1)
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        futures = [pool.submit(run_session, i, config_path, turns, start_barrier) for i in range(sessions)]
+        # Managers are built before the clock starts so setup cost is not measured
+        try:
+            start_barrier.wait()
+        except threading.BrokenBarrierError:
+            pass  # A session failed to start; its future raises below
+        started = time.perf_counter()
+        results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - started
+
+    latencies = [latency for session_latencies, _ in results for latency in session_latencies]
+    errors = sum(session_errors for _, session_errors in results)
+    return {
+        "sessions": sessions,
+        "turns": turns,
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_s": {
+            "mean": statistics.mean(latencies) if latencies else None,
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": max(latencies) if latencies else None,
+        },
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test AIManager against an OpenAI-compatible endpoint.")
+    parser.add_argument("--sessions", type=int, default=8, help="Concurrent sessions.")
+    parser.add_argument("--turns", type=int, default=5, help="Interactions per session.")
+    parser.add_argument("--config", default=str(DEFAULT_CONFIG), help="AI configuration to copy.")
+    parser.add_argument("--base-url", help="Existing endpoint to target instead of starting the local stub.")
+    parser.add_argument("--reflection", action="store_true", help="Keep background reflection enabled.")
+    parser.add_argument("--stream", action="store_true", help="Stream completions (measures time-to-first-token).")
+    parser.add_argument("--output", help="Report path (default: .boilerplate/benchmarks/load-<timestamp>.json).")
+    add_stub_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server, base_url = start_server(state_from_args(args))
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="boilerplate-load-") as directory:
+            config_path = write_session_config(args.config, base_url, args.reflection, args.stream, directory)
+            summary = run_load_test(config_path, args.sessions, args.turns)
+        summary["usage"] = get_run_ledger().summary()
+        if server is not None:
+            summary["server"] = server.state.stats
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    latency = summary["latency_s"]
+    print(f"{summary['requests']} requests from {summary['sessions']} sessions in {summary['elapsed_s']:.2f}s "
+          f"({summary['throughput_rps']:.1f} req/s, {summary['errors']} errors)")
+    if latency["p50"] is not None:
+        print(f"latency p50 {latency['p50'] * 1000:.0f} ms  p95 {latency['p95'] * 1000:.0f} ms  "
+              f"p99 {latency['p99'] * 1000:.0f} ms  max {latency['max'] * 1000:.0f} ms")
+
+    summary["meta"] = {"timestamp": time.time(), "base_url": base_url, "latency": args.latency,
+                       "error_rate": args.error_rate, "rate_limit_rate": args.rate_limit_rate}
+    output = Path(args.output or STATE_DIR / "benchmarks" / f"load-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(summary, f, indent=2)
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Local stand-in for the OpenAI chat-completions API.
+
+    python -m benchmarks.openai_stub_server --port 8089 --latency lognormal:0.4:0.5 --rate-limit-rate 0.05
+
+Point the generator at it with "base_url": "http://127.0.0.1:8089/v1" in
+llm/config/config.json (or OPENAI_BASE_URL). Supports streaming, configurable
+latency distributions, injected 5xx and 429 responses and token accounting
+(GET /stats).
+"""
+import argparse
+import json
+import logging
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class LatencyDistribution:
+    """
+    Samples response latencies in seconds.
+
+    Spec format: "fixed:S", "uniform:LOW:HIGH", "normal:MEAN:STDDEV" or
+    "lognormal:MEDIAN:SIGMA" (a plain number means fixed).
+    """
+
+    def __init__(self, spec="fixed:0", seed=None):
+        self.spec = spec
+        kind, _, params = spec.partition(":") if ":" in spec else ("fixed", "", spec)
+        self.kind = kind
+        self.params = [float(p) for p in params.split(":") if p]
+        self.random = random.Random(seed)
+        if kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution '{kind}'.")
+
+    def sample(self):
+        if self.kind == "fixed":
+            value = self.params[0] if self.params else 0.0
+        elif self.kind == "uniform":
+            value = self.random.uniform(self.params[0], self.params[1])
+        elif self.kind == "normal":
+            value = self.random.gauss(self.params[0], self.params[1])
+        else:
+            value = self.random.lognormvariate(math.log(self.params[0]), self.params[1])
+        return max(0.0, value)
+
+
+def count_tokens(text):
+    # Roughly four characters per token, as a dependency-free approximation
+    return max(1, (len(text) + 3) // 4) if text else 0
+
+
+class StubState:
+    """
+    Configuration and counters shared by the request handler threads.
+    """
+
+    def __init__(self, latency, token_latency=0.0, error_rate=0.0, rate_limit_rate=0.0,
+                 retry_after=1, response_text=None, seed=None):
+        self.latency = latency
+        self.token_latency = token_latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.response_text = response_text
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {
+            "requests": 0, "streamed": 0, "errors_injected": 0, "rate_limited": 0,
+            "prompt_tokens": 0, "completion_tokens": 0, "by_model": {},
+        }
+
+    def count(self, key, model=None, prompt_tokens=0, completion_tokens=0):
+        with self.lock:
+            self.stats[key] += 1
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["completion_tokens"] += completion_tokens
+            if model is not None:
+                per_model = self.stats["by_model"].setdefault(model, {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0})
+                per_model["requests"] += 1
+                per_model["prompt_tokens"] += prompt_tokens
+                per_model["completion_tokens"] += completion_tokens
+
+    def roll(self, rate):
+        with self.lock:
+            return self.random.random() < rate
+
+    def reply_for(self, messages):
+        if self.response_text is not None:
+            return self.response_text
+        last_user = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+        return last_user.split(": ", 1)[-1] or "OK"
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "OpenAIStub/1.0"
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        logging.debug("stub: " + format % args)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "gpt-4", "object": "model", "owned_by": "stub"}]})
+        elif self.path.rstrip("/") == "/stats":
+            with self.state.lock:
+                self._send_json(200, json.loads(json.dumps(self.state.stats)))
+        else:
+            self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "Invalid JSON", "type": "invalid_request_error"}})
+            return
+
+        if self.state.roll(self.state.rate_limit_rate):
+            self.state.count("rate_limited")
+            self._send_json(429, {"error": {"message": "Rate limit reached (injected)", "type": "rate_limit_error"}},
+                            headers={"Retry-After": str(self.state.retry_after)})
+            return
+        if self.state.roll(self.state.error_rate):
+            self.state.count("errors_injected")
+            self._send_json(500, {"error": {"message": "Internal error (injected)", "type": "server_error"}})
+            return
+
+        model = body.get("model", "gpt-4")
+        messages = body.get("messages", [])
+        reply = self.state.reply_for(messages)
+        prompt_tokens = sum(count_tokens(m.get("content") or "") + 4 for m in messages)
+        completion_tokens = count_tokens(reply)
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens, "prompt_tokens_details": {"cached_tokens": 0}}
+
+        time.sleep(self.state.latency.sample())
+        if body.get("stream"):
+            self.state.count("streamed", model, prompt_tokens, completion_tokens)
+            include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+            self._stream(model, reply, usage if include_usage else None)
+        else:
+            self.state.count("requests", model, prompt_tokens, completion_tokens)
+            time.sleep(self.state.token_latency * completion_tokens)
+            self._send_json(200, {
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+                "usage": usage,
+            })
+
+    def _stream(self, model, reply, usage):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+
+        def chunk(delta, finish_reason=None, chunk_usage=None):
+            data = {
+                "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                "choices": [] if delta is None else [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            if chunk_usage is not None:
+                data["usage"] = chunk_usage
+            self.wfile.write(f"data: {json.dumps(data)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        chunk({"role": "assistant", "content": ""})
+        words = reply.split(" ")
+        for i, word in enumerate(words):
+            time.sleep(self.state.token_latency)
+            chunk({"content": word if i == 0 else " " + word})
+        chunk({}, finish_reason="stop")
+        if usage is not None:
+            chunk(None, chunk_usage=usage)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_server(state, host="127.0.0.1", port=0):
+    """
+    Start the stub on a daemon thread.
+
+    :return: (server, base_url); call server.shutdown() to stop it.
+    """
+    server = ThreadingHTTPServer((host, port), StubRequestHandler)
+    server.daemon_threads = True
+    server.state = state
+    threading.Thread(target=server.serve_forever, name="openai-stub", daemon=True).start()
+    base_url = f"http://{host}:{server.server_address[1]}/v1"
+    logging.info(f"OpenAI stub listening on {base_url}")
+    return server, base_url
+
+
+def add_stub_arguments(parser):
+    parser.add_argument("--latency", default="fixed:0.05", help="Latency distribution, e.g. lognormal:0.4:0.5.")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Extra seconds per completion token.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500.")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 429.")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429 responses.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for latency and fault injection.")
+
+
+def state_from_args(args):
+    return StubState(
+        latency=LatencyDistribution(args.latency, seed=args.seed),
+        token_latency=args.token_latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible chat-completions stub.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    add_stub_arguments(parser)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    server = ThreadingHTTPServer((args.host, args.port), StubRequestHandler)
+    server.daemon_threads = True
+    server.state = state_from_args(args)
+    logging.info(f"OpenAI stub listening on http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Benchmark the generation pipeline with simulated subprocesses and a canned LLM.
+
+Run from the repository root:
+
+    python -m benchmarks.run_benchmarks --repeat 5 --output bench.json
+    python -m benchmarks.run_benchmarks --compare bench.json
+
+Every sample runs in a forked child process so peak RSS and global state
+(tracer, metrics, caches) are not shared between samples.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from benchmarks.fakes import FakeChatClient, FakeCommandRunner
+from utils.helpers import STATE_DIR
+
+AI_CONFIG_PATH = "llm/config/config.json"
+
+# Handler modules that import run_command by name; the git bootstrap runs the real git
+COMMAND_MODULES = ["handlers.backend_setup", "handlers.frontend_setup"]
+
+# Rough relative cost of the real tools, scaled by --command-duration
+DEFAULT_COMMAND_WEIGHTS = {
+    "*pipenv install*": 20,
+    "*pip-compile*": 10,
+    "*pip-sync*": 5,
+    "uv pip *": 1,
+    "npx create-react-app *": 40,
+    "* create vite*": 2,
+    "cd frontend && *install": 15,
+    "npm install*": 15,
+    "yarn add *": 10,
+    "pnpm add *": 5,
+}
+
+
+def _write_ai_config(directory):
+    """
+    Copy of the AI configuration whose usage ledger and memory archive live in `directory`,
+    so samples do not append to the checkout's `.boilerplate` state.
+    """
+    with open(AI_CONFIG_PATH, "r") as f:
+        config = json.load(f)
+    state_dir = Path(directory) / STATE_DIR.name
+    if config.get("usage", {}).get("persist_path"):
+        config["usage"]["persist_path"] = str(state_dir / Path(config["usage"]["persist_path"]).name)
+    compaction = config.get("memory", {}).get("compaction", {})
+    if compaction.get("cold_storage_path"):
+        compaction["cold_storage_path"] = str(state_dir / Path(compaction["cold_storage_path"]).name)
+    path = Path(directory) / "ai_config.json"
+    with open(path, "w") as f:
+        json.dump(config, f, indent=2)
+    return path
+
+
+def _patched_environment(project_root, runner, llm_client):
+    """
+    Context managers replacing every external dependency of the pipeline.
+    """
+    from rich.prompt import Prompt
+    from llm.ai_manager import AIManager
+
+    def ask(prompt, default=None, choices=None, **kwargs):
+        if "root path" in str(prompt).lower():
+            return str(project_root)
+        return default
+
+    ai_config = _write_ai_config(project_root)
+    patches = [mock.patch(f"{module}.run_command", runner) for module in COMMAND_MODULES]
+    patches += [
+        mock.patch("handlers.env_check.probe_toolchain",
+                   lambda tools: {tool: {"path": f"/usr/bin/{tool}", "version": "99.0"} for tool in tools}),
+        mock.patch.object(Prompt, "ask", ask),
+        mock.patch("llm.llm_brain.OpenAI", lambda **kwargs: llm_client),
+        mock.patch("handlers.planning.AIManager", lambda config_path: AIManager(str(ai_config))),
+        mock.patch.dict(os.environ, {
+            "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "benchmark"),
+            "GIT_AUTHOR_NAME": "Benchmark", "GIT_AUTHOR_EMAIL": "benchmark@example.com",
+            "GIT_COMMITTER_NAME": "Benchmark", "GIT_COMMITTER_EMAIL": "benchmark@example.com",
+        }),
+    ]
+    return patches
+
+
+def _run_sample(scenario, settings, connection):
+    """
+    Child-process body: run one sample of a scenario and send the measurements back.
+    """
+    logging.disable(logging.WARNING)
+    from rich.console import Console
+    from main import build_handlers, load_defaults_to_context
+    from utils.helpers import chain_handlers
+
+    workdir = Path(tempfile.mkdtemp(prefix="boilerplate-bench-"))
+    runner = FakeCommandRunner(
+        durations={pattern: weight * settings["command_duration"] for pattern, weight in DEFAULT_COMMAND_WEIGHTS.items()},
+        default_duration=settings["command_duration"],
+    )
+    llm_client = FakeChatClient(latency=settings["llm_latency"])
+    patches = _patched_environment(workdir, runner, llm_client)
+    for patch in patches:
+        patch.start()
+
+    try:
+        console = Console(quiet=True)
+        context = {}
+        load_defaults_to_context(context)
+        handlers = build_handlers(console)
+        names = [handler.__class__.__name__ for handler in handlers]
+
+        if scenario == "full_chain":
+            setup, measured = [], chain_handlers(handlers)
+        else:
+            index = names.index(scenario)
+            setup, measured = handlers[:index], handlers[index]
+
+        for handler in setup:
+            handler.handle(context)
+
+        stager = context.get("output_stager")
+        written_before = stager.stats["written"] if stager else 0
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        measured.handle(context)
+        stager = context.get("output_stager")
+        if stager is not None:
+            stager.flush()
+        wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+        if stager is not None and scenario == "full_chain":
+            stager.commit()
+
+        connection.send({
+            "wall_s": wall,
+            "cpu_s": cpu,
+            "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "files_written": (stager.stats["written"] if stager else 0) - written_before,
+            "commands": len(runner.calls),
+            "llm_requests": llm_client.requests,
+        })
+    except Exception as e:
+        connection.send({"error": f"{type(e).__name__}: {e}"})
+    finally:
+        for patch in patches:
+            patch.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+        connection.close()
+
+
+def run_scenario(scenario, settings, repeat):
+    """
+    Run `repeat` samples of a scenario, each in a fresh child process.
+    """
+    samples = []
+    context = multiprocessing.get_context("fork")
+    for _ in range(repeat):
+        parent, child = context.Pipe(duplex=False)
+        process = context.Process(target=_run_sample, args=(scenario, settings, child))
+        process.start()
+        child.close()
+        sample = parent.recv()
+        process.join()
+        if "error" in sample:
+            raise RuntimeError(f"Scenario {scenario} failed: {sample['error']}")
+        samples.append(sample)
+    return summarize(scenario, samples)
+
+
+def summarize(scenario, samples):
+    def stats(key):
+        values = [sample[key] for sample in samples]
+        return {"mean": statistics.mean(values), "median": statistics.median(values),
+                "min": min(values), "max": max(values)}
+
+    return {
+        "name": scenario,
+        "samples": len(samples),
+        "wall_s": stats("wall_s"),
+        "cpu_s": stats("cpu_s"),
+        "peak_rss_kb": max(sample["peak_rss_kb"] for sample in samples),
+        "files_written": samples[-1]["files_written"],
+        "commands": samples[-1]["commands"],
+        "llm_requests": samples[-1]["llm_requests"],
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    """
+    Print the change in median wall time against a previous report.
+    """
+    previous = {result["name"]: result for result in baseline["results"]}
+    print(f"{'scenario':32} {'baseline':>10} {'current':>10} {'change':>8}")
+    for result in results:
+        if result["name"] not in previous:
+            continue
+        before = previous[result["name"]]["wall_s"]["median"]
+        after = result["wall_s"]["median"]
+        change = (after - before) / before * 100 if before else 0.0
+        print(f"{result['name']:32} {before:10.3f} {after:10.3f} {change:+7.1f}%")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the generation pipeline.")
+    parser.add_argument("--scenario", action="append", help="Scenario to run: full_chain or a handler class name (repeatable).")
+    parser.add_argument("--repeat", type=int, default=3, help="Samples per scenario.")
+    parser.add_argument("--command-duration", type=float, default=0.01,
+                        help="Base simulated seconds per shell command (scaled per tool).")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Simulated seconds per LLM call.")
+    parser.add_argument("--output", help="Report path (default: .boilerplate/benchmarks/<timestamp>.json).")
+    parser.add_argument("--compare", metavar="BASELINE", help="Previous report to compare against.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not Path("handlers/templates").is_dir():
+        sys.exit("Run the benchmarks from the repository root.")
+
+    scenarios = args.scenario or [
+        "full_chain", "PlanningHandler", "FolderSetupHandler", "GitInitializationHandler",
+        "BackendSetupHandler", "FrontendSetupHandler", "DockerConfigurationHandler",
+        "CiCdSetupHandler", "ObservabilitySetupHandler", "LoadTestingSetupHandler", "DocumentationSetupHandler",
+    ]
+    settings = {"command_duration": args.command_duration, "llm_latency": args.llm_latency}
+
+    results = []
+    for scenario in scenarios:
+        result = run_scenario(scenario, settings, args.repeat)
+        results.append(result)
+        print(f"{scenario:32} wall {result['wall_s']['median']:.3f}s  cpu {result['cpu_s']['median']:.3f}s  "
+              f"rss {result['peak_rss_kb'] / 1024:.1f} MiB  files {result['files_written']}")
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": settings,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    output = Path(args.output or STATE_DIR / "benchmarks" / f"{time.strftime('%Y%m%d-%H%M%S')}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
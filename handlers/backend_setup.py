@@ -1,8 +1,9 @@
 from .base_handler import BaseHandler
-from jinja2 import Template
 from pathlib import Path
 from rich.panel import Panel
-from utils.helpers import Project, run_command
+from utils.helpers import Project, run_command, with_backend_host
+from utils.package_managers import get_package_manager
+from urllib.parse import unquote, urlparse
 import logging
 import os
 
@@ -21,12 +22,15 @@ class BackendSetupHandler(BaseHandler):
         Set up the Python backend with Django and PostgreSQL.
         """
 
-        # Generate project-specific details
+        # Generate project-specific details, reusing the ones of an existing project
         prj = Project()
-        context['db_name'] = prj.generate_random_project_name()
-        context['db_user'] = prj.generate_db_username()
-        context['db_password'] = prj.generate_random_password()
-        context['secret_key'] = prj.generate_random_password(64)
+        existing = {}
+        if "project_dir" in context:
+            existing = self._load_existing_credentials(Path(context["project_dir"]) / "backend" / ".env")
+        context['db_name'] = existing.get("db_name") or prj.generate_random_project_name()
+        context['db_user'] = existing.get("db_user") or prj.generate_db_username()
+        context['db_password'] = existing.get("db_password") or prj.generate_random_password()
+        context['secret_key'] = existing.get("secret_key") or prj.generate_random_password(64)
 
         self.console.print(Panel("[bold cyan]Setting up Python backend...[/bold cyan]"))
         logging.info("Starting Python backend setup...")
@@ -57,6 +61,14 @@ class BackendSetupHandler(BaseHandler):
         # Pass to the next handler
         return None
 
+    def validate_checkpoint(self, context):
+        """
+        The Django project and its lock files must still exist.
+        """
+        backend_path = Path(context["project_dir"]) / "backend"
+        lock_file = get_package_manager(context.get("package_manager", "pipenv")).lock_file
+        return all((backend_path / name).exists() for name in ["manage.py", lock_file, "requirements.txt", ".env"])
+
     def setup_python_backend(self, project_name, project_dir, context):
         """
         Core logic for setting up the Python backend with Django and PostgreSQL.
@@ -65,42 +77,70 @@ class BackendSetupHandler(BaseHandler):
         backend_path = root_path / "backend"
         backend_path.mkdir(parents=True, exist_ok=True)
 
-        # Install Django and create the backend structure
-        run_command("pipenv install django", "Install Django", cwd=backend_path)
-        run_command("pipenv run django-admin startproject app .", "Create Django project named app", cwd=backend_path)
-        run_command(
-            "pipenv install pylint mypy pytest pytest-cov alembic",
-            "Install dev tools and migration utility",
-            cwd=backend_path,
-        )
-        run_command("pipenv install psycopg2-binary dj-database-url", "Install PostgreSQL adapter", cwd=backend_path)
-        run_command("pipenv lock > Pipfile.lock && pipenv requirements > requirements.txt", "Generate requirements.txt", cwd=backend_path)
-        run_command("pipenv lock > constraints.txt", "Generate constraints.txt", cwd=backend_path)
-        run_command("echo '[tool.black]\nline-length = 79' > pyproject.toml", "Configure Black code formatter", cwd=backend_path)
+        # Install Django and its tooling in one resolution with the configured package manager
+        manager = get_package_manager(context.get("package_manager", "pipenv"))
+        packages = [
+            "django",
+            "pylint", "mypy", "pytest", "pytest-cov", "pytest-xdist", "pytest-split", "pytest-benchmark", "alembic",
+            "psycopg2-binary", "dj-database-url",
+            "django-prometheus",
+        ]
+        if context.get("cache_backend") == "redis":
+            packages += ["django-redis", "redis", "hiredis"]
+        install_commands = manager.setup_commands() + manager.install_commands(packages) + [
+            ("echo '[tool.black]\nline-length = 79' > pyproject.toml", "Configure Black code formatter"),
+        ]
+        install_outputs = [backend_path / manager.lock_file, backend_path / "requirements.txt",
+                           backend_path / "constraints.txt", backend_path / manager.venv_dir]
+        if self.step_is_current(context, "backend.install", install_commands, install_outputs):
+            self.console.print("[yellow]Backend dependencies unchanged, skipping install steps.[/yellow]")
+        else:
+            for command, description in install_commands:
+                run_command(command, description, cwd=backend_path)
+            self.record_step(context, "backend.install", install_commands)
+
+        if not (backend_path / "manage.py").exists():
+            run_command(manager.run("django-admin startproject app ."), "Create Django project named app", cwd=backend_path)
 
         # Render templates for .env files and Django settings
-        self._render_and_write_template("env.j2", backend_path / ".env", {
+        redis_url = "redis://redis:6379/0" if context.get("cache_backend") == "redis" else None
+        self.render_template(context, "env.j2", backend_path / ".env", {
             "debug": True,
-            "allowed_hosts": context["allowed_hosts"],
+            "allowed_hosts": with_backend_host(context["allowed_hosts"]),
             "secret_key": context["secret_key"],
             "db_url": f"postgres://{context['db_user']}:{context['db_password']}@db:5432/{context['db_name']}",
+            "redis_url": redis_url,
         })
-        self._render_and_write_template("env.j2", backend_path / ".env.staging", {
+        self.render_template(context, "env.j2", backend_path / ".env.staging", {
             "debug": False,
-            "allowed_hosts": f"{context['db_name']}.stage.internal",
+            "allowed_hosts": with_backend_host(f"{context['db_name']}.stage.internal"),
             "secret_key": context["secret_key"],
             "db_url": f"postgres://{context['db_user']}:{context['db_password']}@db:5432/{context['db_name']}",
+            "redis_url": redis_url,
         })
-        self._render_and_write_template("env.j2", backend_path / ".env.production", {
+        # Production traffic goes through PgBouncer when it is enabled
+        production_db_host = "pgbouncer" if context.get("db_pooler") == "pgbouncer" else "db"
+        self.render_template(context, "env.j2", backend_path / ".env.production", {
             "debug": False,
-            "allowed_hosts": "domain.com",
+            "allowed_hosts": with_backend_host("domain.com"),
             "secret_key": context["secret_key"],
-            "db_url": f"postgres://{context['db_user']}:{context['db_password']}@db:5432/{context['db_name']}",
+            "db_url": f"postgres://{context['db_user']}:{context['db_password']}@{production_db_host}:5432/{context['db_name']}",
+            "redis_url": redis_url,
         })
-        self._render_and_write_template("settings.py.j2", backend_path / "app" / "settings.py", context, append=True)
+        self.render_template(context, "settings.py.j2", backend_path / "app" / "settings.py", {
+            # Persistent connections in the performance (production) profile
+            "db_conn_max_age": 60 if context.get("docker_profile") == "production" else 0,
+            "db_pooler": context.get("db_pooler", "none"),
+            "cache_backend": context.get("cache_backend", "none"),
+            "cache_key_prefix": context["project_name"].lower(),
+        }, append=True)
+        self.render_template(context, "metrics_urls.py.j2", backend_path / "app" / "urls.py", {}, append=True)
+        if context.get("cache_backend") == "redis":
+            self.render_template(context, "cache_utils.py.j2", backend_path / "app" / "cache_utils.py", {})
 
         # Initialize Alembic for migrations
-        run_command("alembic init migrations", "Initialize Alembic migrations", cwd=backend_path)
+        if not (backend_path / "migrations").exists():
+            run_command(manager.run("alembic init migrations"), "Initialize Alembic migrations", cwd=backend_path)
 
         # Output database credentials for reference
         self.console.print(f"[bold magenta]Database Credentials for {project_name}:[/bold magenta]")
@@ -110,48 +150,26 @@ class BackendSetupHandler(BaseHandler):
         self.console.print("\n[bold yellow]Add the following line to your /etc/hosts file for testing:[/bold yellow]")
         self.console.print(f"127.0.0.1    {context['project_name'].lower()}-{context['db_name']}.stage.internal")
 
-    def _render_and_write_template(self, template_name, output_path, context, append=False):
-        """
-        Render a Jinja2 template and either append to or overwrite the target file.
-        """
-        template_path = self.template_dir / template_name
-        if not template_path.exists():
-            raise FileNotFoundError(f"Template '{template_path}' not found.")
-
-        # Render the template
-        with open(template_path, "r") as template_file:
-            template = Template(template_file.read())
-            rendered_content = template.render(context)
-
-        # Append or overwrite based on the `append` flag
-        if append:
-            self._append_to_file(output_path, rendered_content)
-        else:
-            self._write_file(output_path, rendered_content)
-
-    def _append_to_file(self, path, content):
-        """
-        Utility to append content to a file.
-        """
-        path.parent.mkdir(parents=True, exist_ok=True)  # Ensure directory exists
-        mode = "a" if path.exists() else "w"  # Append if file exists, otherwise write
-        with open(path, mode) as f:
-            f.write("\n" + content + "\n")  # Append with a newline for separation
-
-    def _write_file(self, path, content):
-        """
-        Utility to overwrite content in a file.
-        """
-        path.parent.mkdir(parents=True, exist_ok=True)  # Ensure directory exists
-        with open(path, "w") as f:
-            f.write(content)
-
-
     @staticmethod
-    def _write_file(path, content):
+    def _load_existing_credentials(env_path):
         """
-        Utility to write content to a file.
+        Read the credentials of a previously generated backend from its .env file.
         """
-        path.parent.mkdir(parents=True, exist_ok=True)  # Ensure directory exists
-        with open(path, "w") as f:
-            f.write(content)
+        if not env_path.exists():
+            return {}
+
+        values = {}
+        for line in env_path.read_text().splitlines():
+            key, sep, value = line.partition("=")
+            if sep:
+                values[key.strip()] = value.strip()
+
+        credentials = {"secret_key": values.get("SECRET_KEY")}
+        db_url = urlparse(values.get("DATABASE_URL", ""))
+        if db_url.scheme.startswith("postgres"):
+            credentials.update({
+                "db_name": db_url.path.lstrip("/"),
+                "db_user": unquote(db_url.username or ""),
+                "db_password": unquote(db_url.password or ""),
+            })
+        return credentials
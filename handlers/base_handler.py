@@ -1,8 +1,15 @@
 import logging
 from abc import ABC, abstractmethod
+from pathlib import Path
+from utils.staging import OutputStager
+from utils.structured_logging import redacted
+from utils.tracing import get_tracer
 
 
 class BaseHandler(ABC):
+    # Whether completion is journaled so the handler can be skipped on --resume
+    checkpointed = True
+
     def __init__(self):
         self.next_handler = None
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -17,11 +24,26 @@ class BaseHandler(ABC):
             context = {}
         else:
             self.logger.info(f"Received context in handler {self.__class__.__name__}")
-            #debug
-            self.logger.debug(context)
+            # Formatted (and redacted) only when debug logging is enabled
+            self.logger.debug("Context: %s", redacted(context))
         self.logger.info(f"Handling request in {self.__class__.__name__}")
+        journal = context.get("checkpoint_journal") if self.checkpointed else None
         try:
-            result = self.process(context, *args, **kwargs)  # Pass the shared context
+            with get_tracer().span(self.__class__.__name__, category="handler") as span:
+                if journal is not None and journal.should_skip(self.__class__.__name__) and self.validate_checkpoint(context):
+                    self.logger.info(f"Skipping {self.__class__.__name__}: completed in a previous run.")
+                    span.set_attribute("skipped", True)
+                    result = None
+                else:
+                    if journal is not None:
+                        journal.stop_resuming()
+                    result = self.process(context, *args, **kwargs)  # Pass the shared context
+                    # Make this handler's outputs visible on disk before the next handler runs
+                    if context.get("output_stager") is not None:
+                        context["output_stager"].flush()
+                    if journal is not None and result is None:
+                        journal.record(self.__class__.__name__, context)
+                    span.set_attribute("skipped", False)
         except Exception as e:
             self.logger.error(f"Error in handler {self.__class__.__name__}: {e}", exc_info=True)
             raise
@@ -41,3 +63,62 @@ class BaseHandler(ABC):
     def process(self, context, *args, **kwargs):
         pass
 
+    def validate_checkpoint(self, context):
+        """
+        Check that the on-disk state produced by a previous run of this handler is still intact.
+        Handlers override this to verify their outputs; returning False makes the handler run again.
+        """
+        return True
+
+    def render_template(self, context, template_name, destination, template_context=None, append=False):
+        """
+        Queue a Jinja2 template render into the project tree.
+
+        :param context: Shared handler context holding the output stager.
+        :param template_name: Template file name inside the handler's template directory.
+        :param destination: Output path inside the project.
+        :param template_context: Variables for the template (defaults to the shared context).
+        :param append: Append to the destination instead of overwriting it.
+        """
+        self.get_stager(context).submit(
+            template_name,
+            context if template_context is None else template_context,
+            destination,
+            template_dir=getattr(self, "template_dir", "handlers/templates"),
+            append=append,
+        )
+
+    def write_output(self, context, destination, content, append=False):
+        """
+        Queue literal content to be written into the project tree.
+        """
+        self.get_stager(context).submit_content(destination, content, append=append)
+
+    @staticmethod
+    def get_stager(context):
+        """
+        Return the output stager of the run, creating an in-place one for an existing project if needed.
+        """
+        if context.get("output_stager") is None:
+            context["output_stager"] = OutputStager(context["project_dir"])
+        return context["output_stager"]
+
+    def step_is_current(self, context, name, inputs, outputs=()):
+        """
+        Check whether an install step already ran with the same inputs.
+
+        :param context: Shared handler context holding the output stager.
+        :param name: Unique step name, e.g. 'backend.install'.
+        :param inputs: JSON-serialisable description of everything the step depends on.
+        :param outputs: Paths the step produces; the step is stale if any is missing.
+        :return: True if the step can be skipped.
+        """
+        if not all(Path(path).exists() for path in outputs):
+            return False
+        return self.get_stager(context).manifest.step_is_current(name, inputs)
+
+    def record_step(self, context, name, inputs):
+        """
+        Record a successfully completed install step in the generation manifest.
+        """
+        self.get_stager(context).manifest.record_step(name, inputs)
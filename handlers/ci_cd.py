@@ -1,8 +1,10 @@
 from .base_handler import BaseHandler
-from jinja2 import Template
 from pathlib import Path
 from rich.panel import Panel
 import logging
+from utils.frontend_toolchain import get_frontend_toolchain
+from utils.helpers import to_image_slug
+from utils.package_managers import get_package_manager
 
 
 class CiCdSetupHandler(BaseHandler):
@@ -44,6 +46,12 @@ class CiCdSetupHandler(BaseHandler):
         # Pass to the next handler
         return None
 
+    def validate_checkpoint(self, context):
+        """
+        The workflow file must still exist.
+        """
+        return (Path(context["project_dir"]) / ".github" / "workflows" / "ci_cd_pipeline.yml").exists()
+
     def setup_ci_cd(self, project_name, context):
         """
         Core logic for setting up GitHub Actions CI/CD using Jinja2 templates.
@@ -52,29 +60,26 @@ class CiCdSetupHandler(BaseHandler):
         github_actions_path = Path(project_dir) / ".github" / "workflows"
         github_actions_path.mkdir(parents=True, exist_ok=True)
 
-        # Render the CI/CD pipeline template
-        ci_cd_yaml = self._render_template("ci_cd_pipeline.yml.j2", context)
-
-        # Write the rendered template to the GitHub Actions workflows directory
-        self._write_file(github_actions_path / "ci_cd_pipeline.yml", ci_cd_yaml)
-
-    def _render_template(self, template_name, context):
-        """
-        Render a Jinja2 template with the provided context.
-        """
-        template_path = self.template_dir / template_name
-        if not template_path.exists():
-            raise FileNotFoundError(f"Template '{template_path}' not found.")
-
-        with open(template_path, "r") as template_file:
-            template = Template(template_file.read())
-            return template.render(context)
+        manager = get_package_manager(context.get("package_manager", "pipenv"))
+        node_manager, frontend_template = get_frontend_toolchain(context.get("frontend_package_manager", "npm"),
+                                                                 context.get("frontend_template", "cra"))
 
-    @staticmethod
-    def _write_file(path, content):
-        """
-        Utility to write content to a file.
-        """
-        path.parent.mkdir(parents=True, exist_ok=True)  # Ensure directory exists
-        with open(path, "w") as f:
-            f.write(content)
+        # Render the CI/CD pipeline template into the GitHub Actions workflows directory
+        self.render_template(context, "ci_cd_pipeline.yml.j2", github_actions_path / "ci_cd_pipeline.yml", {
+            "project_name": project_name,
+            "image_name": to_image_slug(project_name),
+            "python_version": context["python_version"],
+            "node_version": context["node_version"],
+            "test_shards": max(1, int(context.get("ci_test_shards", 2))),
+            "package_manager": manager.name,
+            "python_cache": manager.ci_cache,
+            "lock_file": manager.lock_file,
+            "install_lines": manager.ci_install(),
+            "pytest": manager.run("pytest"),
+            "node_package_manager": node_manager.name,
+            "node_lock_file": node_manager.lock_file,
+            "frontend_install": node_manager.install_frozen(),
+            "frontend_lint": frontend_template.lint(node_manager),
+            "frontend_test": frontend_template.test(node_manager),
+            "frontend_build": node_manager.run("build"),
+        })
@@ -1,9 +1,26 @@
 from .base_handler import BaseHandler
-from jinja2 import Template
 from pathlib import Path
 from rich.panel import Panel
 from rich.prompt import Prompt
 import logging
+import shlex
+from utils.frontend_toolchain import get_frontend_toolchain
+from utils.helpers import with_backend_host
+from utils.postgres_tuning import postgres_settings
+
+DOCKER_PROFILES = ("development", "production")
+APP_SERVERS = ("wsgi", "asgi")
+DB_POOLERS = ("none", "pgbouncer")
+CACHE_BACKENDS = ("none", "redis")
+
+
+def backend_workers(cpus, app_server="wsgi"):
+    """
+    Gunicorn worker count for a CPU allowance: (2 x CPUs) + 1 synchronous workers,
+    or one event-loop worker per CPU for ASGI.
+    """
+    cpus = max(1, int(round(float(cpus))))
+    return cpus if app_server == "asgi" else 2 * cpus + 1
 
 
 class DockerConfigurationHandler(BaseHandler):
@@ -36,6 +53,19 @@ class DockerConfigurationHandler(BaseHandler):
         # Prompt for missing optional values
         self._ensure_optional_context_values(context, optional_keys)
 
+        profile = context.setdefault("docker_profile", "development")
+        app_server = context.setdefault("app_server", "wsgi")
+        pooler = context.setdefault("db_pooler", "none")
+        cache_backend = context.setdefault("cache_backend", "none")
+        if (profile not in DOCKER_PROFILES or app_server not in APP_SERVERS or pooler not in DB_POOLERS
+                or cache_backend not in CACHE_BACKENDS):
+            error_message = (f"Unsupported Docker profile '{profile}', app server '{app_server}', database pooler "
+                             f"'{pooler}' or cache backend '{cache_backend}' (expected {', '.join(DOCKER_PROFILES)} / "
+                             f"{', '.join(APP_SERVERS)} / {', '.join(DB_POOLERS)} / {', '.join(CACHE_BACKENDS)}).")
+            self.console.print(f"[bold red]Error:[/bold red] {error_message}")
+            logging.error(error_message)
+            return error_message
+
         try:
             self.configure_docker(context)
             self.console.print(f"[bold green]Docker configuration completed for {context['project_name']}![/bold green]")
@@ -48,33 +78,103 @@ class DockerConfigurationHandler(BaseHandler):
         # Pass to the next handler
         return None
 
+    def validate_checkpoint(self, context):
+        """
+        The Dockerfiles and the Compose file must still exist.
+        """
+        project_path = Path(context["project_dir"])
+        return all((project_path / name).exists() for name in ["backend/Dockerfile", "frontend/Dockerfile", "docker-compose.yml", ".dockerignore"])
+
     def configure_docker(self, context):
         """
         Core logic to create Dockerfiles and a Docker Compose file using Jinja2 templates.
         """
         project_path = Path(context["project_dir"])
-
-        # Load templates
-        backend_template = self._load_template("backend.Dockerfile.j2")
-        frontend_template = self._load_template("frontend.Dockerfile.j2")
-        compose_template = self._load_template("docker-compose.yml.j2")
+        production = context["docker_profile"] == "production"
+        cpus = context.get("container_cpus", "2")
+        workers = backend_workers(cpus, context["app_server"])
 
         # Render templates
-        backend_dockerfile = backend_template.render(python_version=context["python_image"])
-        frontend_dockerfile = frontend_template.render(node_version=context["node_image"])
-        docker_compose = compose_template.render(
-            project_name=context["project_name"],
-            secret_key=context["secret_key"],
-            allowed_hosts=context["allowed_hosts"],
-            db_user=context["db_user"],
-            db_password=context["db_password"],
-            db_name=context["db_name"],
-        )
-
-        # Write rendered files
-        self._write_file(project_path / "backend" / "Dockerfile", backend_dockerfile)
-        self._write_file(project_path / "frontend" / "Dockerfile", frontend_dockerfile)
-        self._write_file(project_path / "docker-compose.yml", docker_compose)
+        if production:
+            self.render_template(context, "backend.production.Dockerfile.j2", project_path / "backend" / "Dockerfile", {
+                "python_version": context["python_image"],
+                "app_server": context["app_server"],
+                "server_packages": "gunicorn 'uvicorn[standard]'" if context["app_server"] == "asgi" else "gunicorn",
+                "cpus": cpus,
+                "workers": workers,
+                "threads": 2,
+            })
+            self.render_template(context, "gunicorn.conf.py.j2", project_path / "backend" / "gunicorn.conf.py", {})
+        else:
+            self.render_template(context, "backend.Dockerfile.j2", project_path / "backend" / "Dockerfile", {
+                "python_version": context["python_image"],
+            })
+        self.render_template(context, "dockerignore.j2", project_path / ".dockerignore", {})
+        # The frontend image installs with the same package manager and lock file as the project
+        node_manager, frontend_template = get_frontend_toolchain(context.get("frontend_package_manager", "npm"),
+                                                                 context.get("frontend_template", "cra"))
+        frontend_context = {
+            "node_version": context["node_image"],
+            "package_manager": node_manager.name,
+            "lock_file": node_manager.lock_file,
+            "cache_dir": node_manager.cache_dir,
+            "install_command": node_manager.install_frozen_in_docker(),
+            "frontend_template": frontend_template.name,
+        }
+        if production:
+            self.render_template(context, "frontend.production.Dockerfile.j2", project_path / "frontend" / "Dockerfile", {
+                **frontend_context,
+                "caddy_version": context.get("caddy_image", "2-alpine"),
+                "build_command": node_manager.run("build"),
+                "build_dir": frontend_template.build_dir,
+            })
+            self.render_template(context, "Caddyfile.j2", project_path / "frontend" / "Caddyfile", {
+                "assets_path": frontend_template.assets_path,
+            })
+        else:
+            self.render_template(context, "frontend.Dockerfile.j2", project_path / "frontend" / "Dockerfile", {
+                **frontend_context,
+                "dev_command": shlex.split(frontend_template.dev_server(node_manager, 3000)),
+            })
+        # The production profile tunes Postgres for the declared database resources
+        db_memory_mb = int(context.get("db_memory_mb", 1024))
+        db_cpus = context.get("db_cpus", cpus)
+        pooler = context["db_pooler"]
+        max_connections = int(context.get("db_max_connections", 100))
+        tuned = postgres_settings(db_memory_mb, db_cpus, max_connections) if production else None
+
+        self.render_template(context, "docker-compose.yml.j2", project_path / "docker-compose.yml", {
+            "project_name": context["project_name"],
+            "postgres_image": context.get("postgres_image", "16"),
+            "postgres_settings": tuned,
+            "db_memory_mb": db_memory_mb,
+            "db_cpus": db_cpus,
+            # Postgres needs shared memory for parallel queries; Docker's default is 64 MB
+            "db_shm_size": f"{max(128, db_memory_mb // 4)}m",
+            "db_pooler": pooler,
+            "pgbouncer_image": context.get("pgbouncer_image", "v1.23.1-p2"),
+            # Many client connections are multiplexed onto a pool kept below max_connections
+            "pgbouncer_max_client_conn": max(1000, max_connections * 10),
+            "pgbouncer_pool_size": max(10, max_connections - 20),
+            "cache_backend": context.get("cache_backend", "none"),
+            "redis_image": context.get("redis_image", "7-alpine"),
+            "cache_memory_mb": int(context.get("cache_memory_mb", 256)),
+            "secret_key": context["secret_key"],
+            "allowed_hosts": with_backend_host(context["allowed_hosts"]),
+            "db_user": context["db_user"],
+            "db_password": context["db_password"],
+            "db_name": context["db_name"],
+            "docker_profile": context["docker_profile"],
+            "container_cpus": cpus,
+            "backend_workers": workers,
+            "prometheus_image": context.get("prometheus_image", "v2.54.1"),
+            "grafana_image": context.get("grafana_image", "11.2.0"),
+            "metrics_retention": context.get("metrics_retention", "15d"),
+            "locust_image": context.get("locust_image", "2.31.8"),
+            "load_test_users": int(context.get("load_test_users", 20)),
+            "load_test_spawn_rate": max(1, int(context.get("load_test_users", 20)) // 10),
+            "load_test_duration": context.get("load_test_duration", "1m"),
+        })
 
     def _ensure_optional_context_values(self, context, optional_keys):
         """
@@ -98,26 +198,6 @@ class DockerConfigurationHandler(BaseHandler):
             if key not in context:
                 context[key] = self._prompt_for_missing_value(prompts[key], defaults[key])
 
-    def _load_template(self, template_name):
-        """
-        Load a Jinja2 template from the templates directory.
-        """
-        template_path = self.template_dir / template_name
-        if not template_path.exists():
-            raise FileNotFoundError(f"Template '{template_path}' not found.")
-
-        with open(template_path, "r") as f:
-            return Template(f.read())
-
-    @staticmethod
-    def _write_file(file_path, content):
-        """
-        Utility to write content to a file.
-        """
-        file_path.parent.mkdir(parents=True, exist_ok=True)  # Ensure directory exists
-        with open(file_path, "w") as f:
-            f.write(content)
-
     def _prompt_for_missing_value(self, prompt_message, default=None):
         """
         Prompt the user to enter a missing value with an optional default.
@@ -1,5 +1,4 @@
 from .base_handler import BaseHandler
-from jinja2 import Template
 from pathlib import Path
 from rich.panel import Panel
 import logging
@@ -42,6 +41,13 @@ class DocumentationSetupHandler(BaseHandler):
         # Pass to the next handler
         return None
 
+    def validate_checkpoint(self, context):
+        """
+        The documentation files must still exist.
+        """
+        docs_path = Path(context["project_dir"]) / "docs"
+        return all((docs_path / name).exists() for name in ["CONTRIBUTING.md", "API_DOCS.md", "architecture.md"])
+
     def setup_documentation(self, context):        
         """
         Core logic for setting up documentation using Jinja2 templates.
@@ -53,29 +59,6 @@ class DocumentationSetupHandler(BaseHandler):
         docs_path.mkdir(parents=True, exist_ok=True)
 
         # Render and write templates for documentation
-        self._render_and_write_template("CONTRIBUTING.md.j2", docs_path / "CONTRIBUTING.md", {})
-        self._render_and_write_template("API_DOCS.md.j2", docs_path / "API_DOCS.md", {})
-        self._render_and_write_template("architecture.md.j2", docs_path / "architecture.md", {})
-
-    def _render_and_write_template(self, template_name, output_path, context):
-        """
-        Render a Jinja2 template and write it to a file.
-        """
-        template_path = self.template_dir / template_name
-        if not template_path.exists():
-            raise FileNotFoundError(f"Template '{template_path}' not found.")
-
-        with open(template_path, "r") as template_file:
-            template = Template(template_file.read())
-            content = template.render(context)
-
-        self._write_file(output_path, content)
-
-    @staticmethod
-    def _write_file(path, content):
-        """
-        Utility to write content to a file.
-        """
-        path.parent.mkdir(parents=True, exist_ok=True)  # Ensure directory exists
-        with open(path, "w") as f:
-            f.write(content)
+        self.render_template(context, "CONTRIBUTING.md.j2", docs_path / "CONTRIBUTING.md", {})
+        self.render_template(context, "API_DOCS.md.j2", docs_path / "API_DOCS.md", {})
+        self.render_template(context, "architecture.md.j2", docs_path / "architecture.md", {})
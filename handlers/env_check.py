@@ -1,31 +1,69 @@
 ## path : project_setup/handlers/env_check.py
 from .base_handler import BaseHandler
-import subprocess
 import sys
 from rich.panel import Panel
+from utils.frontend_toolchain import get_frontend_toolchain
+from utils.package_managers import PACKAGE_MANAGERS
+from utils.toolchain import check_minimum_versions, probe_toolchain
+
+REQUIRED_TOOLS = ["git", "node", "npm", "docker"]
+
+
+def required_tools(context):
+    """
+    The base tools plus those the configured Python and Node package managers need.
+    """
+    tools = list(REQUIRED_TOOLS)
+    python_manager = PACKAGE_MANAGERS.get(context.get("package_manager", "pipenv"))
+    node_manager = context.get("frontend_package_manager", "npm")
+    for tool in [python_manager.tool if python_manager else None, node_manager]:
+        if tool and tool not in tools:
+            tools.append(tool)
+    return tools
 
 
 class EnvCheckHandler(BaseHandler):
+    # The environment may have changed since the last run, so the check always runs
+    checkpointed = False
+
     def __init__(self, console):
         super().__init__()
         self.console = console
 
     def process(self, context, *args, **kwargs):
-        required_tools = ["git", "pipenv", "yarn", "docker"]
         self.console.print(Panel("🔍 [bold cyan]Checking required tools...[/bold cyan]"))
-        
-        for tool in required_tools:
-            if not self.check_tool(tool):
-                self.console.print(f"[bold red]Error:[/bold red] {tool} is not installed. Please install it and try again.")
-                sys.exit(1)
-        
+        package_manager = context.get("package_manager", "pipenv")
+        if package_manager not in PACKAGE_MANAGERS:
+            self.console.print(f"[bold red]Error:[/bold red] Unsupported package manager '{package_manager}' "
+                               f"(expected {', '.join(PACKAGE_MANAGERS)}).")
+            sys.exit(1)
+        try:
+            get_frontend_toolchain(context.get("frontend_package_manager", "npm"), context.get("frontend_template", "cra"))
+        except ValueError as e:
+            self.console.print(f"[bold red]Error:[/bold red] {e}")
+            sys.exit(1)
+
+        tools = required_tools(context)
+        toolchain = probe_toolchain(tools)
+
+        missing = [tool for tool in tools if not toolchain[tool]["path"]]
+        for tool in tools:
+            if tool in missing:
+                self.console.print(f"[bold red]❌ {tool} is not installed.[/bold red]")
+            else:
+                version = toolchain[tool]["version"] or "unknown version"
+                self.console.print(f"[bold green]✔ {tool} is installed ({version}).[/bold green]")
+        if missing:
+            self.console.print(f"[bold red]Error:[/bold red] {', '.join(missing)} not installed. Please install and try again.")
+            sys.exit(1)
+
+        outdated = check_minimum_versions(toolchain)
+        if outdated:
+            for tool, (found, required) in outdated.items():
+                self.console.print(f"[bold red]Error:[/bold red] {tool} {found} is too old; {required} or newer is required.")
+            sys.exit(1)
+
+        # Later handlers (and the run history) read tool paths and versions from here
+        context["toolchain"] = toolchain
         self.console.print("[bold green]✅ All required tools are installed![/bold green]")
         return None  # Indicate successful processing
-
-    def check_tool(self, tool):
-        result = subprocess.run(f"which {tool}", shell=True, stdout=subprocess.PIPE, text=True)
-        if result.returncode != 0:
-            self.console.print(f"[bold red]❌ {tool} is not installed.[/bold red]")
-            return False
-        self.console.print(f"[bold green]✔ {tool} is installed.[/bold green]")
-        return True
@@ -2,6 +2,7 @@ from .base_handler import BaseHandler
 from pathlib import Path
 from rich.panel import Panel
 from utils.helpers import to_snake_case
+from utils.staging import OutputStager
 
 
 class FolderSetupHandler(BaseHandler):
@@ -30,16 +31,26 @@ class FolderSetupHandler(BaseHandler):
         # Use planning_content
         planning_content = context["planning_content"]
 
-        # Create the project root directory
-        project_dir = project_root / project_name
-        project_dir.mkdir(parents=True, exist_ok=True)
+        # Stage the project tree; it is moved to project_root / project_name once the chain succeeds.
+        # A warm workspace from the pool already holds the installed dependencies and scaffolds.
+        final_dir = project_root / project_name
+        pool = context.get("workspace_pool")
+        workspace = pool.claim(context, final_dir) if pool is not None else None
+        if workspace is not None:
+            self.console.print(f"[bold green]Using pre-provisioned workspace {workspace.name}.[/bold green]")
+            stager = OutputStager(final_dir, staging_root=workspace)
+            pool.refill_async()
+        else:
+            stager = OutputStager(final_dir)
+        project_dir = stager.root
 
-        # Add project_dir to context
+        # Add project_dir and the stager to context
         context["project_dir"] = project_dir
+        context["output_stager"] = stager
 
         # Create the project structure
         try:
-            self.create_project_structure(project_dir, planning_content)
+            self.create_project_structure(project_dir, planning_content, context)
             self.console.print("[bold green]Project structure created successfully![/bold green]")
         except Exception as e:
             self.console.print(f"[bold red]Error creating project structure:[/bold red] {e}")
@@ -48,11 +59,18 @@ class FolderSetupHandler(BaseHandler):
         # Pass to the next handler
         return None
 
-    def create_project_structure(self, project_dir, planning_content):
+    def validate_checkpoint(self, context):
+        """
+        The staged project tree must still exist.
+        """
+        return Path(context["project_dir"]).is_dir()
+
+    def create_project_structure(self, project_dir, planning_content, context):
         """
         Create the basic project directory structure.
         """
-        self.console.print(f"Creating project structure at: [bold magenta]{project_dir}[/bold magenta]...")
+        final_dir = context["output_stager"].final_dir
+        self.console.print(f"Creating project structure at: [bold magenta]{final_dir}[/bold magenta]...")
 
         # Define subdirectories
         subdirectories = [
@@ -70,7 +88,8 @@ class FolderSetupHandler(BaseHandler):
 
         # Create a planning document in the docs directory
         docs_path = project_dir / "docs" / "planning.md"
-        with open(docs_path, "w") as f:
-            f.write(planning_content)
+        self.write_output(context, docs_path, planning_content)
 
-        self.console.print(f"Project structure created. Documentation saved at [bold green]{docs_path}[/bold green].")
+        self.console.print(
+            f"Project structure created. Documentation saved at [bold green]{final_dir / 'docs' / 'planning.md'}[/bold green]."
+        )
@@ -1,7 +1,7 @@
 from .base_handler import BaseHandler
-from jinja2 import Template
 from pathlib import Path
 from rich.panel import Panel
+from utils.frontend_toolchain import get_frontend_toolchain
 from utils.helpers import run_command
 
 
@@ -15,7 +15,7 @@ class FrontendSetupHandler(BaseHandler):
 
     def process(self, context, *args, **kwargs):
         """
-        Set up the Node.js frontend with Create React App, ESLint, and Prettier.
+        Set up the Node.js frontend with Create React App or Vite, ESLint, and Prettier.
         """
         self.console.print(Panel("[bold cyan]Setting up Node.js frontend...[/bold cyan]"))
 
@@ -37,51 +37,41 @@ class FrontendSetupHandler(BaseHandler):
         # Pass to the next handler
         return None
 
+    def validate_checkpoint(self, context):
+        """
+        The app, its lock file and its installed dependencies must still exist.
+        """
+        frontend_path = Path(context["project_dir"]) / "frontend"
+        manager, _ = self.get_toolchain(context)
+        return all((frontend_path / name).exists() for name in ["package.json", manager.lock_file]) \
+            and (frontend_path / "node_modules").is_dir()
+
+    @staticmethod
+    def get_toolchain(context):
+        return get_frontend_toolchain(context.get("frontend_package_manager", "npm"),
+                                      context.get("frontend_template", "cra"))
+
     def setup_node_frontend(self, project_name, project_dir, context):
         """
         Core logic for setting up the Node.js frontend.
         """
         frontend_path = Path(project_dir) / "frontend"
+        manager, template = self.get_toolchain(context)
 
-        # Create React App with TypeScript template
-        run_command(
-            f"npx create-react-app {frontend_path} --template typescript",
-            "Initialize React app with TypeScript",
-            cwd=frontend_path.parent,
-        )
+        # Scaffold the React/TypeScript app; the same package manager installs, builds and tests it everywhere
+        if not (frontend_path / "package.json").exists():
+            for command, description in template.scaffold_commands(manager, frontend_path.name):
+                run_command(command, description, cwd=frontend_path.parent)
 
         # Install ESLint, Prettier, and related plugins
-        run_command(
-            "npm install eslint prettier eslint-config-prettier eslint-plugin-react eslint-plugin-react-hooks eslint-plugin-jsx-a11y --save-dev --legacy-peer-deps",
-            "Install ESLint, Prettier, and plugins",
-            cwd=frontend_path,
-        )
-
-        # Render and write ESLint configuration
-        eslint_config = self._render_template("eslint_config.j2", context)
-        self._write_file(frontend_path / ".eslintrc.json", eslint_config)
-
-        # Render and write Prettier configuration
-        prettier_config = self._render_template("prettier_config.j2", context)
-        self._write_file(frontend_path / ".prettierrc", prettier_config)
+        lint_install = manager.add_dev(template.dev_packages())
+        if self.step_is_current(context, "frontend.install", [lint_install], [frontend_path / "node_modules"]):
+            self.console.print("[yellow]Frontend dependencies unchanged, skipping install steps.[/yellow]")
+        else:
+            run_command(lint_install, "Install ESLint, Prettier, and plugins", cwd=frontend_path)
+            self.record_step(context, "frontend.install", [lint_install])
 
-    def _render_template(self, template_name, context):
-        """
-        Render a Jinja2 template with the given context.
-        """
-        template_path = self.template_dir / template_name
-        if not template_path.exists():
-            raise FileNotFoundError(f"Template '{template_path}' not found.")
-
-        with open(template_path, "r") as template_file:
-            template = Template(template_file.read())
-            return template.render(context)
-
-    @staticmethod
-    def _write_file(file_path, content):
-        """
-        Utility to write content to a file.
-        """
-        file_path.parent.mkdir(parents=True, exist_ok=True)  # Ensure directory exists
-        with open(file_path, "w") as f:
-            f.write(content)
+        # Render ESLint (Create React App only; Vite ships a flat config) and Prettier configuration
+        if template.name == "cra":
+            self.render_template(context, "eslint_config.j2", frontend_path / ".eslintrc.json")
+        self.render_template(context, "prettier_config.j2", frontend_path / ".prettierrc")
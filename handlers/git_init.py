@@ -1,8 +1,7 @@
 from .base_handler import BaseHandler
-from jinja2 import Template
 from pathlib import Path
 from rich.panel import Panel
-from utils.helpers import run_command
+from utils.git_bootstrap import bootstrap_repository
 
 
 class GitInitializationHandler(BaseHandler):
@@ -30,7 +29,7 @@ class GitInitializationHandler(BaseHandler):
 
         # Initialize Git
         try:
-            self.initialize_git(project_name, project_dir)
+            self.initialize_git(project_name, project_dir, context)
             self.console.print(f"[bold green]Git repository initialized successfully for {project_name}![/bold green]")
         except Exception as e:
             self.console.print(f"[bold red]Error initializing Git repository:[/bold red] {e}")
@@ -39,49 +38,29 @@ class GitInitializationHandler(BaseHandler):
         # Pass to the next handler
         return None
 
-    def initialize_git(self, project_name, project_dir):
+    def validate_checkpoint(self, context):
         """
-        Initialize a Git repository with a README, .gitignore (from template), and initial commit.
+        The repository must still exist.
         """
-        project_path = Path(project_dir)
-
-        # Run commands using the `utils.run_command` function
-        run_command("git init", "Initialize Git repository", cwd=project_path)
-        run_command(
-            f"echo '# {project_name}' > README.md", 
-            "Create README.md", 
-            cwd=project_path
-        )
-        
-        # Render and write the .gitignore template
-        gitignore_content = self._render_template("gitignore.j2", {"project_name": project_name})
-        self._write_file(project_path / ".gitignore", gitignore_content)
+        return (Path(context["project_dir"]) / ".git").is_dir()
 
-        run_command(
-            "git add . && git commit -m 'Initial commit'", 
-            "Perform initial Git commit", 
-            cwd=project_path
-        )
-        run_command("git checkout -b develop", "Create 'develop' branch", cwd=project_path)
-        run_command("git tag v0.1.0", "Create initial version tag", cwd=project_path)
-
-    def _render_template(self, template_name, context):
+    def initialize_git(self, project_name, project_dir, context):
         """
-        Render a Jinja2 template with the given context.
+        Initialize a Git repository with a README, .gitignore (from template), and initial commit.
         """
-        template_path = self.template_dir / template_name
-        if not template_path.exists():
-            raise FileNotFoundError(f"Template '{template_path}' not found.")
+        project_path = Path(project_dir)
 
-        with open(template_path, "r") as template_file:
-            template = Template(template_file.read())
-            return template.render(context)
+        # Write the README and the .gitignore template; they must be on disk before the commit
+        self.write_output(context, project_path / "README.md", f"# {project_name}\n")
+        self.render_template(context, "gitignore.j2", project_path / ".gitignore", {"project_name": project_name})
+        self.get_stager(context).flush()
 
-    @staticmethod
-    def _write_file(file_path, content):
-        """
-        Utility to write content to a file.
-        """
-        file_path.parent.mkdir(parents=True, exist_ok=True)  # Ensure directory exists
-        with open(file_path, "w") as f:
-            f.write(content)
+        # Re-running against an existing repository only refreshes the files above
+        if (project_path / ".git").exists():
+            self.console.print("[yellow]Git repository already exists, skipping initialization.[/yellow]")
+            return
+
+        # Initial commit on main, 'develop' checked out and the v0.1.0 tag, written in one fast-import pass
+        committed = bootstrap_repository(project_path, message="Initial commit", main_branch="main",
+                                         work_branch="develop", tag="v0.1.0")
+        self.logger.info(f"Initial commit created with {committed} file(s).")
@@ -0,0 +1,89 @@
+import json
+import logging
+from pathlib import Path
+from .base_handler import BaseHandler
+from rich.panel import Panel
+from utils.package_managers import get_package_manager
+
+
+class LoadTestingSetupHandler(BaseHandler):
+    def __init__(self, console, template_dir="handlers/templates"):
+        super().__init__()
+        self.console = console
+        self.template_dir = Path(template_dir)
+
+        if not self.template_dir.exists():
+            raise FileNotFoundError(f"Template directory '{self.template_dir}' does not exist.")
+
+    def process(self, context, *args, **kwargs):
+        """
+        Add the load-test suite, backend micro-benchmarks and their latency budgets.
+        """
+        self.console.print(Panel("[bold cyan]Setting up load tests and benchmarks...[/bold cyan]"))
+        logging.info("Starting load testing setup...")
+
+        # Ensure required context values
+        required_keys = ["project_name", "project_dir"]
+        missing_keys = [key for key in required_keys if key not in context]
+        if missing_keys:
+            error_message = f"Missing required context keys: {', '.join(missing_keys)}"
+            self.console.print(f"[bold red]Error:[/bold red] {error_message}")
+            logging.error(error_message)
+            return error_message
+
+        try:
+            self.setup_load_testing(context)
+            project_name = context["project_name"]
+            self.console.print(f"[bold green]Load tests and benchmarks added for {project_name}![/bold green]")
+            logging.info("Load testing setup completed successfully.")
+        except Exception as e:
+            self.console.print(f"[bold red]Error during load testing setup:[/bold red] {e}")
+            logging.error(f"Error during load testing setup: {e}", exc_info=True)
+            raise
+
+        # Pass to the next handler
+        return None
+
+    def validate_checkpoint(self, context):
+        """
+        The load-test suite, its budgets and the Makefile must still exist.
+        """
+        project_path = Path(context["project_dir"])
+        return all((project_path / name).exists() for name in [
+            "Makefile", "tests/performance/locustfile.py", "tests/performance/budgets.json",
+            "tests/performance/check_budgets.py", "backend/benchmarks/bench_example.py",
+        ])
+
+    def setup_load_testing(self, context):
+        """
+        Core logic for rendering the load-test and benchmark scaffold using Jinja2 templates.
+        """
+        project_path = Path(context["project_dir"])
+        performance_path = project_path / "tests" / "performance"
+        benchmarks_path = project_path / "backend" / "benchmarks"
+
+        # Locust suite against the generated API and the budgets the CI job enforces
+        self.render_template(context, "locustfile.py.j2", performance_path / "locustfile.py", {
+            "project_name": context["project_name"],
+            "wait_min_s": 0.5,
+            "wait_max_s": 2,
+        })
+        self.render_template(context, "check_budgets.py.j2", performance_path / "check_budgets.py", {})
+        budgets = {
+            "aggregate": {
+                "p95_ms": int(context.get("latency_budget_p95_ms", 300)),
+                "p99_ms": int(context.get("latency_budget_p99_ms", 1000)),
+                "error_rate": float(context.get("error_budget", 0.01)),
+            },
+            "endpoints": {},
+        }
+        self.write_output(context, performance_path / "budgets.json", json.dumps(budgets, indent=2) + "\n")
+        self.write_output(context, performance_path / "results" / ".gitignore", "*\n!.gitignore\n")
+
+        # pytest-benchmark micro-benchmarks of backend hot paths
+        self.render_template(context, "benchmark_conftest.py.j2", benchmarks_path / "conftest.py", {})
+        self.render_template(context, "bench_example.py.j2", benchmarks_path / "bench_example.py", {})
+
+        # `make bench` runs both against the local stack
+        manager = get_package_manager(context.get("package_manager", "pipenv"))
+        self.render_template(context, "Makefile.j2", project_path / "Makefile", {"python": manager.run("python")})
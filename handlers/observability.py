@@ -1,8 +1,15 @@
+import json
 import logging
 from pathlib import Path
-from jinja2 import Template
 from .base_handler import BaseHandler
 from rich.panel import Panel
+from utils.grafana_dashboards import latency_dashboard
+from utils.helpers import BACKEND_SERVICE
+
+# Services exporting Prometheus metrics; each gets a scrape job, recording rules and a latency dashboard
+METRICS_SERVICES = [
+    {"name": BACKEND_SERVICE, "job": "django", "target": f"{BACKEND_SERVICE}:8000"},
+]
 
 
 class ObservabilitySetupHandler(BaseHandler):
@@ -41,6 +48,15 @@ class ObservabilitySetupHandler(BaseHandler):
         # Pass to the next handler
         return None
 
+    def validate_checkpoint(self, context):
+        """
+        The Prometheus configuration, its rules and the dashboards must still exist.
+        """
+        observability_path = Path(context["project_dir"]) / "infrastructure" / "observability"
+        return all((observability_path / name).exists() for name in
+                   ["prometheus.yml", "rules/recording_rules.yml"] +
+                   [f"grafana/dashboards/{service['name']}-latency.json" for service in METRICS_SERVICES])
+
     def setup_observability(self,context):
         """
         Core logic for setting up observability using Jinja2 templates.
@@ -49,32 +65,26 @@ class ObservabilitySetupHandler(BaseHandler):
         observability_path = Path(project_dir) / "infrastructure" / "observability"
         observability_path.mkdir(parents=True, exist_ok=True)
 
-        # Render the Prometheus configuration template
-        prometheus_config = self._render_template(
-            "prometheus.yml.j2",
-            {"backend_target": "backend:8000"}
-        )
-
-        # Write the rendered Prometheus configuration
-        self._write_file(observability_path / "prometheus.yml", prometheus_config)
+        scrape_interval = context.get("metrics_scrape_interval", "15s")
+        template_context = {
+            "project_name": context["project_name"],
+            "services": METRICS_SERVICES,
+            "scrape_interval": scrape_interval,
+            "evaluation_interval": scrape_interval,
+        }
 
-    def _render_template(self, template_name, context):
-        """
-        Render a Jinja2 template with the provided context.
-        """
-        template_path = self.template_dir / template_name
-        if not template_path.exists():
-            raise FileNotFoundError(f"Template '{template_path}' not found.")
-
-        with open(template_path, "r") as template_file:
-            template = Template(template_file.read())
-            return template.render(context)
+        # Prometheus scrape configuration and the recording rules the dashboards read
+        self.render_template(context, "prometheus.yml.j2", observability_path / "prometheus.yml", template_context)
+        self.render_template(context, "recording_rules.yml.j2", observability_path / "rules" / "recording_rules.yml",
+                             template_context)
 
-    @staticmethod
-    def _write_file(path, content):
-        """
-        Utility to write content to a file.
-        """
-        path.parent.mkdir(parents=True, exist_ok=True)  # Ensure directory exists
-        with open(path, "w") as f:
-            f.write(content)
+        # Grafana datasource, dashboard provider and one latency dashboard per service
+        grafana_path = observability_path / "grafana"
+        self.render_template(context, "grafana_datasource.yml.j2",
+                             grafana_path / "provisioning" / "datasources" / "prometheus.yml", template_context)
+        self.render_template(context, "grafana_dashboards.yml.j2",
+                             grafana_path / "provisioning" / "dashboards" / "dashboards.yml", template_context)
+        for service in METRICS_SERVICES:
+            dashboard = latency_dashboard(service["name"], service["job"])
+            self.write_output(context, grafana_path / "dashboards" / f"{service['name']}-latency.json",
+                              json.dumps(dashboard, indent=2) + "\n")
@@ -27,12 +27,6 @@ class PlanningHandler(BaseHandler):
         self.console = console
         self.project_root = self.get_project_root()
 
-        # Configure logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
-
         # Initialize the AI Manager
         self.ai_manager = AIManager(config_path="llm/config/config.json")
 
@@ -3,5 +3,5 @@ from typing import List, Dict
 
 class LLMProvider(ABC):
     @abstractmethod
-    def generate(self, messages: List[Dict[str, str]]) -> str:
+    def generate(self, messages: List[Dict[str, str]], purpose: str = "response") -> str:
         pass
@@ -0,0 +1,144 @@
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+# Identifies this process in persisted records, so one run's calls can be grouped later
+RUN_ID = uuid.uuid4().hex[:12]
+
+# Sessions of one process may share a persistence file
+_file_lock = threading.Lock()
+
+
+class UsageLedger:
+    """
+    Records token usage and latency of every LLM call.
+
+    A session ledger (one per AIManager) forwards its records to the run-wide
+    ledger and, when a path is given, appends them as JSON Lines for later analysis.
+    """
+
+    def __init__(self, session_id: Optional[str] = None, path: Optional[str] = None,
+                 parent: Optional["UsageLedger"] = None):
+        self.session_id = session_id
+        self.path = path
+        self.parent = parent
+        self.records: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def record(self, **fields) -> Dict:
+        """
+        Record one call.
+
+        Expected fields: model, purpose, prompt_tokens, completion_tokens, cached_tokens,
+        estimated_prompt_tokens, latency_s, ttft_s, streamed, error.
+        """
+        record = {"time": time.time(), "run_id": RUN_ID, "session_id": self.session_id, **fields}
+        self._append(record)
+        return record
+
+    def _append(self, record: Dict):
+        with self._lock:
+            self.records.append(record)
+        if self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with _file_lock, open(self.path, "a") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+        if self.parent is not None:
+            self.parent._append(record)
+
+    def summary(self) -> Dict:
+        """
+        Aggregate the recorded calls, overall and per model and purpose.
+        """
+        with self._lock:
+            records = list(self.records)
+        return summarize_usage(records)
+
+
+def summarize_usage(records: List[Dict]) -> Dict:
+    """
+    Aggregate usage records into totals, latency percentiles and estimate accuracy.
+    """
+    def aggregate(group):
+        succeeded = [r for r in group if not r.get("error")]
+        latencies = [r["latency_s"] for r in succeeded if r.get("latency_s") is not None]
+        ttfts = [r["ttft_s"] for r in succeeded if r.get("ttft_s") is not None]
+        prompt_tokens = sum(r.get("prompt_tokens") or 0 for r in succeeded)
+        cached_tokens = sum(r.get("cached_tokens") or 0 for r in succeeded)
+        # Local estimate vs API count, over the calls that report both
+        estimated = [r for r in succeeded if r.get("estimated_prompt_tokens") and r.get("prompt_tokens")]
+        estimate_error = [(r["estimated_prompt_tokens"] - r["prompt_tokens"]) / r["prompt_tokens"] for r in estimated]
+        return {
+            "calls": len(group),
+            "errors": len(group) - len(succeeded),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": sum(r.get("completion_tokens") or 0 for r in succeeded),
+            "cached_tokens": cached_tokens,
+            "cache_hit_calls": sum(1 for r in succeeded if r.get("cached_tokens")),
+            "cached_token_ratio": cached_tokens / prompt_tokens if prompt_tokens else 0.0,
+            "latency_s": _distribution(latencies),
+            "ttft_s": _distribution(ttfts),
+            "estimate_error_mean": sum(estimate_error) / len(estimate_error) if estimate_error else None,
+            "estimate_error_max": max(estimate_error, key=abs) if estimate_error else None,
+        }
+
+    def grouped(key):
+        groups = {}
+        for record in records:
+            groups.setdefault(record.get(key) or "unknown", []).append(record)
+        return {name: aggregate(group) for name, group in groups.items()}
+
+    summary = aggregate(records)
+    summary["by_model"] = grouped("model")
+    summary["by_purpose"] = grouped("purpose")
+    return summary
+
+
+def load_usage(path: str, run_id: Optional[str] = None, session_id: Optional[str] = None) -> List[Dict]:
+    """
+    Read persisted records, optionally restricted to one run or session.
+    """
+    records = []
+    if not os.path.exists(path):
+        return records
+    with open(path, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if run_id is not None and record.get("run_id") != run_id:
+                continue
+            if session_id is not None and record.get("session_id") != session_id:
+                continue
+            records.append(record)
+    return records
+
+
+def _distribution(values: List[float]) -> Optional[Dict[str, float]]:
+    if not values:
+        return None
+    ordered = sorted(values)
+
+    def rank(fraction):
+        return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+    return {"mean": sum(ordered) / len(ordered), "p50": rank(0.5), "p95": rank(0.95), "max": ordered[-1]}
+
+
+_run_ledger = UsageLedger()
+
+
+def get_run_ledger() -> UsageLedger:
+    """
+    Process-wide ledger aggregating every session of this run.
+    """
+    return _run_ledger
@@ -1,10 +1,15 @@
 import json
 import logging
+import uuid
+from typing import Optional
 from llm.llm_brain import LLMBrain
 from llm.memory.short_term_memory import ShortTermMemory
 from llm.memory.long_term_memory import LongTermMemory
 from llm.memory.composite_memory import CompositeMemory
+from llm.memory.cold_storage import ColdStorage
+from llm.memory.compaction import LLMSummarizer, MemoryCompactor
 from llm.persona import Persona
+from llm.accounting.usage_ledger import UsageLedger, get_run_ledger, load_usage, summarize_usage
 
 class AIManager:
     """
@@ -23,6 +28,12 @@ class AIManager:
         self.llm_brain = None
         self.memory = None
         self.persona = None
+        # Usage is accounted per manager (session); records also roll up into the run-wide ledger
+        self.usage_ledger = UsageLedger(
+            session_id=uuid.uuid4().hex[:12],
+            path=self.config.get("usage", {}).get("persist_path"),
+            parent=get_run_ledger(),
+        )
         self._initialize_components()
 
     def _load_config(self, path: str) -> dict:
@@ -50,12 +61,14 @@ class AIManager:
         # Initialize LLMBrain
         self.llm_brain = LLMBrain(
             model_type=self.config["model_name"],
-            max_tokens=self.config["max_tokens"]
+            max_tokens=self.config["max_tokens"],
+            base_url=self.config.get("base_url")
         )
         logging.info("LLMBrain initialized.")
 
         # Initialize memory
-        short_term_memory = ShortTermMemory(max_length=5)
+        memory_config = self.config.get("memory", {})
+        short_term_memory = ShortTermMemory(max_length=memory_config.get("short_term_max_length", 5))
         long_term_memory = LongTermMemory()
         self.memory = CompositeMemory(short_term_memory, long_term_memory)
         logging.info("Memory components initialized.")
@@ -64,10 +77,31 @@ class AIManager:
         self.persona = Persona(
             llm_brain=self.llm_brain,
             memory=self.memory,
-            config=self.config
+            config=self.config,
+            ledger=self.usage_ledger
         )
         logging.info("Persona initialized.")
 
+        # Compaction summarizes through the Persona's provider, so it is attached last
+        compaction_config = memory_config.get("compaction", {})
+        if compaction_config.get("enabled", False):
+            cold_storage_path = compaction_config.get("cold_storage_path")
+            long_term_memory.compactor = MemoryCompactor(
+                summarizer=LLMSummarizer(self.persona.llm_provider, self.persona.prompt_builder),
+                cold_storage=ColdStorage(cold_storage_path) if cold_storage_path else None,
+                max_raw_entries=compaction_config.get("max_raw_entries", 40),
+                keep_raw_entries=compaction_config.get("keep_raw_entries", 10),
+                max_session_summaries=compaction_config.get("max_session_summaries", 5),
+                max_summary_tokens=compaction_config.get("max_summary_tokens", 1000),
+                token_counter=self.persona.prompt_builder.count_tokens,
+                background=compaction_config.get("background", True),
+            )
+            logging.info("Long-term memory compaction enabled.")
+
+        if self.config.get("reflection", {}).get("background", False):
+            self.persona.start_reflection()
+            logging.info("Background reflection enabled.")
+
     def interact(self, user_input: str) -> str:
         """
         Process user input and get a response from the Persona.
@@ -84,18 +118,42 @@ class AIManager:
             logging.error(f"Error during interaction: {e}", exc_info=True)
             raise
 
-    def reflect(self):
+    def reflect(self, wait: bool = True, timeout: Optional[float] = 120.0):
         """
         Trigger the reflection process for the Persona.
+
+        :param wait: Block until the interactions since the last checkpoint are reflected on.
+        :param timeout: Maximum number of seconds to wait (None waits until the queue is drained).
+        :return: The rolling reflection summary.
         """
         logging.info("Initiating reflection process.")
         try:
-            self.persona.reflect()
-            logging.info("Reflection completed successfully.")
+            summary = self.persona.reflect(wait=wait, timeout=timeout)
+            logging.info("Reflection completed successfully." if wait else "Reflection scheduled.")
+            return summary
         except Exception as e:
             logging.error(f"Reflection process failed: {e}", exc_info=True)
             raise
 
+    def usage_summary(self, scope: str = "session") -> dict:
+        """
+        Token usage and latency of the LLM calls made so far.
+
+        :param scope: "session" for this manager, "run" for every manager in this process,
+            or "history" for all persisted records.
+        :return: Totals, latency/TTFT percentiles and the local token-estimate error,
+            overall and by model and purpose.
+        """
+        if scope == "session":
+            return self.usage_ledger.summary()
+        if scope == "run":
+            return get_run_ledger().summary()
+        if scope == "history":
+            if not self.usage_ledger.path:
+                raise ValueError("Usage persistence is disabled; set usage.persist_path in the configuration.")
+            return summarize_usage(load_usage(self.usage_ledger.path))
+        raise ValueError(f"Unknown usage scope '{scope}'.")
+
     def describe_persona(self) -> str:
         """
         Get a description of the Persona's current state.
@@ -110,8 +168,17 @@ class AIManager:
         Reload the configuration file and reinitialize components.
         """
         logging.info("Reloading configuration.")
+        self.shutdown()
         self.config = self._load_config(self.config_path)
         self._initialize_components()
         logging.info("Components reinitialized.")
 
-
+    def shutdown(self):
+        """
+        Stop background workers owned by the components.
+        """
+        if self.persona is not None:
+            self.persona.stop_reflection()
+        compactor = getattr(self.memory.long_term_memory, "compactor", None) if self.memory is not None else None
+        if compactor is not None:
+            compactor.close()
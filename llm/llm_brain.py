@@ -10,18 +10,22 @@ class LLMBrain:
     """
     Holds configuration and parameters for the LLM.
     """
-    def __init__(self, model_type: str = "gpt-4", temperature: float = 0.7, max_tokens: int = 4096):
+    def __init__(self, model_type: str = "gpt-4", temperature: float = 0.7, max_tokens: int = 4096, base_url: str = None):
         logging.debug(f"Initializing LLMBrain with model: {model_type}, temp: {temperature}, max_tokens: {max_tokens}")
         self.model_type = model_type
         self.temperature = temperature
         self.max_tokens = max_tokens
+        # An OpenAI-compatible endpoint, e.g. the local stub in benchmarks/openai_stub_server.py
+        self.base_url = base_url or os.getenv("OPENAI_BASE_URL") or None
         # Initialize the OpenAI client
         try:
             api_key = os.getenv("OPENAI_API_KEY")  # Load API key from .env file
+            if not api_key and self.base_url:
+                api_key = "local"  # Local stand-ins do not check the key
             if not api_key:
                 raise ValueError("OPENAI_API_KEY not set in environment variables")
-            client = OpenAI(api_key=api_key)
-            logging.info("OpenAI client initialized successfully")
+            client = OpenAI(api_key=api_key, base_url=self.base_url)
+            logging.info(f"OpenAI client initialized successfully{f' for {self.base_url}' if self.base_url else ''}")
             self.client = client
         except Exception as e:
             logging.critical(f"Failed to initialize OpenAI client: {e}")
@@ -0,0 +1,34 @@
+import gzip
+import json
+import os
+from typing import Dict, Iterator, List, Union
+
+
+class ColdStorage:
+    """
+    Append-only, gzip-compressed JSON Lines archive for raw memory entries.
+
+    Each call to `append` writes a new gzip member, which keeps appends cheap
+    while the file remains readable as a single gzip stream.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def append(self, entries: List[Dict[str, Union[str, Dict]]]) -> None:
+        if not entries:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        payload = "".join(json.dumps(entry, default=str) + "\n" for entry in entries)
+        with gzip.open(self.path, "at", encoding="utf-8") as f:
+            f.write(payload)
+
+    def iter_entries(self) -> Iterator[Dict[str, Union[str, Dict]]]:
+        if not os.path.exists(self.path):
+            return
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
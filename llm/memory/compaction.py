@@ -0,0 +1,204 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Union
+from llm.memory.cold_storage import ColdStorage
+
+Entry = Dict[str, Union[str, Dict]]
+
+
+def estimate_tokens(messages: List[Entry]) -> int:
+    """
+    Tokenizer-free estimate (about four characters per token), used when no token counter is given.
+    """
+    return sum(len(str(message["content"])) // 4 + 4 for message in messages)
+
+
+class TruncatingSummarizer:
+    """
+    LLM-free summarizer that keeps the beginning of every entry.
+    Used when no provider is available and as a fallback when the LLM call fails.
+    """
+
+    def __init__(self, max_chars_per_entry: int = 200):
+        self.max_chars_per_entry = max_chars_per_entry
+
+    def summarize(self, entries: List[Entry], level: str) -> str:
+        lines = []
+        for entry in entries:
+            content = " ".join(str(entry["content"]).split())
+            if len(content) > self.max_chars_per_entry:
+                content = content[:self.max_chars_per_entry].rstrip() + "..."
+            lines.append(f"{entry['role']}: {content}")
+        return "\n".join(lines)
+
+
+class LLMSummarizer:
+    """
+    Summarizer backed by the LLM provider.
+    """
+
+    def __init__(self, llm_provider, prompt_builder, fallback: Optional[TruncatingSummarizer] = None):
+        self.llm_provider = llm_provider
+        self.prompt_builder = prompt_builder
+        self.fallback = fallback or TruncatingSummarizer()
+
+    def summarize(self, entries: List[Entry], level: str) -> str:
+        try:
+            messages = self.prompt_builder.summarize(entries, level=level)
+            return self.llm_provider.generate(messages, purpose="summary")
+        except Exception as e:
+            logging.warning(f"LLM summarization failed, falling back to truncation: {e}")
+            return self.fallback.summarize(entries, level)
+
+
+class MemoryCompactor:
+    """
+    Folds old raw turns into hierarchical summaries (turn -> session -> project).
+
+    Once the raw history exceeds `max_raw_entries`, everything but the most recent
+    `keep_raw_entries` is archived to cold storage and replaced by one session summary.
+    When more than `max_session_summaries` session summaries accumulate, or the
+    summaries together exceed `max_summary_tokens`, they are folded together with the
+    previous project summary into a new project summary, which is trimmed to the budget.
+
+    With `background` set, compaction runs on a single worker thread so the turn that
+    crosses the threshold does not wait for the summarizer.
+    """
+
+    def __init__(
+        self,
+        summarizer,
+        cold_storage: Optional[ColdStorage] = None,
+        max_raw_entries: int = 40,
+        keep_raw_entries: int = 10,
+        max_session_summaries: int = 5,
+        max_summary_tokens: int = 1000,
+        token_counter: Optional[Callable[[List[Entry]], int]] = None,
+        background: bool = False,
+    ):
+        """
+        :param summarizer: Object with a `summarize(entries, level)` method.
+        :param cold_storage: Archive receiving the raw entries that are compacted away.
+        :param max_raw_entries: Raw entries that trigger a compaction.
+        :param keep_raw_entries: Most recent raw entries kept verbatim.
+        :param max_session_summaries: Session summaries kept before folding them into the project summary.
+        :param max_summary_tokens: Budget of all summaries together in the prompt.
+        :param token_counter: Counts the tokens of a list of messages (defaults to `estimate_tokens`).
+        :param background: Compact on a worker thread instead of in the caller.
+        """
+        if keep_raw_entries >= max_raw_entries:
+            raise ValueError("keep_raw_entries must be smaller than max_raw_entries.")
+        self.summarizer = summarizer
+        self.cold_storage = cold_storage
+        self.max_raw_entries = max_raw_entries
+        # Entries are stored as user/assistant pairs; keep whole pairs only.
+        self.keep_raw_entries = keep_raw_entries - keep_raw_entries % 2
+        self.max_session_summaries = max_session_summaries
+        self.max_summary_tokens = max_summary_tokens
+        self.token_counter = token_counter or estimate_tokens
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-compaction") if background else None
+        self._pending = None
+
+    def needs_compaction(self, memory) -> bool:
+        return len(memory.storage) > self.max_raw_entries
+
+    def schedule(self, memory) -> None:
+        """
+        Compact `memory` if needed: on the worker thread in background mode, otherwise right away.
+        """
+        if not self.needs_compaction(memory):
+            return
+        if self._executor is None:
+            self.compact(memory)
+        elif self._pending is None or self._pending.done():
+            # A compaction that is already queued or running covers the new entries too
+            self._pending = self._executor.submit(self._compact_logged, memory)
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """
+        Block until the scheduled compaction has finished.
+        """
+        if self._pending is not None:
+            self._pending.result(timeout)
+
+    def close(self) -> None:
+        """
+        Finish the scheduled compaction and stop the worker thread.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def compact(self, memory) -> None:
+        """
+        Compact the given LongTermMemory in place.
+
+        The summarizer runs without holding the memory's lock, so turns can be added
+        meanwhile; they are kept as raw entries.
+        """
+        while self.needs_compaction(memory):
+            with memory.lock:
+                old = memory.storage[:len(memory.storage) - self.keep_raw_entries]
+
+            if self.cold_storage is not None:
+                self.cold_storage.append(old)
+            summary = self._summary_entry(self.summarizer.summarize(old, level="session"), "session", len(old))
+
+            with memory.lock:
+                del memory.storage[:len(old)]
+                memory.session_summaries.append(summary)
+            logging.info(f"Compacted {len(old)} memory entries into a session summary.")
+
+            if len(memory.session_summaries) > self.max_session_summaries or self._over_budget(memory):
+                self._fold(memory)
+
+    def summary_tokens(self, memory) -> int:
+        summaries = ([memory.project_summary] if memory.project_summary else []) + memory.session_summaries
+        return self.token_counter(summaries) if summaries else 0
+
+    def _over_budget(self, memory) -> bool:
+        return self.summary_tokens(memory) > self.max_summary_tokens
+
+    def _fold(self, memory) -> None:
+        """
+        Fold the session summaries and the previous project summary into a new project summary.
+        """
+        with memory.lock:
+            sessions = list(memory.session_summaries)
+            to_fold = ([memory.project_summary] if memory.project_summary else []) + sessions
+        count = sum(entry["metadata"]["entries"] for entry in to_fold)
+        project_summary = self._fit(
+            self._summary_entry(self.summarizer.summarize(to_fold, level="project"), "project", count)
+        )
+        with memory.lock:
+            memory.project_summary = project_summary
+            del memory.session_summaries[:len(sessions)]
+        logging.info(f"Folded session summaries into the project summary ({count} entries).")
+
+    def _fit(self, entry: Entry) -> Entry:
+        """
+        Trim a summary to `max_summary_tokens`.
+        """
+        content = entry["content"]
+        tokens = self.token_counter([entry])
+        if tokens <= self.max_summary_tokens:
+            return entry
+        while content and self.token_counter([{**entry, "content": content + "..."}]) > self.max_summary_tokens:
+            content = content[:int(len(content) * self.max_summary_tokens / tokens * 0.9)].rstrip()
+            tokens = max(self.token_counter([{**entry, "content": content}]), 1)
+        logging.info(f"Trimmed the {entry['metadata']['summary_level']} summary to {self.max_summary_tokens} tokens.")
+        return {**entry, "content": content + "..."}
+
+    def _compact_logged(self, memory) -> None:
+        try:
+            self.compact(memory)
+        except Exception as e:
+            # Entries stay raw; the next turn over the threshold schedules another attempt
+            logging.error(f"Memory compaction failed: {e}", exc_info=True)
+
+    @staticmethod
+    def _summary_entry(content: str, level: str, count: int) -> Entry:
+        return {
+            "role": "system",
+            "content": f"Summary of earlier conversation ({level}): {content}",
+            "metadata": {"summary_level": level, "entries": count},
+        }
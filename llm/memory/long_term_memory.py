@@ -1,9 +1,14 @@
+import threading
 from typing import List, Dict, Optional, Union
 from llm.abstract.abstract_memory import AbstractMemory
 
 class LongTermMemory(AbstractMemory):
-    def __init__(self):
-        self.storage = []  # Similar structure to ShortTermMemory
+    def __init__(self, compactor=None):
+        self.lock = threading.RLock()  # Compaction may rewrite the lists from a worker thread
+        self.storage = []  # Recent raw entries, similar structure to ShortTermMemory
+        self.session_summaries = []  # Summaries of compacted raw entries, oldest first
+        self.project_summary = None  # Summary of folded session summaries
+        self.compactor = compactor
 
     def add_interaction(
         self, 
@@ -13,17 +18,30 @@ class LongTermMemory(AbstractMemory):
     ) -> None:
         user_entry = {"role": "user", "content": user_message, "metadata": metadata}
         assistant_entry = {"role": "assistant", "content": assistant_response, "metadata": metadata}
-        self.storage.extend([user_entry, assistant_entry])
+        with self.lock:
+            self.storage.extend([user_entry, assistant_entry])
+
+        if self.compactor is not None:
+            self.compactor.schedule(self)
 
     def retrieve(
         self, role: Optional[str] = None, limit: Optional[int] = None
     ) -> List[Dict[str, Union[str, Dict]]]:
-        filtered = self.storage
+        """
+        Summaries first, then the raw entries; `limit` applies to the raw entries only.
+        """
+        with self.lock:
+            summaries = ([self.project_summary] if self.project_summary else []) + list(self.session_summaries)
+            raw = list(self.storage)
         if role:
-            filtered = [m for m in filtered if m["role"] == role]
+            summaries = [m for m in summaries if m["role"] == role]
+            raw = [m for m in raw if m["role"] == role]
         if limit:
-            filtered = filtered[-limit:]
-        return filtered
+            raw = raw[-limit:]
+        return summaries + raw
 
     def clear(self) -> None:
-        self.storage.clear()
+        with self.lock:
+            self.storage.clear()
+            self.session_summaries.clear()
+            self.project_summary = None
@@ -1,22 +1,44 @@
 import logging
-from typing import List
+from typing import List, Optional
 from llm.abstract.abstract_memory import AbstractMemory
 from llm.utils.message_loader import MessageLoader
 from llm.prompt.builder import PromptBuilder
 from llm.provider.llm_provider import LLMProvider
 from llm.llm_brain import LLMBrain
+from llm.reflection.worker import ReflectionWorker
 
 class Persona:
-    def __init__(self, llm_brain: LLMBrain, memory: AbstractMemory, config: dict):
+    def __init__(self, llm_brain: LLMBrain, memory: AbstractMemory, config: dict, ledger=None):
         self.llm_brain = llm_brain
         self.memory = memory
         self.message_loader = MessageLoader()
         self.prompt_builder = PromptBuilder(model=llm_brain.model_type, max_tokens=llm_brain.max_tokens)
-        self.llm_provider = LLMProvider(model=llm_brain.model_type, temperature=llm_brain.temperature, client=llm_brain.client)
+        self.llm_provider = LLMProvider(
+            model=llm_brain.model_type,
+            temperature=llm_brain.temperature,
+            client=llm_brain.client,
+            ledger=ledger,
+            token_counter=self.prompt_builder.count_tokens,
+            stream=config.get("stream", False),
+        )
 
         self.system_message = self.message_loader.load_system_message(config["system_message_path"])
         self.n_shots = self.message_loader.load_n_shots(config["n_shots_path"])
-        self.traits = config.get("traits", [])
+        self.base_traits = list(config.get("traits", []))
+        self.traits = list(self.base_traits)
+        self.reflection_summary = ""
+
+        reflection_config = config.get("reflection", {})
+        self.reflection_worker = ReflectionWorker(
+            llm_provider=self.llm_provider,
+            prompt_builder=self.prompt_builder,
+            on_update=self._apply_reflection,
+            min_batch=reflection_config.get("min_batch", 4),
+            max_batch=reflection_config.get("max_batch", 20),
+            interval_seconds=reflection_config.get("interval_seconds", 30.0),
+            max_rules=reflection_config.get("max_rules", 10),
+            max_attempts=reflection_config.get("max_attempts", 3),
+        )
 
     def respond_to(self, user_input: str) -> str:
         messages = self.prompt_builder.build_messages(
@@ -35,11 +57,40 @@ class Persona:
 
     def learn(self, user_message: str, assistant_response: str):
         self.memory.add_interaction(user_message, assistant_response)
+        self.reflection_worker.submit(user_message, assistant_response)
 
-    def reflect(self):
-        messages = self.prompt_builder.reflect(memory=self.memory.retrieve())
-        response = self.llm_provider.generate(messages)
-        return response
+    def start_reflection(self):
+        """
+        Run reflection in the background instead of on demand.
+        """
+        self.reflection_worker.start()
+
+    def stop_reflection(self):
+        self.reflection_worker.stop()
+
+    def reflect(self, wait: bool = True, timeout: Optional[float] = None) -> str:
+        """
+        Reflect on the interactions learned since the last reflection checkpoint.
+
+        :param wait: Block until pending interactions are processed. If False, they are
+                     processed in the background and the current summary is returned.
+        :param timeout: Maximum number of seconds to wait when `wait` is True.
+        :return: The rolling reflection summary.
+        """
+        if wait:
+            if not self.reflection_worker.flush(timeout):
+                logging.warning(
+                    f"Reflection did not cover every interaction ({self.reflection_worker.pending_count()} pending, "
+                    f"{len(self.reflection_worker.dead_letters)} given up on)."
+                )
+        else:
+            self.reflection_worker.trigger()
+        return self.reflection_summary
+
+    def _apply_reflection(self, summary: str, rules: List[str]):
+        # Swap the list rather than mutating it so concurrent respond_to calls see a consistent view.
+        self.reflection_summary = summary
+        self.traits = self.base_traits + [rule for rule in rules if rule not in self.base_traits]
 
     def describe(self) -> str:
         traits_description = ", ".join(self.traits) if self.traits else "None"
@@ -47,5 +98,7 @@ class Persona:
             f"Persona Description:\n"
             f"- System Message: {self.system_message}\n"
             f"- Traits: {traits_description}\n"
+            f"- Reflection checkpoint: {self.reflection_worker.checkpoint} interaction(s)\n"
+            f"- Reflection dead letters: {len(self.reflection_worker.dead_letters)} interaction(s)\n"
             f"- N-Shots: {len(self.n_shots)} examples"
         )
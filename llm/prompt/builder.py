@@ -88,3 +88,77 @@ class PromptBuilder(PromptBuilder):
 
         logging.debug(f"Reflection prompt built successfully with {token_count} tokens.")
         return messages
+
+    def reflect_incremental(
+        self,
+        summary: str,
+        rules: List[str],
+        interactions: List[Dict[str, str]],
+        reflection_instructions: str = (
+            "You maintain a rolling summary of a conversation and a list of rules for the assistant. "
+            "Update the summary with the new interactions and suggest refinements to the rules. "
+            "Rules should be assertive, clear, actionable, no need to explain. make it SMART. "
+            'Respond only with JSON: {"summary": "<updated summary>", "rules": ["<rule>", ...]}. '
+            "If there are no new suggestions, return an empty rules list."
+        )
+    ) -> List[Dict[str, str]]:
+        """
+        Build a reflection prompt covering only the interactions since the last checkpoint.
+
+        :param summary: Rolling summary produced by the previous reflection pass.
+        :param rules: Rules accepted so far.
+        :param interactions: New interactions as dicts with 'user' and 'assistant' keys.
+        :param reflection_instructions: Instructions for the LLM to guide the reflection process.
+        :return: A list of messages formatted for the reflection process.
+        """
+        current_rules = "\n".join(f"- {rule}" for rule in rules) or "None"
+        messages = [
+            {"role": "system", "content": reflection_instructions},
+            {"role": "system", "content": f"Current summary: {summary or 'None'}\nCurrent rules:\n{current_rules}"},
+        ]
+
+        for interaction in interactions:
+            messages.append({"role": "user", "content": interaction["user"]})
+            messages.append({"role": "assistant", "content": interaction["assistant"]})
+
+        token_count = self.count_tokens(messages)
+        if token_count > self.max_tokens:
+            logging.warning(
+                f"Reflection prompt exceeds max token limit ({self.max_tokens}). Current count: {token_count}. "
+                "Consider a smaller reflection batch."
+            )
+            raise ValueError("Reflection prompt exceeds max token limit.")
+
+        logging.debug(f"Incremental reflection prompt built with {len(interactions)} interaction(s), {token_count} tokens.")
+        return messages
+
+    def summarize(
+        self,
+        entries: List[Dict[str, str]],
+        level: str = "session",
+        summary_instructions: str = (
+            "Summarize the following conversation so it can replace it as context for later turns. "
+            "Keep decisions, names, requirements and open questions. Be direct and concise."
+        )
+    ) -> List[Dict[str, str]]:
+        """
+        Build a prompt that folds memory entries into a single summary.
+
+        :param entries: Raw entries or lower-level summaries to fold.
+        :param level: Summary level being produced ('session' or 'project').
+        :param summary_instructions: Instructions for the LLM to guide the summarization.
+        :return: A list of messages formatted for the summarization.
+        """
+        transcript = "\n".join(f"{entry['role']}: {entry['content']}" for entry in entries)
+        messages = [
+            {"role": "system", "content": f"{summary_instructions} This is a {level}-level summary."},
+            {"role": "user", "content": transcript},
+        ]
+
+        token_count = self.count_tokens(messages)
+        if token_count > self.max_tokens:
+            logging.warning(
+                f"Summary prompt exceeds max token limit ({self.max_tokens}). Current count: {token_count}."
+            )
+            raise ValueError("Summary prompt exceeds max token limit.")
+        return messages
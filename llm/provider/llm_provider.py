@@ -1,49 +1,150 @@
 import logging
+import time
 import openai
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
 from llm.abstract.llm_provider import LLMProvider
+from utils.structured_logging import redacted
+from utils.tracing import get_tracer
 
 class LLMProvider(LLMProvider):
     """
     Handles interaction with the LLM (e.g., OpenAI).
     """
 
-    def __init__(self, model: str, temperature: float = 0.7, client=None):
+    def __init__(self, model: str, temperature: float = 0.7, client=None, ledger=None,
+                 token_counter: Optional[Callable[[List[Dict[str, str]]], int]] = None, stream: bool = False):
+        """
+        :param ledger: UsageLedger recording tokens and latency of every call.
+        :param token_counter: Local prompt-token estimate, compared against the API-reported count.
+        :param stream: Stream completions, which also measures time-to-first-token.
+        """
         self.model = model
         self.temperature = temperature
         self.client = client
+        self.ledger = ledger
+        self.token_counter = token_counter
+        self.stream = stream
 
-        # Set up a dedicated logger for this class
+        # Level is controlled by the root logger configuration
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.logger.setLevel(logging.DEBUG)  # Adjust logging level as needed
+        self.logger.info("LLMProvider initialized with model=%s, temperature=%s", model, temperature)
 
-        # Log initialization details
-        self.logger.info(f"LLMProvider initialized with model={model}, temperature={temperature}")
-
-    def generate(self, messages: List[Dict[str, str]]) -> str:
+    def generate(self, messages: List[Dict[str, str]], purpose: str = "response") -> str:
         """
         Generates a response using the LLM based on the provided messages.
 
         :param messages: List of role-based messages for the LLM.
+        :param purpose: What the call is for (response, reflection, summary), for accounting.
         :return: The generated response from the LLM.
         """
-        self.logger.debug(f"Generating response with model={self.model}, temperature={self.temperature}")
-        self.logger.debug(f"Input messages: {messages}")
+        # Prompts can be large; they are only formatted when debug logging is enabled
+        self.logger.debug("Generating response with model=%s, temperature=%s", self.model, self.temperature)
+        self.logger.debug("Input messages: %s", redacted(messages))
 
+        estimated_prompt_tokens = self.token_counter(messages) if self.token_counter and self.ledger else None
+        usage, ttft, error = None, None, None
+        started = time.perf_counter()
         try:
-            completion = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=self.temperature,
-                top_p=1.0
-            )
+            with get_tracer().span("llm.generate", category="llm", model=self.model, messages=len(messages),
+                                   purpose=purpose) as span:
+                try:
+                    if self.stream:
+                        response, usage, ttft, retries = self._generate_streaming(messages, started)
+                        if ttft is not None:
+                            span.set_attribute("ttft_ms", ttft * 1000)
+                    else:
+                        completion, retries = self._create(
+                            model=self.model,
+                            messages=messages,
+                            temperature=self.temperature,
+                            top_p=1.0
+                        )
+                        usage = getattr(completion, "usage", None)
+                        response = completion.choices[0].message.content
+                except Exception as e:
+                    span.set_attribute("retries", self._retries_before_failure(e))
+                    raise
+                span.set_attribute("retries", retries)
+                if usage is not None:
+                    span.set_attributes(**self._usage_fields(usage))
 
             # Extract and log the response
-            response = completion.choices[0].message.content.strip()
-            self.logger.info("Response generated successfully")
-            self.logger.debug(f"Generated response: {response}")
+            response = (response or "").strip()
+            self.logger.info("Response generated successfully", extra={"model": self.model, "purpose": purpose})
+            self.logger.debug("Generated response: %s", response)
             return response
 
         except Exception as e:
+            error = f"{type(e).__name__}: {e}"
             self.logger.error("Error occurred while generating response", exc_info=True)
             raise
+        finally:
+            if self.ledger is not None:
+                self.ledger.record(
+                    model=self.model,
+                    purpose=purpose,
+                    estimated_prompt_tokens=estimated_prompt_tokens,
+                    latency_s=time.perf_counter() - started,
+                    ttft_s=ttft,
+                    streamed=self.stream,
+                    error=error,
+                    **(self._usage_fields(usage) if usage is not None else {}),
+                )
+
+    def _create(self, **kwargs):
+        """
+        Create a chat completion, returning (result, number of retries the client made).
+
+        The OpenAI client retries rate-limited and failed requests itself; the raw
+        response reports how many retries that took. Clients without raw responses
+        (test doubles) report none.
+        """
+        completions = self.client.chat.completions
+        raw_completions = getattr(completions, "with_raw_response", None)
+        if raw_completions is None:
+            return completions.create(**kwargs), 0
+        raw = raw_completions.create(**kwargs)
+        return raw.parse(), getattr(raw, "retries_taken", 0)
+
+    def _retries_before_failure(self, error: Exception) -> int:
+        """
+        Retries spent on a request that failed: all of them if the error was retryable.
+        """
+        retryable = isinstance(error, (openai.APIConnectionError, openai.APITimeoutError)) or (
+            isinstance(error, openai.APIStatusError) and (error.status_code in (408, 409, 429) or error.status_code >= 500)
+        )
+        return getattr(self.client, "max_retries", 0) if retryable else 0
+
+    def _generate_streaming(self, messages: List[Dict[str, str]], started: float):
+        """
+        Stream a completion, returning (text, usage, seconds to the first content token, retries).
+        """
+        stream, retries = self._create(
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature,
+            top_p=1.0,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        parts, usage, ttft = [], None, None
+        for chunk in stream:
+            if getattr(chunk, "usage", None) is not None:
+                usage = chunk.usage
+            for choice in chunk.choices or []:
+                content = getattr(choice.delta, "content", None)
+                if content:
+                    if ttft is None:
+                        ttft = time.perf_counter() - started
+                    parts.append(content)
+        return "".join(parts), usage, ttft, retries
+
+    @staticmethod
+    def _usage_fields(usage) -> Dict[str, int]:
+        details = getattr(usage, "prompt_tokens_details", None)
+        return {
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+            "total_tokens": usage.total_tokens,
+            "cached_tokens": getattr(details, "cached_tokens", None) or 0,
+        }
@@ -0,0 +1,288 @@
+import json
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class ReflectionWorker:
+    """
+    Background worker that reflects on interactions incrementally.
+
+    Interactions are queued as the Persona learns them. The worker only sends the
+    interactions added since its last checkpoint, together with the rolling summary
+    and the rules accepted so far, so the cost of a reflection pass is proportional
+    to the new data rather than to the whole memory.
+    """
+
+    def __init__(
+        self,
+        llm_provider,
+        prompt_builder,
+        on_update: Optional[Callable[[str, List[str]], None]] = None,
+        min_batch: int = 4,
+        max_batch: int = 20,
+        interval_seconds: float = 30.0,
+        max_rules: int = 10,
+        max_attempts: int = 3,
+    ):
+        """
+        :param llm_provider: Provider used to run the reflection prompt.
+        :param prompt_builder: Builder exposing `reflect_incremental`.
+        :param on_update: Callback invoked with (summary, rules) after each pass.
+        :param min_batch: Number of pending interactions that wakes the worker.
+        :param max_batch: Maximum number of interactions sent in a single pass.
+        :param interval_seconds: Idle interval after which pending interactions are processed anyway.
+        :param max_rules: Maximum number of accepted rules kept at any time.
+        :param max_attempts: Consecutive failures after which a batch is moved to `dead_letters`.
+        """
+        self.llm_provider = llm_provider
+        self.prompt_builder = prompt_builder
+        self.on_update = on_update
+        self.min_batch = min_batch
+        self.max_batch = max_batch
+        self.interval_seconds = interval_seconds
+        self.max_rules = max_rules
+        self.max_attempts = max_attempts
+
+        self.summary = ""
+        self.rules: List[str] = []
+        self.checkpoint = 0  # Number of interactions already reflected on
+        self.dead_letters: List[Dict[str, str]] = []  # Interactions the worker gave up on
+
+        self._pending: List[Dict[str, str]] = []
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._busy = False
+        self._failures = 0  # Consecutive failed passes over the batch at the front of the queue
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """
+        Start the background thread. Calling it twice is a no-op.
+        """
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="reflection-worker", daemon=True)
+        self._thread.start()
+        self.logger.info("Reflection worker started.")
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop the background thread. Pending interactions are kept for the next pass.
+        """
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.logger.info("Reflection worker stopped.")
+
+    def submit(self, user_message: str, assistant_response: str):
+        """
+        Queue a new interaction. Never blocks on the LLM.
+        """
+        with self._lock:
+            self._pending.append({"user": user_message, "assistant": assistant_response})
+            pending = len(self._pending)
+        if pending >= self.min_batch:
+            self._wakeup.set()
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def trigger(self):
+        """
+        Ask the background thread to process pending interactions now.
+
+        Without a running background thread, they are processed on a one-shot thread
+        instead, so the call never blocks on the LLM either way.
+        """
+        if self.running:
+            self._wakeup.set()
+            return
+        threading.Thread(target=self._run_detached, name="reflection-once", daemon=True).start()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued interaction has been reflected on.
+
+        :param timeout: Maximum number of seconds to wait.
+        :return: True if the queue was drained, False on timeout or if interactions were given up on.
+        """
+        given_up = len(self.dead_letters)
+        if not self.running:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                self.run_once()
+                with self._idle:
+                    # A one-shot pass started by trigger() may still hold a batch
+                    remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                    if not self._idle.wait_for(lambda: not self._busy, remaining):
+                        return False
+                    if not self._pending:
+                        return len(self.dead_letters) == given_up
+        self.trigger()
+        with self._idle:
+            drained = self._idle.wait_for(lambda: not self._pending and not self._busy, timeout)
+            return drained and len(self.dead_letters) == given_up
+
+    def run_once(self) -> bool:
+        """
+        Synchronously process all pending interactions, batch by batch.
+
+        :return: True if at least one batch was processed.
+        """
+        processed = False
+        while self._process_batch():
+            processed = True
+        return processed
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.interval_seconds)
+            self._wakeup.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.run_once()
+            except Exception as e:
+                # The batch has been re-queued or given up on; wait for the next interval before retrying.
+                self.logger.error(f"Reflection pass failed: {e}", exc_info=True)
+                self._stop.wait(self.interval_seconds)
+
+    def _run_detached(self):
+        try:
+            self.run_once()
+        except Exception as e:
+            # The batch has been re-queued or given up on; the next trigger or flush retries it.
+            self.logger.error(f"Reflection pass failed: {e}", exc_info=True)
+
+    def _process_batch(self) -> bool:
+        with self._lock:
+            if not self._pending or self._busy:
+                return False
+            batch = self._pending[:self.max_batch]
+            del self._pending[:len(batch)]
+            self._busy = True
+
+        try:
+            messages, batch = self._fit_batch(batch)
+            if messages is None:
+                # A single interaction over the token budget can never be reflected on
+                self._give_up(batch, "it exceeds the reflection token budget")
+                return True
+            response = self.llm_provider.generate(messages, purpose="reflection")
+            summary, suggestions = self._parse_response(response)
+        except Exception:
+            with self._idle:
+                self._failures += 1
+                exhausted = self._failures >= self.max_attempts
+                if not exhausted:
+                    self._pending[:0] = batch
+                    self._busy = False
+                    self._idle.notify_all()
+            if exhausted:
+                self._give_up(batch, f"reflection failed {self.max_attempts} times in a row")
+            raise
+
+        if summary:
+            self.summary = summary
+        self.rules = self._accept_rules(suggestions)
+
+        with self._idle:
+            self.checkpoint += len(batch)
+            self._failures = 0
+            self._busy = False
+            self._idle.notify_all()
+
+        self.logger.info(
+            f"Reflected on {len(batch)} interaction(s); checkpoint={self.checkpoint}, rules={len(self.rules)}."
+        )
+        if self.on_update:
+            self.on_update(self.summary, list(self.rules))
+        return True
+
+    def _fit_batch(self, batch: List[Dict[str, str]]):
+        """
+        Build the reflection prompt for the largest leading part of `batch` that fits the token budget.
+
+        The batch is halved until the prompt fits; the interactions left out are put back
+        at the front of the queue for the next pass.
+
+        :return: (messages, interactions sent), with messages None if the first interaction alone is too large.
+        """
+        size = len(batch)
+        messages = None
+        while size:
+            try:
+                messages = self.prompt_builder.reflect_incremental(
+                    summary=self.summary, rules=self.rules, interactions=batch[:size]
+                )
+                break
+            except ValueError:
+                if size == 1:
+                    break
+                size //= 2
+        if size < len(batch):
+            with self._lock:
+                self._pending[:0] = batch[size:]
+            self.logger.info(f"Reflection batch split to fit the token budget; sending {size} of {len(batch)}.")
+        return messages, batch[:size]
+
+    def _give_up(self, batch: List[Dict[str, str]], reason: str):
+        """
+        Move `batch` to the dead letters so the queue keeps draining.
+        """
+        with self._idle:
+            self.dead_letters.extend(batch)
+            self._failures = 0
+            self._busy = False
+            self._idle.notify_all()
+        self.logger.error(f"Gave up reflecting on {len(batch)} interaction(s): {reason}.")
+
+    def _accept_rules(self, suggestions: List[str]) -> List[str]:
+        """
+        Merge new suggestions into the accepted rules, dropping duplicates and keeping the most recent ones.
+        """
+        rules = list(self.rules)
+        known = {rule.lower() for rule in rules}
+        for suggestion in suggestions:
+            if suggestion.lower() not in known:
+                rules.append(suggestion)
+                known.add(suggestion.lower())
+        return rules[-self.max_rules:] if self.max_rules else rules
+
+    @staticmethod
+    def _parse_response(response: str):
+        """
+        Parse the reflection response into (summary, rules).
+
+        The prompt asks for a JSON object, but a plain-text answer is tolerated:
+        'No suggestions' yields no rules, and any other text is used as the summary.
+        """
+        text = (response or "").strip()
+        if text.startswith("```"):
+            text = text.strip("`")
+            text = text[text.find("{"):] if "{" in text else text
+        try:
+            data = json.loads(text)
+        except (json.JSONDecodeError, TypeError):
+            if text.lower().rstrip(".") == "no suggestions":
+                return "", []
+            return text, []
+
+        if not isinstance(data, dict):
+            return "", []
+        rules = [str(rule).strip() for rule in data.get("rules", []) if str(rule).strip()]
+        rules = [rule for rule in rules if rule.lower().rstrip(".") != "no suggestions"]
+        return str(data.get("summary", "")).strip(), rules
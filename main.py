@@ -6,13 +6,28 @@ from handlers.backend_setup import BackendSetupHandler
 from handlers.frontend_setup import FrontendSetupHandler
 from handlers.docker_setup import DockerConfigurationHandler
 from handlers.observability import ObservabilitySetupHandler
+from handlers.load_testing import LoadTestingSetupHandler
 from handlers.documentation import DocumentationSetupHandler
 from handlers.ci_cd import CiCdSetupHandler
-from utils.helpers import chain_handlers
+from utils.checkpoint import CheckpointJournal, JOURNAL_PATH
+from utils.helpers import STATE_DIR, chain_handlers
+from utils.memory_profile import MemoryProfiler
+from utils.metrics import enable_metrics
+from utils.run_history import HISTORY_PATH, RunHistory, record_current_run
+from utils.staging import OutputStager
+from utils.structured_logging import configure_logging
+from utils.tracing import get_tracer
+from utils.workspace_pool import POOL_DIR, WorkspacePool
 from rich.console import Console
+from rich.table import Table
 from dotenv import load_dotenv
+from contextlib import nullcontext
+from pathlib import Path
+import argparse
 import logging
 import os
+import sys
+import time
 
 
 def load_defaults_to_context(context):
@@ -29,24 +44,51 @@ def load_defaults_to_context(context):
     context["postgres_version"] = os.getenv("POSTGRES_VERSION", "16")
     context["python_image"] = os.getenv("PYTHON_IMAGE", "3.13-slim")
     context["python_version"] = os.getenv("PYTHON_VERSION", "3.13.1")
+    # Python package manager of the generated backend: "pipenv", "pip-tools" or "uv"
+    context["package_manager"] = os.getenv("PACKAGE_MANAGER", "pipenv")
+    # Frontend: Node package manager ("npm", "yarn" or "pnpm") and scaffold ("cra" or "vite")
+    context["frontend_package_manager"] = os.getenv("FRONTEND_PACKAGE_MANAGER", "npm")
+    context["frontend_template"] = os.getenv("FRONTEND_TEMPLATE", "cra")
+    # Docker: "development" (runserver, hot reload) or "production" (multi-stage, gunicorn)
+    context["docker_profile"] = os.getenv("DOCKER_PROFILE", "development")
+    context["app_server"] = os.getenv("APP_SERVER", "wsgi")
+    context["container_cpus"] = os.getenv("CONTAINER_CPUS", "2")
+    context["caddy_image"] = os.getenv("CADDY_IMAGE", "2-alpine")
+    # Database: optional PgBouncer and the resources Postgres is tuned for (production profile)
+    context["db_pooler"] = os.getenv("DB_POOLER", "none")
+    context["pgbouncer_image"] = os.getenv("PGBOUNCER_IMAGE", "v1.23.1-p2")
+    context["db_memory_mb"] = int(os.getenv("DB_MEMORY_MB", "1024"))
+    context["db_cpus"] = os.getenv("DB_CPUS", context["container_cpus"])
+    context["db_max_connections"] = int(os.getenv("DB_MAX_CONNECTIONS", "100"))
+    # Caching: "none" or "redis" (Redis service, Django CACHES/sessions and app/cache_utils.py)
+    context["cache_backend"] = os.getenv("CACHE_BACKEND", "none")
+    context["redis_image"] = os.getenv("REDIS_IMAGE", "7-alpine")
+    context["cache_memory_mb"] = int(os.getenv("CACHE_MEMORY_MB", "256"))
+    # Metrics stack: Prometheus and Grafana services, scrape interval and retention
+    context["prometheus_image"] = os.getenv("PROMETHEUS_IMAGE", "v2.54.1")
+    context["grafana_image"] = os.getenv("GRAFANA_IMAGE", "11.2.0")
+    context["metrics_scrape_interval"] = os.getenv("METRICS_SCRAPE_INTERVAL", "15s")
+    context["metrics_retention"] = os.getenv("METRICS_RETENTION", "15d")
+    # Load tests: virtual users, duration and the latency/error budgets enforced in CI
+    context["locust_image"] = os.getenv("LOCUST_IMAGE", "2.31.8")
+    context["load_test_users"] = int(os.getenv("LOAD_TEST_USERS", "20"))
+    context["load_test_duration"] = os.getenv("LOAD_TEST_DURATION", "1m")
+    context["latency_budget_p95_ms"] = int(os.getenv("LATENCY_BUDGET_P95_MS", "300"))
+    context["latency_budget_p99_ms"] = int(os.getenv("LATENCY_BUDGET_P99_MS", "1000"))
+    context["error_budget"] = float(os.getenv("ERROR_BUDGET", "0.01"))
+    # Parallel test shards in the generated CI pipeline
+    context["ci_test_shards"] = int(os.getenv("CI_TEST_SHARDS", "2"))
+    # Pre-provisioned workspaces kept ready per toolchain combination (0 disables the pool)
+    context["warm_pool_size"] = int(os.getenv("WARM_POOL_SIZE", "0"))
 
     logging.info("Defaults loaded from .env and set in context.")
 
 
-def main():
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
-
-    console = Console()
-    context = {}
-
-    # Load defaults into context
-    load_defaults_to_context(context)
-
-    # Initialize handlers
-    handlers = [
+def build_handlers(console):
+    """
+    Instantiate the handlers of the generation pipeline, in chain order.
+    """
+    return [
         EnvCheckHandler(console),
         PlanningHandler(console),
         FolderSetupHandler(console),
@@ -56,23 +98,294 @@ def main():
         DockerConfigurationHandler(console),
         CiCdSetupHandler(console),
         ObservabilitySetupHandler(console),
+        LoadTestingSetupHandler(console),
         DocumentationSetupHandler(console),
+    ]
 
+
+def build_warm_handlers(console):
+    """
+    Instantiate the project-independent handlers that provision a pooled workspace.
+    """
+    return [
+        BackendSetupHandler(console),
+        FrontendSetupHandler(console),
     ]
 
+
+def parse_args(argv=None):
+    """
+    Parse the command-line arguments.
+    """
+    parser = argparse.ArgumentParser(description="Generate a project boilerplate.")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["generate", "history", "pool"],
+        default="generate",
+        help="'generate' a project (default), show the run 'history' and flag regressions, "
+             "or manage the warm workspace 'pool'.",
+    )
+    parser.add_argument(
+        "pool_action",
+        nargs="?",
+        choices=["fill", "status", "clear"],
+        default="status",
+        help="pool: provision workspaces up to WARM_POOL_SIZE, show the pool, or remove unclaimed workspaces.",
+    )
+    parser.add_argument(
+        "--resume",
+        nargs="?",
+        const=str(JOURNAL_PATH),
+        default=None,
+        metavar="JOURNAL",
+        help=f"Resume a failed run from its checkpoint journal (default: {JOURNAL_PATH}).",
+    )
+    parser.add_argument(
+        "--trace",
+        nargs="?",
+        const=str(STATE_DIR / "traces"),
+        default=None,
+        metavar="DIR",
+        help="Export the run trace as Chrome trace-event and OTLP JSON into DIR.",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        metavar="PORT",
+        help="Expose generator metrics for Prometheus on http://0.0.0.0:PORT/metrics.",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        nargs="?",
+        const=str(STATE_DIR / "profiles"),
+        default=None,
+        metavar="DIR",
+        help="Record heap and RSS usage per handler and LLM call into DIR/memory-<timestamp>.json.",
+    )
+    parser.add_argument(
+        "--history-db",
+        default=str(HISTORY_PATH),
+        metavar="PATH",
+        help=f"Run-history database (default: {HISTORY_PATH}).",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=int,
+        default=10,
+        help="history: number of earlier successful runs forming the baseline.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.5,
+        help="history: flag stages slower than THRESHOLD times their baseline median.",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Log level (overridden by BOILERPLATE_LOG_LEVEL).",
+    )
+    parser.add_argument(
+        "--log-json",
+        nargs="?",
+        const=str(STATE_DIR / "logs" / "generator.jsonl"),
+        default=None,
+        metavar="PATH",
+        help="Also write structured JSON log lines to PATH.",
+    )
+    return parser.parse_args(argv)
+
+
+def print_trace_summary(console, tracer, limit=10):
+    """
+    Print the slowest spans of the run.
+    """
+    spans = tracer.slowest(limit)
+    if not spans:
+        return
+    table = Table(title=f"Slowest {len(spans)} spans")
+    table.add_column("Span")
+    table.add_column("Kind")
+    table.add_column("Duration (s)", justify="right")
+    table.add_column("Details")
+    for span in spans:
+        details = ", ".join(f"{k}={v}" for k, v in span.attributes.items() if k not in ("command", "cwd"))
+        table.add_row(span.name, span.category, f"{span.duration_ms / 1000:.2f}", details)
+    console.print(table)
+
+
+def show_history(console, args):
+    """
+    Print recent runs and the stages that regressed against the baseline.
+
+    :return: Exit status, 1 when regressions were found.
+    """
+    history = RunHistory(args.history_db)
+    try:
+        runs = history.recent_runs(limit=10)
+        regressions, toolchain_changes = history.detect_regressions(baseline=args.baseline, threshold=args.threshold)
+    finally:
+        history.close()
+
+    table = Table(title="Recent runs")
+    for column in ("Run", "Started", "Duration (s)", "Outcome", "Project", "Template cache hits"):
+        table.add_column(column)
+    for run in runs:
+        template_cache = run["cache_stats"].get("template", {})
+        table.add_row(
+            str(run["id"]),
+            time.strftime("%Y-%m-%d %H:%M", time.localtime(run["started"])),
+            f"{run['duration_s']:.1f}",
+            run["outcome"] + (" (resumed)" if run["resumed"] else ""),
+            run["project_name"] or "",
+            f"{template_cache['hit_ratio']:.0%}" if template_cache else "",
+        )
+    console.print(table)
+
+    if not regressions:
+        console.print(f"[bold green]No stage regressed beyond {args.threshold}x its baseline.[/bold green]")
+        return 0
+    table = Table(title=f"Stages slower than {args.threshold}x the baseline median")
+    for column in ("Kind", "Stage", "Baseline (s)", "Latest (s)", "Change"):
+        table.add_column(column)
+    for regression in regressions:
+        table.add_row(regression["category"], regression["name"], f"{regression['baseline_s']:.2f}",
+                      f"{regression['latest_s']:.2f}", f"{regression['ratio']:.1f}x")
+    console.print(table)
+    for tool, change in toolchain_changes.items():
+        console.print(f"[yellow]{tool} changed: {', '.join(change['before'])} -> {change['now']}[/yellow]")
+    return 1
+
+
+def manage_pool(console, args):
+    """
+    Fill, inspect or clear the warm workspace pool.
+
+    :return: Exit status.
+    """
+    context = {}
+    load_defaults_to_context(context)
+    pool = WorkspacePool(size=max(context["warm_pool_size"], 1))
+    if args.pool_action == "fill":
+        # Provisioning output goes to the log; the interactive console only reports the result
+        quiet_console = Console(quiet=True)
+        built = pool.fill(context, lambda: build_warm_handlers(quiet_console))
+        console.print(f"[bold green]Provisioned {built} workspace(s) in {POOL_DIR}.[/bold green]")
+    elif args.pool_action == "clear":
+        removed = pool.clear()
+        console.print(f"[bold green]Removed {removed} unclaimed workspace(s).[/bold green]")
+    else:
+        table = Table(title=f"Warm workspaces in {POOL_DIR}")
+        for column in ("Pool key", "Ready", "Building", "Claimed"):
+            table.add_column(column)
+        for key, counts in pool.status().items():
+            table.add_row(key, str(counts["ready"]), str(counts["building"]), str(counts["claimed"]))
+        console.print(table)
+    return 0
+
+
+def prepare_checkpoints(context, resume, console):
+    """
+    Start a fresh checkpoint journal, or restore the context of a failed run from one.
+    """
+    if resume:
+        journal = CheckpointJournal.load(resume)
+        context.update(journal.restore_context())
+        stager_state = (journal.last_entry or {}).get("stager")
+        if stager_state:
+            context["output_stager"] = OutputStager.restore(stager_state)
+        if journal.completed:
+            console.print(f"[bold cyan]Resuming after {journal.completed[-1]}...[/bold cyan]")
+        logging.info(f"Resuming from {resume}; completed handlers: {', '.join(journal.completed) or 'none'}.")
+    else:
+        journal = CheckpointJournal()
+        journal.start()
+    context["checkpoint_journal"] = journal
+    return journal
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_logging(level=args.log_level, json_path=args.log_json)
+
+    console = Console()
+    if args.command == "history":
+        sys.exit(show_history(console, args))
+    if args.command == "pool":
+        sys.exit(manage_pool(console, args))
+
+    started = time.time()
+    outcome, error = "aborted", None  # Stays "aborted" on sys.exit or Ctrl-C
+    context = {}
+
+    # Load defaults into context
+    load_defaults_to_context(context)
+    journal = prepare_checkpoints(context, args.resume, console)
+    if context["warm_pool_size"] > 0:
+        # Claimed workspaces are replaced in the background by `main.py pool fill`
+        context["workspace_pool"] = WorkspacePool(
+            size=context["warm_pool_size"],
+            fill_command=[sys.executable, str(Path(__file__).resolve()), "pool", "fill"],
+        )
+
+    profiler = None
+    if args.profile_memory:
+        profiler = MemoryProfiler()
+        profiler.start()
+        get_tracer().add_listener(profiler)
+
+    metrics = None
+    if args.metrics_port is not None:
+        metrics = enable_metrics(get_tracer())
+        metrics.serve(args.metrics_port)
+
     # Set up the chain
-    head_handler = chain_handlers(handlers)
+    head_handler = chain_handlers(build_handlers(console))
 
     # Start processing
     console.print("[bold cyan]Starting project setup...[/bold cyan]")
     logging.info("Starting project setup.")
     try:
-        head_handler.handle(context)  # Start the chain
+        with metrics.job() if metrics is not None else nullcontext():
+            result = head_handler.handle(context)  # Start the chain
+            if result is not None:
+                raise RuntimeError(result)
+
+        # Move the staged project tree into place in one step
+        if context.get("output_stager") is not None:
+            context["project_dir"] = context["output_stager"].commit()
+        journal.finish()
+        outcome = "success"
         console.print("[bold green]Project setup completed successfully![/bold green]")
         logging.info("Project setup completed successfully.")
     except Exception as e:
         console.print(f"[bold red]An error occurred during setup:[/bold red] {e}")
         logging.error(f"An error occurred during setup: {e}", exc_info=True)
+        outcome, error = "failure", str(e)
+        if journal.completed:
+            # Keep the staged tree so the completed handlers do not have to run again
+            console.print("[bold yellow]Progress was checkpointed. Run 'python main.py --resume' to continue.[/bold yellow]")
+        elif context.get("output_stager") is not None:
+            context["output_stager"].abort()
+    finally:
+        try:
+            record_current_run(started, outcome, context, error=error, resumed=bool(args.resume), path=args.history_db)
+        except Exception as e:
+            logging.warning(f"Could not record the run history: {e}")
+        tracer = get_tracer()
+        print_trace_summary(console, tracer)
+        if args.trace:
+            paths = tracer.export(args.trace)
+            console.print(f"Trace written to {', '.join(str(p) for p in paths)}")
+        if profiler is not None:
+            path = profiler.export(Path(args.profile_memory) / f"memory-{time.strftime('%Y%m%d-%H%M%S')}.json")
+            summary = profiler.report()["summary"]
+            profiler.stop()
+            console.print(f"Memory profile written to {path} (peak heap {summary['traced_peak_kb'] / 1024:.1f} MiB, "
+                          f"peak RSS {summary['max_rss_kb'] / 1024:.1f} MiB)")
 
 
 if __name__ == "__main__":
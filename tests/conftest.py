@@ -0,0 +1,19 @@
+import pytest
+import tiktoken
+
+
+class WhitespaceEncoding:
+    """
+    Offline stand-in for a tiktoken encoding: one token per whitespace-separated word.
+    """
+
+    def encode(self, text):
+        return text.split()
+
+
+@pytest.fixture
+def offline_tokenizer(monkeypatch):
+    """
+    Let PromptBuilder count tokens without downloading the tiktoken vocabulary.
+    """
+    monkeypatch.setattr(tiktoken, "encoding_for_model", lambda model: WhitespaceEncoding())
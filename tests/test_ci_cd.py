@@ -0,0 +1,36 @@
+import pytest
+import yaml
+from rich.console import Console
+
+from handlers.ci_cd import CiCdSetupHandler
+from utils.helpers import to_image_slug
+from utils.staging import OutputStager
+
+
+@pytest.mark.parametrize("name, slug", [
+    ("My Project", "my-project"),
+    ("MyProject", "my-project"),
+    ("api.v2", "api-v2"),
+    ("  weird!!name ", "weird-name"),
+    ("***", "app"),
+])
+def test_image_slug_is_a_valid_docker_name(name, slug):
+    assert to_image_slug(name) == slug
+
+
+def test_workflow_tags_images_with_the_slug(tmp_path):
+    stager = OutputStager(tmp_path / "project")
+    context = {
+        "project_name": "My Project",
+        "project_dir": str(stager.root),
+        "python_version": "3.12",
+        "node_version": "20",
+        "output_stager": stager,
+    }
+    CiCdSetupHandler(Console(quiet=True)).process(context)
+    stager.flush()
+
+    workflow = yaml.safe_load((stager.root / ".github" / "workflows" / "ci_cd_pipeline.yml").read_text())
+    build = next(step for step in workflow["jobs"]["images"]["steps"] if step.get("uses", "").startswith("docker/build-push-action"))
+    assert build["with"]["tags"] == "my-project-${{ matrix.service }}:${{ github.sha }}"
+    stager.abort()
@@ -0,0 +1,23 @@
+import pytest
+
+from utils.frontend_toolchain import (
+    FRONTEND_TEMPLATES, NODE_PACKAGE_MANAGERS, FrontendTemplate, get_frontend_toolchain,
+)
+
+
+@pytest.mark.parametrize("manager_name", NODE_PACKAGE_MANAGERS)
+@pytest.mark.parametrize("template_name", FRONTEND_TEMPLATES)
+def test_registered_toolchains_implement_the_interface(manager_name, template_name):
+    manager, template = get_frontend_toolchain(manager_name, template_name)
+    assert manager.install_frozen_in_docker()
+    assert template.scaffold_commands(manager, "frontend")
+    assert template.lint(manager) and template.test(manager)
+
+
+def test_incomplete_toolchain_fails_on_instantiation():
+    class NoLintTemplate(FrontendTemplate):
+        def scaffold_commands(self, manager, target):
+            return []
+
+    with pytest.raises(TypeError, match="lint"):
+        NoLintTemplate()
@@ -0,0 +1,59 @@
+import openai
+import pytest
+
+from benchmarks.openai_stub_server import LatencyDistribution, StubState, start_server
+from llm.provider.llm_provider import LLMProvider
+from utils.tracing import get_tracer
+
+
+class FlakyState(StubState):
+    """
+    Stub answering the first `failures` requests with HTTP 429.
+    """
+
+    def __init__(self, failures, **kwargs):
+        super().__init__(LatencyDistribution("fixed:0"), rate_limit_rate=1.0, retry_after=0, **kwargs)
+        self.failures = failures
+
+    def roll(self, rate):
+        if rate == self.rate_limit_rate and self.failures > 0:
+            self.failures -= 1
+            return True
+        return False
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(failures):
+        server, base_url = start_server(FlakyState(failures))
+        servers.append(server)
+        return base_url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def last_llm_span():
+    return [span for span in get_tracer().spans if span.category == "llm"][-1]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_retries_of_the_client_are_recorded_on_the_span(stub, stream):
+    client = openai.OpenAI(api_key="test", base_url=stub(failures=2), max_retries=3)
+    provider = LLMProvider(model="gpt-4", client=client, stream=stream)
+
+    assert provider.generate([{"role": "user", "content": "Project name: Demo"}]) == "Demo"
+    assert last_llm_span().attributes["retries"] == 2
+
+
+def test_exhausted_retries_are_recorded_on_failure(stub):
+    client = openai.OpenAI(api_key="test", base_url=stub(failures=10), max_retries=1)
+    provider = LLMProvider(model="gpt-4", client=client)
+
+    with pytest.raises(openai.RateLimitError):
+        provider.generate([{"role": "user", "content": "Project name: Demo"}])
+    span = last_llm_span()
+    assert span.error and span.attributes["retries"] == 1
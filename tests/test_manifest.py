@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+from utils.git_bootstrap import GitIgnore
+from utils.manifest import MANIFEST_NAME, GenerationManifest
+from utils.staging import OutputStager
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    directory = tmp_path / "templates"
+    directory.mkdir()
+    (directory / "settings.j2").write_text("DEBUG = {{ debug }}")
+    (directory / "urls.j2").write_text("urlpatterns += [{{ route }}]")
+    return directory
+
+
+def generate(project_dir, template_dir, debug=True, route="'metrics'"):
+    stager = OutputStager(project_dir)
+    urls = stager.path("app/urls.py")
+    if not urls.exists():
+        # Created by a scaffolding tool, then extended by the generator
+        urls.parent.mkdir(parents=True)
+        urls.write_text("urlpatterns = []\n")
+    stager.submit("settings.j2", {"debug": debug, "unused": object()}, "settings.py", template_dir=template_dir)
+    stager.submit("urls.j2", {"route": route}, "app/urls.py", template_dir=template_dir, append=True)
+    stager.commit()
+    return stager
+
+
+def test_unchanged_outputs_are_skipped_and_keep_their_mtime(tmp_path, template_dir):
+    project_dir = tmp_path / "project"
+    generate(project_dir, template_dir)
+    settings = project_dir / "settings.py"
+    os.utime(settings, (1, 1))
+
+    stager = generate(project_dir, template_dir)
+
+    # Appended fragments are always rendered, but the file is only rewritten if it changed
+    assert stager.stats["rendered"] == 1
+    assert stager.stats["written"] == 0
+    assert settings.stat().st_mtime == 1
+
+
+def test_changed_inputs_and_edited_files_are_regenerated(tmp_path, template_dir):
+    project_dir = tmp_path / "project"
+    generate(project_dir, template_dir)
+    (project_dir / "app" / "urls.py").write_text("edited\n")
+
+    stager = generate(project_dir, template_dir, debug=False)
+
+    assert (project_dir / "settings.py").read_text() == "DEBUG = False"
+    assert (project_dir / "app" / "urls.py").read_text() == "edited\n\nurlpatterns += ['metrics']\n"
+    assert stager.stats["written"] == 2
+
+
+def test_appended_fragment_is_replaced_instead_of_duplicated(tmp_path, template_dir):
+    project_dir = tmp_path / "project"
+    generate(project_dir, template_dir)
+    generate(project_dir, template_dir, route="'health'")
+
+    content = (project_dir / "app" / "urls.py").read_text()
+    assert content == "urlpatterns = []\n\nurlpatterns += ['health']\n"
+
+
+def test_install_steps_are_fingerprinted_and_persisted(tmp_path):
+    manifest = GenerationManifest(tmp_path)
+    commands = [("pipenv install django", "Install backend dependencies")]
+    assert not manifest.step_is_current("backend.install", commands)
+
+    manifest.record_step("backend.install", commands)
+    manifest.save()
+    reloaded = GenerationManifest.load(tmp_path)
+
+    assert reloaded.step_is_current("backend.install", commands)
+    assert not reloaded.step_is_current("backend.install", commands + [("pipenv install redis", "Install Redis")])
+
+
+def test_unreadable_manifest_is_ignored(tmp_path):
+    (tmp_path / ".boilerplate-manifest.json").write_text("{not json")
+    manifest = GenerationManifest.load(tmp_path)
+    assert manifest.outputs == {} and manifest.steps == {}
+
+
+def test_manifest_is_ignored_by_the_generated_repository(tmp_path):
+    stager = OutputStager(tmp_path / "project")
+    stager.submit("gitignore.j2", {"project_name": "project"}, ".gitignore", template_dir="handlers/templates")
+    stager.flush()
+
+    assert GitIgnore.from_file(stager.root / ".gitignore").ignored(MANIFEST_NAME, is_dir=False)
+    stager.abort()
@@ -0,0 +1,75 @@
+import threading
+
+from llm.memory.cold_storage import ColdStorage
+from llm.memory.compaction import MemoryCompactor, TruncatingSummarizer
+from llm.memory.long_term_memory import LongTermMemory
+
+
+def add_turns(memory, count, start=0, words=100):
+    for index in range(start, start + count):
+        memory.add_interaction(f"question {index} " + "word " * words, f"answer {index} " + "word " * words)
+
+
+class BlockingSummarizer:
+    """
+    Summarizer that holds the compaction until the test releases it.
+    """
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def summarize(self, entries, level):
+        self.started.set()
+        self.release.wait(5)
+        return f"{len(entries)} entries"
+
+
+def test_compaction_archives_old_entries_and_keeps_recent_ones(tmp_path):
+    archive = ColdStorage(str(tmp_path / "archive.jsonl.gz"))
+    memory = LongTermMemory(MemoryCompactor(TruncatingSummarizer(), archive, max_raw_entries=8, keep_raw_entries=4))
+    add_turns(memory, 5)
+
+    assert [entry["content"].split()[1] for entry in memory.storage] == ["3", "3", "4", "4"]
+    assert len(memory.session_summaries) == 1
+    assert memory.session_summaries[0]["metadata"] == {"summary_level": "session", "entries": 6}
+    assert len(list(archive.iter_entries())) == 6
+
+
+def test_summaries_stay_within_the_token_budget():
+    compactor = MemoryCompactor(
+        TruncatingSummarizer(), max_raw_entries=8, keep_raw_entries=2, max_session_summaries=5, max_summary_tokens=300
+    )
+    memory = LongTermMemory(compactor)
+    add_turns(memory, 60)
+
+    assert memory.project_summary is not None
+    assert compactor.summary_tokens(memory) <= 300
+    assert sum(entry["metadata"]["entries"] for entry in memory.retrieve()[:-len(memory.storage)]) == 120 - len(memory.storage)
+
+
+def test_retrieve_limit_applies_to_raw_entries_only():
+    memory = LongTermMemory(MemoryCompactor(TruncatingSummarizer(), max_raw_entries=8, keep_raw_entries=4))
+    add_turns(memory, 5)
+
+    entries = memory.retrieve(limit=2)
+    assert entries[0]["metadata"]["summary_level"] == "session"
+    assert entries[1:] == memory.storage[-2:]
+
+
+def test_background_compaction_does_not_block_the_turn():
+    summarizer = BlockingSummarizer()
+    compactor = MemoryCompactor(summarizer, max_raw_entries=8, keep_raw_entries=4, background=True)
+    memory = LongTermMemory(compactor)
+    try:
+        add_turns(memory, 5)
+        assert summarizer.started.wait(5)
+        # Turns added while the summarizer runs are kept as raw entries
+        add_turns(memory, 1, start=5)
+        summarizer.release.set()
+        compactor.wait(5)
+    finally:
+        compactor.close()
+
+    assert memory.session_summaries[0]["content"].endswith("6 entries")
+    assert [entry["content"].split()[1] for entry in memory.storage] == ["3", "3", "4", "4", "5", "5"]
@@ -0,0 +1,19 @@
+import pytest
+
+from utils.package_managers import PACKAGE_MANAGERS, RequirementsManager, get_package_manager
+
+
+@pytest.mark.parametrize("name", PACKAGE_MANAGERS)
+def test_registered_managers_implement_the_interface(name):
+    manager = get_package_manager(name)
+    assert manager.install_commands(["django"])
+    assert manager.ci_install()
+
+
+def test_incomplete_manager_fails_on_instantiation():
+    class HalfManager(RequirementsManager):
+        def ci_install(self):
+            return []
+
+    with pytest.raises(TypeError, match="compile_command"):
+        HalfManager()
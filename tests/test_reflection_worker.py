@@ -0,0 +1,125 @@
+import json
+import threading
+
+import pytest
+
+from llm.prompt.builder import PromptBuilder
+from llm.reflection.worker import ReflectionWorker
+
+
+class FakeProvider:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.batches = []
+
+    def generate(self, messages, purpose=None):
+        if self.fail:
+            raise RuntimeError("LLM unavailable")
+        interactions = [m for m in messages if m["role"] == "user"]
+        self.batches.append(len(interactions))
+        return json.dumps({"summary": f"{len(interactions)} interaction(s)", "rules": []})
+
+
+def submit_interactions(worker, count, words=20):
+    for index in range(count):
+        worker.submit(f"question {index} " + "word " * words, f"answer {index} " + "word " * words)
+
+
+@pytest.fixture
+def prompt_builder(offline_tokenizer):
+    # Roughly five interactions of 2 x 22 words fit in 300 tokens with the instructions
+    return PromptBuilder(model="gpt-4", max_tokens=300)
+
+
+def test_oversized_batch_is_split_to_fit_the_token_budget(prompt_builder):
+    provider = FakeProvider()
+    worker = ReflectionWorker(provider, prompt_builder, max_batch=20)
+    submit_interactions(worker, 20)
+
+    assert worker.flush() is True
+    assert worker.checkpoint == 20
+    assert worker.pending_count() == 0
+    assert not worker.dead_letters
+    assert len(provider.batches) > 1
+    assert max(provider.batches) < 20
+
+
+def test_interaction_over_the_budget_is_given_up_on(prompt_builder):
+    provider = FakeProvider()
+    worker = ReflectionWorker(provider, prompt_builder)
+    submit_interactions(worker, 2)
+    worker.submit("huge " * 400, "answer")
+    submit_interactions(worker, 2)
+
+    assert worker.flush() is False
+    assert worker.checkpoint == 4
+    assert worker.pending_count() == 0
+    assert [entry["user"] for entry in worker.dead_letters] == ["huge " * 400]
+
+
+def test_failing_batch_is_dead_lettered_after_max_attempts(prompt_builder):
+    worker = ReflectionWorker(FakeProvider(fail=True), prompt_builder, max_attempts=3)
+    submit_interactions(worker, 3)
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            worker.run_once()
+        assert worker.pending_count() == 3
+    with pytest.raises(RuntimeError):
+        worker.run_once()
+    assert worker.pending_count() == 0
+    assert len(worker.dead_letters) == 3
+
+
+def test_flush_returns_once_the_background_worker_gives_up(prompt_builder):
+    worker = ReflectionWorker(FakeProvider(fail=True), prompt_builder, interval_seconds=0.01, max_attempts=2)
+    submit_interactions(worker, 4)
+    worker.start()
+    try:
+        assert worker.flush(timeout=10) is False
+    finally:
+        worker.stop(timeout=5)
+    assert worker.pending_count() == 0
+    assert len(worker.dead_letters) == 4
+
+
+class GatedProvider(FakeProvider):
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def generate(self, messages, purpose=None):
+        self.started.set()
+        assert self.release.wait(10)
+        return super().generate(messages, purpose)
+
+
+def test_trigger_without_background_thread_reflects_on_a_one_shot_thread(prompt_builder):
+    provider = GatedProvider()
+    updated = threading.Event()
+    worker = ReflectionWorker(provider, prompt_builder, on_update=lambda summary, rules: updated.set())
+    submit_interactions(worker, 3)
+
+    worker.trigger()
+    assert provider.started.wait(10)
+    assert not worker.running
+    provider.release.set()
+
+    assert updated.wait(10)
+    assert worker.checkpoint == 3
+    assert worker.pending_count() == 0
+
+
+def test_flush_times_out_while_a_one_shot_pass_is_in_flight(prompt_builder):
+    provider = GatedProvider()
+    worker = ReflectionWorker(provider, prompt_builder)
+    submit_interactions(worker, 3)
+
+    worker.trigger()
+    assert provider.started.wait(10)
+    try:
+        assert worker.flush(timeout=0.05) is False
+    finally:
+        provider.release.set()
+    assert worker.flush(timeout=10) is True
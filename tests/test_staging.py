@@ -0,0 +1,89 @@
+import os
+import stat
+
+import pytest
+
+from utils.staging import OutputStager
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    directory = tmp_path / "templates"
+    directory.mkdir()
+    (directory / "greeting.txt.j2").write_text("Hello {{ name }}!\n")
+    return directory
+
+
+def test_new_project_is_invisible_until_commit(tmp_path, template_dir):
+    final_dir = tmp_path / "out" / "project"
+    stager = OutputStager(final_dir, max_workers=2)
+    stager.submit("greeting.txt.j2", {"name": "world"}, "docs/greeting.txt", template_dir=template_dir)
+    stager.submit_content("README.md", "# Project\n")
+    stager.flush()
+
+    assert not final_dir.exists()
+    assert (stager.root / "docs" / "greeting.txt").read_text() == "Hello world!"
+
+    assert stager.commit() == final_dir
+    assert (final_dir / "docs" / "greeting.txt").read_text() == "Hello world!"
+    assert (final_dir / "README.md").read_text() == "# Project\n"
+    assert [path.name for path in final_dir.parent.iterdir()] == ["project"]
+
+
+def test_committed_project_gets_the_umask_default_mode(tmp_path):
+    previous = os.umask(0o022)
+    try:
+        final_dir = tmp_path / "project"
+        stager = OutputStager(final_dir)
+        stager.submit_content("README.md", "# Project\n")
+        stager.commit()
+    finally:
+        os.umask(previous)
+
+    assert stat.S_IMODE(final_dir.stat().st_mode) == 0o755
+
+
+def test_abort_discards_the_staging_directory(tmp_path):
+    final_dir = tmp_path / "project"
+    stager = OutputStager(final_dir)
+    stager.submit_content("README.md", "# Project\n")
+    stager.flush()
+    stager.abort()
+
+    assert not final_dir.exists()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_commit_refuses_to_replace_an_existing_directory(tmp_path):
+    final_dir = tmp_path / "project"
+    stager = OutputStager(final_dir)
+    final_dir.mkdir()
+    with pytest.raises(FileExistsError):
+        stager.commit()
+
+
+def test_existing_project_is_updated_in_place(tmp_path, template_dir):
+    final_dir = tmp_path / "project"
+    final_dir.mkdir()
+    (final_dir / "keep.txt").write_text("untouched\n")
+    stager = OutputStager(final_dir)
+    assert stager.root == final_dir
+
+    stager.submit("greeting.txt.j2", {"name": "again"}, final_dir / "greeting.txt", template_dir=template_dir)
+    stager.commit()
+
+    assert (final_dir / "greeting.txt").read_text() == "Hello again!"
+    assert (final_dir / "keep.txt").read_text() == "untouched\n"
+    assert not [path for path in final_dir.iterdir() if ".tmp-" in path.name]
+
+
+def test_restore_continues_in_the_same_staging_directory(tmp_path):
+    stager = OutputStager(tmp_path / "project")
+    stager.submit_content("a.txt", "a\n")
+    stager.flush()
+
+    restored = OutputStager.restore(stager.snapshot())
+    restored.submit_content("b.txt", "b\n")
+    final_dir = restored.commit()
+
+    assert sorted(path.name for path in final_dir.iterdir() if not path.name.startswith(".")) == ["a.txt", "b.txt"]
@@ -0,0 +1,22 @@
+import pytest
+
+from utils.structured_logging import REDACTED, redact
+
+
+@pytest.mark.parametrize("key", [
+    "password", "db_password", "secret_key", "api_key", "apikey", "token", "access_token", "refresh-token",
+    "authToken", "github_token", "private_key",
+])
+def test_secret_keys_are_redacted(key):
+    assert redact({key: "value"}) == {key: REDACTED}
+
+
+@pytest.mark.parametrize("key", [
+    "prompt_tokens", "completion_tokens", "cached_tokens", "max_tokens", "total_tokens", "tokenizer", "db_name",
+])
+def test_token_counts_are_kept(key):
+    assert redact({key: 42}) == {key: 42}
+
+
+def test_nested_values_are_redacted():
+    assert redact({"usage": [{"prompt_tokens": 3, "api_key": "sk"}]}) == {"usage": [{"prompt_tokens": 3, "api_key": REDACTED}]}
@@ -0,0 +1,164 @@
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from utils.helpers import STATE_DIR
+
+JOURNAL_PATH = STATE_DIR / "journal.jsonl"
+
+# Context entries that are live objects rather than data; they are rebuilt on resume
+TRANSIENT_KEYS = {"output_stager", "checkpoint_journal", "workspace_pool"}
+
+
+def serialize_context(context):
+    """
+    Convert the handler context into JSON-compatible data.
+
+    Paths are tagged so they can be restored as Path objects; values that cannot be
+    serialised (live objects such as the stager) are dropped.
+    """
+    def encode(value):
+        if isinstance(value, Path):
+            return {"__path__": str(value)}
+        if isinstance(value, dict):
+            return {str(k): encode(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [encode(v) for v in value]
+        if value is None or isinstance(value, (str, int, float, bool)):
+            return value
+        raise TypeError(type(value).__name__)
+
+    snapshot = {}
+    for key, value in context.items():
+        if key in TRANSIENT_KEYS:
+            continue
+        try:
+            snapshot[key] = encode(value)
+        except TypeError as e:
+            logging.debug(f"Not checkpointing context key '{key}' of type {e}")
+    return snapshot
+
+
+def deserialize_context(snapshot):
+    def decode(value):
+        if isinstance(value, dict):
+            if set(value) == {"__path__"}:
+                return Path(value["__path__"])
+            return {k: decode(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [decode(v) for v in value]
+        return value
+
+    return {key: decode(value) for key, value in snapshot.items()}
+
+
+class CheckpointJournal:
+    """
+    Append-only journal of completed handlers.
+
+    Each line holds a completion marker for one handler together with a snapshot of
+    the context and of the output stager at that point. Resuming replays the last
+    snapshot and lets the leading handlers whose on-disk state is still valid be skipped.
+    """
+
+    def __init__(self, path=JOURNAL_PATH):
+        self.path = Path(path)
+        self.completed = []
+        self.last_entry = None
+        self.resuming = False
+
+    @classmethod
+    def load(cls, path=JOURNAL_PATH):
+        """
+        Load an existing journal for resuming.
+        """
+        journal = cls(path)
+        if not journal.path.exists():
+            raise FileNotFoundError(f"No checkpoint journal found at '{journal.path}'.")
+        with open(journal.path, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line means the handler did not complete
+                    logging.warning(f"Ignoring truncated checkpoint entry in {journal.path}")
+                    break
+                journal.completed.append(entry["handler"])
+                journal.last_entry = entry
+        journal.resuming = bool(journal.completed)
+        return journal
+
+    def start(self):
+        """
+        Begin a fresh journal, discarding the staging directory of an abandoned run.
+        """
+        if self.path.exists():
+            try:
+                previous = CheckpointJournal.load(self.path)
+                stager_state = (previous.last_entry or {}).get("stager") or {}
+                staging_root = stager_state.get("root")
+                if staging_root and not stager_state.get("in_place"):
+                    shutil.rmtree(staging_root, ignore_errors=True)
+                    logging.info(f"Removed staging directory of an abandoned run: {staging_root}")
+            except (OSError, KeyError, json.JSONDecodeError) as e:
+                logging.warning(f"Could not inspect previous checkpoint journal: {e}")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w"):
+            pass
+        os.chmod(self.path, 0o600)  # Snapshots contain generated credentials
+        self.completed = []
+        self.last_entry = None
+        self.resuming = False
+
+    def should_skip(self, handler_name):
+        """
+        True while resuming and the handler is part of the completed prefix.
+        """
+        return self.resuming and handler_name in self.completed
+
+    def stop_resuming(self):
+        """
+        Called when a handler has to run again; every later handler runs as well.
+        """
+        if self.resuming:
+            logging.info("Resume point reached; running the remaining handlers.")
+        self.resuming = False
+
+    def record(self, handler_name, context):
+        """
+        Durably append the completion marker and context snapshot of a handler.
+        """
+        stager = context.get("output_stager")
+        entry = {
+            "handler": handler_name,
+            "status": "completed",
+            "time": time.time(),
+            "context": serialize_context(context),
+            "stager": stager.snapshot() if stager is not None else None,
+        }
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        if handler_name not in self.completed:
+            self.completed.append(handler_name)
+        self.last_entry = entry
+
+    def restore_context(self):
+        """
+        Context snapshot of the last completed handler.
+        """
+        if self.last_entry is None:
+            return {}
+        return deserialize_context(self.last_entry["context"])
+
+    def finish(self):
+        """
+        Remove the journal after a successful run.
+        """
+        if self.path.exists():
+            self.path.unlink()
@@ -0,0 +1,242 @@
+import shlex
+from abc import ABC, abstractmethod
+
+
+class NodePackageManager(ABC):
+    """
+    The one Node package manager a generated frontend is scaffolded, installed,
+    built, containerised and tested with, so its lock file is reused everywhere.
+    """
+
+    name = None
+    lock_file = None
+    # `cache` input of actions/setup-node in the CI pipeline
+    ci_cache = None
+    # Download cache or package store, mounted as a BuildKit cache in the Docker builds
+    cache_dir = None
+
+    @abstractmethod
+    def add_dev(self, packages):
+        pass
+
+    @abstractmethod
+    def install(self):
+        pass
+
+    @abstractmethod
+    def install_frozen(self):
+        """
+        Install exactly what the lock file pins; fails when it is out of date.
+        """
+        pass
+
+    def install_frozen_in_docker(self):
+        return self.install_frozen()
+
+    @abstractmethod
+    def run(self, script, args=""):
+        pass
+
+    @abstractmethod
+    def exec(self, command):
+        pass
+
+    @abstractmethod
+    def create(self, initializer, target, args):
+        """
+        `npm create`-style scaffold of `target` with the `create-<initializer>` package.
+        """
+        pass
+
+
+class NpmManager(NodePackageManager):
+    name = "npm"
+    lock_file = "package-lock.json"
+    ci_cache = "npm"
+    cache_dir = "/root/.npm"
+
+    def add_dev(self, packages):
+        return f"npm install --save-dev {shlex.join(packages)}"
+
+    def install(self):
+        return "npm install"
+
+    def install_frozen(self):
+        return "npm ci"
+
+    def run(self, script, args=""):
+        return f"npm run {script}" + (f" -- {args}" if args else "")
+
+    def exec(self, command):
+        return f"npx {command}"
+
+    def create(self, initializer, target, args):
+        return f"npm create {initializer} {target} -- {args}"
+
+
+class YarnManager(NodePackageManager):
+    name = "yarn"
+    lock_file = "yarn.lock"
+    ci_cache = "yarn"
+    cache_dir = "/usr/local/share/.cache/yarn"
+
+    def add_dev(self, packages):
+        return f"yarn add --dev {shlex.join(packages)}"
+
+    def install(self):
+        return "yarn install"
+
+    def install_frozen(self):
+        return "yarn install --frozen-lockfile"
+
+    def run(self, script, args=""):
+        return f"yarn {script}" + (f" {args}" if args else "")
+
+    def exec(self, command):
+        return f"yarn {command}"
+
+    def create(self, initializer, target, args):
+        return f"yarn create {initializer} {target} {args}"
+
+
+class PnpmManager(NodePackageManager):
+    """
+    Packages are stored once in pnpm's global content-addressable store and
+    hard-linked into each project's node_modules.
+    """
+
+    name = "pnpm"
+    lock_file = "pnpm-lock.yaml"
+    ci_cache = "pnpm"
+    cache_dir = "/pnpm/store"
+
+    def add_dev(self, packages):
+        return f"pnpm add --save-dev {shlex.join(packages)}"
+
+    def install(self):
+        return "pnpm install"
+
+    def install_frozen(self):
+        return "pnpm install --frozen-lockfile"
+
+    def install_frozen_in_docker(self):
+        # node_modules is copied from the store in the cache mount, since hard links cannot cross it
+        return f"pnpm install --frozen-lockfile --store-dir {self.cache_dir}"
+
+    def run(self, script, args=""):
+        return f"pnpm run {script}" + (f" {args}" if args else "")
+
+    def exec(self, command):
+        return f"pnpm exec {command}"
+
+    def create(self, initializer, target, args):
+        return f"pnpm create {initializer} {target} {args}"
+
+
+class FrontendTemplate(ABC):
+    """
+    How a React/TypeScript frontend is scaffolded, linted, tested, served and built.
+    """
+
+    name = None
+    build_dir = None
+    # Directory of the content-hashed build assets, cached as immutable
+    assets_path = None
+
+    @abstractmethod
+    def scaffold_commands(self, manager, target):
+        pass
+
+    @abstractmethod
+    def dev_packages(self):
+        pass
+
+    @abstractmethod
+    def dev_server(self, manager, port):
+        pass
+
+    @abstractmethod
+    def lint(self, manager):
+        pass
+
+    @abstractmethod
+    def test(self, manager):
+        pass
+
+
+class CreateReactAppTemplate(FrontendTemplate):
+    name = "cra"
+    build_dir = "build"
+    assets_path = "/static/*"
+
+    def scaffold_commands(self, manager, target):
+        # create-react-app only knows npm and yarn; a pnpm project is converted from the npm lock file
+        use = "--use-npm" if manager.name != "yarn" else ""
+        commands = [(f"npx create-react-app {target} --template typescript {use}".rstrip(),
+                     "Initialize React app with TypeScript")]
+        if manager.name == "npm":
+            # CRA's pinned testing libraries declare peer ranges that exclude current React;
+            # .npmrc applies the override to every later npm install, in Docker and CI too
+            commands.append((f"printf 'legacy-peer-deps=true\\n' > {target}/.npmrc", "Relax peer dependency checks"))
+        if manager.name == "pnpm":
+            commands.append((f"cd {target} && pnpm import && rm -rf node_modules package-lock.json && pnpm install",
+                             "Convert the React app to pnpm"))
+        return commands
+
+    def dev_packages(self):
+        return ["eslint@^8", "prettier", "eslint-config-prettier", "eslint-plugin-react",
+                "eslint-plugin-react-hooks", "eslint-plugin-jsx-a11y"]
+
+    def dev_server(self, manager, port):
+        return manager.run("start")
+
+    def lint(self, manager):
+        return manager.exec("eslint src --ext .ts,.tsx")
+
+    def test(self, manager):
+        return manager.run("test", "--watchAll=false --passWithNoTests")
+
+
+class ViteTemplate(FrontendTemplate):
+    name = "vite"
+    build_dir = "dist"
+    assets_path = "/assets/*"
+
+    def scaffold_commands(self, manager, target):
+        return [
+            (manager.create("vite@6", target, "--template react-ts"), "Initialize Vite React app with TypeScript"),
+            (f"cd {target} && npm pkg set scripts.test='vitest run --passWithNoTests' && {manager.install()}",
+             "Install Vite app dependencies"),
+        ]
+
+    def dev_packages(self):
+        # The template ships its own ESLint flat config and plugins
+        return ["prettier", "eslint-config-prettier", "vitest", "jsdom"]
+
+    def dev_server(self, manager, port):
+        return manager.run("dev", f"--host 0.0.0.0 --port {port}")
+
+    def lint(self, manager):
+        return manager.run("lint")
+
+    def test(self, manager):
+        return manager.run("test")
+
+
+NODE_PACKAGE_MANAGERS = {manager.name: manager for manager in (NpmManager, YarnManager, PnpmManager)}
+FRONTEND_TEMPLATES = {template.name: template for template in (CreateReactAppTemplate, ViteTemplate)}
+
+
+def get_frontend_toolchain(package_manager, template):
+    """
+    Instantiate the Node package manager and scaffold registered under the given names.
+
+    :return: (NodePackageManager, FrontendTemplate)
+    :raises ValueError: If either name is unknown.
+    """
+    if package_manager not in NODE_PACKAGE_MANAGERS:
+        raise ValueError(f"Unsupported frontend package manager '{package_manager}' "
+                         f"(expected {', '.join(NODE_PACKAGE_MANAGERS)}).")
+    if template not in FRONTEND_TEMPLATES:
+        raise ValueError(f"Unsupported frontend template '{template}' (expected {', '.join(FRONTEND_TEMPLATES)}).")
+    return NODE_PACKAGE_MANAGERS[package_manager](), FRONTEND_TEMPLATES[template]()
@@ -0,0 +1,65 @@
+DATASOURCE = {"type": "prometheus", "uid": "prometheus"}
+
+
+def _panel(title, targets, x, y, unit, width=12, height=8):
+    return {
+        "type": "timeseries",
+        "title": title,
+        "datasource": DATASOURCE,
+        "gridPos": {"x": x, "y": y, "w": width, "h": height},
+        "fieldConfig": {"defaults": {"unit": unit}, "overrides": []},
+        "targets": [
+            {"refId": chr(ord("A") + i), "datasource": DATASOURCE, "expr": expr, "legendFormat": legend}
+            for i, (expr, legend) in enumerate(targets)
+        ],
+    }
+
+
+def latency_dashboard(service, job):
+    """
+    Grafana dashboard of a Django service's latency, throughput, errors, database and cache.
+
+    Panels read the recording rules of `recording_rules.yml` where one exists, so
+    the dashboard stays cheap to refresh.
+
+    :param service: Compose service name, used for the title and uid.
+    :param job: Prometheus job scraping the service.
+    :return: Dashboard model, ready to be serialised as JSON for file provisioning.
+    """
+    selector = f'job="{job}"'
+    panels = [
+        _panel("Request latency", [
+            (f"job:django_http_request_latency_seconds:p50_5m{{{selector}}}", "p50"),
+            (f"job:django_http_request_latency_seconds:p95_5m{{{selector}}}", "p95"),
+            (f"job:django_http_request_latency_seconds:p99_5m{{{selector}}}", "p99"),
+        ], 0, 0, "s"),
+        _panel("Throughput", [
+            (f"job:django_http_requests:rate1m{{{selector}}}", "requests/s"),
+        ], 12, 0, "reqps"),
+        _panel("p95 latency by view (top 10)", [
+            (f"topk(10, job_view:django_http_request_latency_seconds:p95_5m{{{selector}}})", "{{view}}"),
+        ], 0, 8, "s"),
+        _panel("Server error ratio", [
+            (f"job:django_http_responses_5xx:ratio_rate5m{{{selector}}}", "5xx"),
+        ], 12, 8, "percentunit"),
+        _panel("Database queries", [
+            (f"job:django_db_queries:rate1m{{{selector}}}", "queries/s"),
+            (f"job:django_db_queries_per_request:ratio_rate5m{{{selector}}}", "queries/request"),
+        ], 0, 16, "short"),
+        _panel("Database query latency", [
+            (f"job:django_db_query_duration_seconds:p95_5m{{{selector}}}", "p95"),
+        ], 12, 16, "s"),
+        _panel("Cache hit ratio", [
+            (f"job:django_cache_hits:ratio_rate5m{{{selector}}}", "hit ratio"),
+        ], 0, 24, "percentunit"),
+    ]
+    return {
+        "uid": f"{service}-latency",
+        "title": f"{service} latency",
+        "tags": ["generated", service],
+        "timezone": "browser",
+        "refresh": "30s",
+        "time": {"from": "now-1h", "to": "now"},
+        "schemaVersion": 39,
+        "panels": panels,
+    }
@@ -2,7 +2,11 @@ import random
 import re
 import string
 import subprocess
+from pathlib import Path
+from utils.tracing import get_tracer
 
+# Local state of the generator itself (journals, caches, reports), relative to the working directory
+STATE_DIR = Path(".boilerplate")
 
 def to_snake_case(name: str) -> str:
     # Handle the first uppercase letter in sequences to avoid splitting acronyms poorly
@@ -13,6 +17,11 @@ def to_snake_case(name: str) -> str:
     s = re.sub('([a-z0-9])([A-Z])', r'\1_\2', s)
     return s.lower()
 
+def to_image_slug(name: str) -> str:
+    # Docker image names are lowercase alphanumerics joined by single separators; collapse every other run to '-'
+    slug = re.sub(r'[^a-z0-9]+', '-', to_snake_case(name)).strip('-')
+    return slug or "app"
+
 class Project:
     """
     Utility class for generating project-specific names with flexible formatting.
@@ -97,6 +106,23 @@ class Project:
         characters = string.ascii_letters + string.digits + "^*-_+"
         return ''.join(random.choices(characters, k=length))
 
+# Compose service name of the generated backend; Prometheus and Locust reach it under this host name
+BACKEND_SERVICE = "backend"
+
+
+def with_backend_host(allowed_hosts):
+    """
+    Add the backend's Compose service name to a comma-separated ALLOWED_HOSTS value.
+
+    :param allowed_hosts: Comma-separated host names, e.g. "localhost".
+    :return: The same list with the service name appended if it was missing.
+    """
+    hosts = [host.strip() for host in allowed_hosts.split(",") if host.strip()]
+    if BACKEND_SERVICE not in hosts:
+        hosts.append(BACKEND_SERVICE)
+    return ",".join(hosts)
+
+
 def chain_handlers(handlers):
     """
     Chains the handlers together.
@@ -118,8 +144,14 @@ def run_command(command, description, cwd=None):
     :param cwd: Optional directory to execute the command in.
     """
     print(f"Running: {description}")
-    result = subprocess.run(command, shell=True, text=True, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    if result.returncode != 0:
-        print(f"Failed: {description}\n{result.stderr.strip()}")
-        raise RuntimeError(f"Command failed: {description}")
+    with get_tracer().span(description, category="command", command=command, cwd=str(cwd or "")) as span:
+        result = subprocess.run(command, shell=True, text=True, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        span.set_attributes(
+            exit_code=result.returncode,
+            stdout_bytes=len((result.stdout or "").encode("utf-8", "surrogateescape")),
+            stderr_bytes=len((result.stderr or "").encode("utf-8", "surrogateescape")),
+        )
+        if result.returncode != 0:
+            print(f"Failed: {description}\n{result.stderr.strip()}")
+            raise RuntimeError(f"Command failed: {description}")
     print(f"Success: {description} completed.")
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+# Kept in the project root but git-ignored (gitignore.j2): it is local generator state, not project source
+MANIFEST_NAME = ".boilerplate-manifest.json"
+
+
+def fingerprint(value):
+    """
+    Stable SHA-256 of a JSON-serialisable value (non-serialisable leaves are stringified).
+    """
+    if isinstance(value, bytes):
+        payload = value
+    else:
+        payload = json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class GenerationManifest:
+    """
+    Records what was generated into a project so re-runs can skip unchanged work.
+
+    Outputs are keyed by their destination (plus the template for appended fragments)
+    and store the hash of the template, of the template inputs and of the written
+    content. Install steps store a fingerprint of their inputs.
+    """
+
+    def __init__(self, project_dir):
+        self.project_dir = Path(project_dir)
+        self.outputs = {}
+        self.steps = {}
+        self.dirty = False
+
+    @property
+    def path(self):
+        return self.project_dir / MANIFEST_NAME
+
+    @classmethod
+    def load(cls, project_dir):
+        """
+        Load the manifest of a project, or return an empty one if there is none.
+        """
+        manifest = cls(project_dir)
+        if manifest.path.exists():
+            try:
+                data = json.loads(manifest.path.read_text())
+                manifest.outputs = data.get("outputs", {})
+                manifest.steps = data.get("steps", {})
+            except (OSError, json.JSONDecodeError) as e:
+                logging.warning(f"Ignoring unreadable generation manifest {manifest.path}: {e}")
+        return manifest
+
+    def save(self):
+        """
+        Write the manifest atomically if anything changed.
+        """
+        if not self.dirty:
+            return
+        tmp_path = self.path.with_name(f".{MANIFEST_NAME}.tmp-{os.getpid()}")
+        with open(tmp_path, "w") as f:
+            json.dump({"version": 1, "outputs": self.outputs, "steps": self.steps}, f, indent=2, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def rebase(self, project_dir):
+        """
+        Point the manifest at a new project location (after the staged tree is committed).
+        """
+        self.project_dir = Path(project_dir)
+
+    def output_is_current(self, key, template_hash, inputs_hash, current_content_hash):
+        """
+        True if the output was produced from the same template and inputs and is unchanged on disk.
+        """
+        entry = self.outputs.get(key)
+        return (
+            entry is not None
+            and current_content_hash is not None
+            and entry.get("template") == template_hash
+            and entry.get("inputs") == inputs_hash
+            and entry.get("content") == current_content_hash
+        )
+
+    def record_output(self, key, template_hash, inputs_hash, content_hash, fragment=None):
+        entry = {"template": template_hash, "inputs": inputs_hash, "content": content_hash}
+        if fragment is not None:
+            entry["fragment"] = fragment
+        if self.outputs.get(key) != entry:
+            self.outputs[key] = entry
+            self.dirty = True
+
+    def previous_fragment(self, key):
+        """
+        Text previously appended for an append-mode output, if any.
+        """
+        return self.outputs.get(key, {}).get("fragment")
+
+    def step_is_current(self, name, inputs):
+        return self.steps.get(name) == fingerprint(inputs)
+
+    def record_step(self, name, inputs):
+        value = fingerprint(inputs)
+        if self.steps.get(name) != value:
+            self.steps[name] = value
+            self.dirty = True
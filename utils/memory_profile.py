@@ -0,0 +1,146 @@
+import json
+import linecache
+import os
+import resource
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+# Spans that get a memory record; template renders and commands roll up into their handler
+PROFILED_CATEGORIES = ("handler", "llm")
+
+_IGNORED_FILES = (tracemalloc.__file__, linecache.__file__, "<frozen importlib._bootstrap>",
+                  "<frozen importlib._bootstrap_external>", "<unknown>")
+
+
+def current_rss_kb():
+    """
+    Resident set size of this process in KiB, or None where /proc is unavailable.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def max_rss_kb():
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if os.uname().sysname == "Darwin" else peak
+
+
+class MemoryProfiler:
+    """
+    Tracer listener recording Python heap and RSS usage per handler and per LLM call.
+
+    Each record holds the traced heap at the end of the span, the heap peak reached
+    while it was open and the process RSS. After every handler a tracemalloc snapshot
+    is diffed against the previous one to list the allocation sites that grew.
+    """
+
+    def __init__(self, top=10, frames=1):
+        self.top = top
+        self.frames = frames
+        self.records = []
+        self._open = {}
+        self._lock = threading.Lock()
+        self._previous_snapshot = None
+        self._started = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self._started = time.time()
+        self._previous_snapshot = self._snapshot()
+
+    def stop(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, pattern) for pattern in _IGNORED_FILES]
+        )
+
+    def _fold_peak(self):
+        # tracemalloc keeps a single peak; fold it into every open span before resetting it
+        peak = tracemalloc.get_traced_memory()[1]
+        for frame in self._open.values():
+            frame["peak"] = max(frame["peak"], peak)
+        tracemalloc.reset_peak()
+
+    def on_span_start(self, span):
+        if span.category not in PROFILED_CATEGORIES or not tracemalloc.is_tracing():
+            return
+        with self._lock:
+            self._fold_peak()
+            self._open[span.span_id] = {"start": tracemalloc.get_traced_memory()[0], "peak": 0}
+
+    def on_span_end(self, span):
+        if span.category not in PROFILED_CATEGORIES or not tracemalloc.is_tracing():
+            return
+        with self._lock:
+            self._fold_peak()
+            frame = self._open.pop(span.span_id, None)
+            if frame is None:
+                return
+            current = tracemalloc.get_traced_memory()[0]
+            record = {
+                "name": span.name,
+                "category": span.category,
+                "thread": span.thread_id,
+                "duration_ms": span.duration_ms,
+                "traced_start_kb": frame["start"] / 1024,
+                "traced_end_kb": current / 1024,
+                "traced_peak_kb": max(frame["peak"], current) / 1024,
+                "rss_kb": current_rss_kb(),
+                "max_rss_kb": max_rss_kb(),
+            }
+            if span.category == "handler" and not span.attributes.get("skipped"):
+                record["top_growth"] = self._diff_snapshot()
+            self.records.append(record)
+
+    def _diff_snapshot(self):
+        snapshot = self._snapshot()
+        stats = snapshot.compare_to(self._previous_snapshot, "lineno")
+        self._previous_snapshot = snapshot
+        growth = []
+        for stat in stats[:self.top]:
+            if stat.size_diff <= 0:
+                continue
+            frame = stat.traceback[0]
+            growth.append({
+                "site": f"{frame.filename}:{frame.lineno}",
+                "size_diff_kb": stat.size_diff / 1024,
+                "count_diff": stat.count_diff,
+                "size_kb": stat.size / 1024,
+            })
+        return growth
+
+    def report(self):
+        """
+        Machine-readable summary of the run.
+        """
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        with self._lock:
+            records = list(self.records)
+        peak = max([peak] + [r["traced_peak_kb"] * 1024 for r in records])
+        return {
+            "meta": {"started": self._started, "pid": os.getpid(), "tracemalloc_frames": self.frames},
+            "summary": {
+                "traced_current_kb": current / 1024,
+                "traced_peak_kb": peak / 1024,
+                "rss_kb": current_rss_kb(),
+                "max_rss_kb": max_rss_kb(),
+            },
+            "stages": records,
+        }
+
+    def export(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+        return path
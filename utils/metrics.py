@@ -0,0 +1,176 @@
+import logging
+import threading
+from contextlib import contextmanager
+
+try:
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, start_http_server
+except ImportError:  # Metrics are optional
+    CollectorRegistry = None
+
+HANDLER_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200)
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32, 64)
+
+
+class GeneratorMetrics:
+    """
+    Prometheus metrics about the generator itself.
+
+    Durations, subprocess outcomes and LLM usage are derived from trace spans, so
+    the metrics are registered as a tracer listener rather than instrumented separately.
+    """
+
+    def __init__(self, registry=None):
+        if CollectorRegistry is None:
+            raise RuntimeError("Metrics require the 'prometheus-client' package: pip install prometheus-client")
+        self.registry = registry or CollectorRegistry()
+
+        self.handler_duration = Histogram(
+            "boilerplate_handler_duration_seconds", "Time spent in each handler.",
+            ["handler"], buckets=HANDLER_BUCKETS, registry=self.registry,
+        )
+        self.subprocess_total = Counter(
+            "boilerplate_subprocess_total", "Shell commands run, by command.",
+            ["command"], registry=self.registry,
+        )
+        self.subprocess_failures_total = Counter(
+            "boilerplate_subprocess_failures_total", "Shell commands that failed, by command.",
+            ["command"], registry=self.registry,
+        )
+        self.subprocess_duration = Histogram(
+            "boilerplate_subprocess_duration_seconds", "Shell command duration, by command.",
+            ["command"], buckets=HANDLER_BUCKETS, registry=self.registry,
+        )
+        self.llm_latency = Histogram(
+            "boilerplate_llm_request_duration_seconds", "LLM request latency.",
+            ["model"], buckets=LLM_BUCKETS, registry=self.registry,
+        )
+        self.llm_requests_total = Counter(
+            "boilerplate_llm_requests_total", "LLM requests, by outcome.",
+            ["model", "outcome"], registry=self.registry,
+        )
+        self.llm_tokens_total = Counter(
+            "boilerplate_llm_tokens_total", "Tokens used, by type (prompt, completion, cached).",
+            ["model", "type"], registry=self.registry,
+        )
+        self.llm_retries_total = Counter(
+            "boilerplate_llm_retries_total", "LLM request retries.",
+            ["model"], registry=self.registry,
+        )
+        self.cache_requests_total = Counter(
+            "boilerplate_cache_requests_total", "Cache lookups, by cache and result (hit, miss).",
+            ["cache", "result"], registry=self.registry,
+        )
+        self.cache_hit_ratio = Gauge(
+            "boilerplate_cache_hit_ratio", "Hit ratio of each cache since start.",
+            ["cache"], registry=self.registry,
+        )
+        self.jobs_in_flight = Gauge(
+            "boilerplate_jobs_in_flight", "Generation jobs currently running.",
+            registry=self.registry,
+        )
+        self.jobs_total = Counter(
+            "boilerplate_jobs_total", "Finished generation jobs, by outcome.",
+            ["outcome"], registry=self.registry,
+        )
+        self._cache_counts = {}
+
+    def on_span_end(self, span):
+        seconds = span.duration_ms / 1000
+        if span.category == "handler":
+            if not span.attributes.get("skipped"):
+                self.handler_duration.labels(handler=span.name).observe(seconds)
+        elif span.category == "command":
+            self.subprocess_total.labels(command=span.name).inc()
+            self.subprocess_duration.labels(command=span.name).observe(seconds)
+            if span.error or span.attributes.get("exit_code", 0) != 0:
+                self.subprocess_failures_total.labels(command=span.name).inc()
+        elif span.category == "llm":
+            model = span.attributes.get("model", "unknown")
+            self.llm_latency.labels(model=model).observe(seconds)
+            self.llm_requests_total.labels(model=model, outcome="error" if span.error else "success").inc()
+            self.llm_retries_total.labels(model=model).inc(span.attributes.get("retries", 0))
+            for token_type in ("prompt", "completion", "cached"):
+                count = span.attributes.get(f"{token_type}_tokens")
+                if count:
+                    self.llm_tokens_total.labels(model=model, type=token_type).inc(count)
+            if span.attributes.get("prompt_tokens"):
+                self.record_cache("llm_prompt", bool(span.attributes.get("cached_tokens")))
+
+    def record_cache(self, cache, hit, count=1):
+        """
+        Count cache lookups and refresh the hit-ratio gauge.
+        """
+        self.cache_requests_total.labels(cache=cache, result="hit" if hit else "miss").inc(count)
+        hits, total = self._cache_counts.get(cache, (0, 0))
+        hits, total = hits + (count if hit else 0), total + count
+        self._cache_counts[cache] = (hits, total)
+        self.cache_hit_ratio.labels(cache=cache).set(hits / total)
+
+    @contextmanager
+    def job(self):
+        """
+        Track one generation job as in flight and count its outcome.
+        """
+        self.jobs_in_flight.inc()
+        try:
+            yield
+        except BaseException:
+            self.jobs_total.labels(outcome="failure").inc()
+            raise
+        else:
+            self.jobs_total.labels(outcome="success").inc()
+        finally:
+            self.jobs_in_flight.dec()
+
+    def serve(self, port, addr="0.0.0.0"):
+        """
+        Expose the registry on http://addr:port/metrics from a daemon thread.
+        """
+        start_http_server(port, addr=addr, registry=self.registry)
+        logging.info(f"Serving generator metrics on http://{addr}:{port}/metrics")
+
+
+_metrics = None
+
+# Cache lookups are counted whether or not Prometheus metrics are enabled (run history uses them)
+_cache_counts = {}
+_cache_lock = threading.Lock()
+
+
+def enable_metrics(tracer, registry=None):
+    """
+    Create the process-wide metrics and attach them to the tracer.
+    """
+    global _metrics
+    if _metrics is None:
+        _metrics = GeneratorMetrics(registry)
+        tracer.add_listener(_metrics)
+    return _metrics
+
+
+def get_metrics():
+    """
+    The process-wide metrics, or None when metrics are disabled.
+    """
+    return _metrics
+
+
+def record_cache(cache, hit, count=1):
+    """
+    Record cache lookups for cache_stats() and, when enabled, the Prometheus metrics.
+    """
+    with _cache_lock:
+        hits, total = _cache_counts.get(cache, (0, 0))
+        _cache_counts[cache] = (hits + (count if hit else 0), total + count)
+    if _metrics is not None:
+        _metrics.record_cache(cache, hit, count)
+
+
+def cache_stats():
+    """
+    Hits, lookups and hit ratio of each cache since the process started.
+    """
+    with _cache_lock:
+        counts = dict(_cache_counts)
+    return {cache: {"hits": hits, "lookups": total, "hit_ratio": hits / total if total else 0.0}
+            for cache, (hits, total) in counts.items()}
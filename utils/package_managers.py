@@ -0,0 +1,168 @@
+import shlex
+from abc import ABC, abstractmethod
+
+
+class PackageManager(ABC):
+    """
+    How the generated backend resolves, locks and installs its Python dependencies.
+
+    Every backend leaves the same artifacts in the backend directory: its lock
+    file, a pinned `requirements.txt` (what the Docker images install), a
+    `constraints.txt` copy of the pins for downstream installs, and the installed
+    environment in `.venv`.
+
+    Tools are run as modules of the environment's interpreter rather than through
+    their console scripts, whose shebangs hold the absolute path of the directory
+    the environment was created in; the project is generated in a staging
+    directory and moved into place afterwards.
+    """
+
+    name = None
+    # Executable that must be on PATH to generate a project
+    tool = None
+    lock_file = None
+    # Virtual environment inside the backend directory, so it moves with the project
+    venv_dir = ".venv"
+    # Prefix and interpreter that run a command inside the backend's environment (see run())
+    run_prefix = ""
+    python = "python"
+    # Console scripts whose module name differs
+    MODULES = {"django-admin": "django"}
+    # `cache` input of actions/setup-python in the CI pipeline (None: cached separately)
+    ci_cache = None
+
+    def setup_commands(self):
+        return []
+
+    @abstractmethod
+    def install_commands(self, packages):
+        """
+        Commands resolving, locking and installing all packages in a single resolution.
+
+        :param packages: Requirement specifiers, e.g. ["django", "redis"].
+        :return: List of (command, description) tuples, run in the backend directory.
+        """
+        pass
+
+    def run(self, command):
+        """
+        Shell command running `command` (a tool name and its arguments) inside the backend's environment.
+        """
+        program, _, args = command.partition(" ")
+        if program != "python":
+            args = f"-m {self.MODULES.get(program, program)} {args}"
+        return f"{self.run_prefix}{self.python} {args}".rstrip()
+
+    @abstractmethod
+    def ci_install(self):
+        """
+        Shell lines installing the locked dependencies on a CI runner.
+        """
+        pass
+
+
+class PipenvManager(PackageManager):
+    """
+    Pipenv keeps the environment in the backend's `.venv` rather than in
+    ~/.local/share/virtualenvs, where it is keyed by the project's path and would
+    be left behind when the staged project is moved into place. `pipenv run`
+    picks up an existing `.venv` by itself.
+    """
+
+    name = "pipenv"
+    tool = "pipenv"
+    lock_file = "Pipfile.lock"
+    run_prefix = "pipenv run "
+    ci_cache = "pipenv"
+
+    def install_commands(self, packages):
+        return [
+            (f"PIPENV_VENV_IN_PROJECT=1 pipenv install {shlex.join(packages)}", "Install backend dependencies"),
+            ("pipenv requirements > requirements.txt", "Generate requirements.txt"),
+            ("cp requirements.txt constraints.txt", "Generate constraints.txt"),
+        ]
+
+    def ci_install(self):
+        return ["pip install pipenv", "pipenv install --dev --deploy"]
+
+
+class RequirementsManager(PackageManager):
+    """
+    Dependencies declared in `requirements.in`, compiled to a pinned `requirements.txt`
+    (which doubles as the lock file) and synced into a `.venv` virtual environment.
+    """
+
+    lock_file = "requirements.txt"
+    python = ".venv/bin/python"
+
+    @abstractmethod
+    def compile_command(self):
+        """
+        Command pinning `requirements.in` into `requirements.txt`.
+        """
+        pass
+
+    @abstractmethod
+    def sync_command(self):
+        """
+        Command making `.venv` match `requirements.txt` exactly.
+        """
+        pass
+
+    def install_commands(self, packages):
+        return [
+            (f"printf '%s\\n' {shlex.join(packages)} > requirements.in", "Declare backend dependencies"),
+            (self.compile_command(), "Generate requirements.txt"),
+            (self.sync_command(), "Install backend dependencies"),
+            ("cp requirements.txt constraints.txt", "Generate constraints.txt"),
+        ]
+
+
+class PipToolsManager(RequirementsManager):
+    name = "pip-tools"
+    tool = "python3"
+    ci_cache = "pip"
+
+    def setup_commands(self):
+        return [("python3 -m venv .venv && .venv/bin/python -m pip install --quiet pip-tools", "Create virtual environment with pip-tools")]
+
+    def compile_command(self):
+        return ".venv/bin/python -m piptools compile --quiet --strip-extras --output-file requirements.txt requirements.in"
+
+    def sync_command(self):
+        return ".venv/bin/python -m piptools sync requirements.txt"
+
+    def ci_install(self):
+        return ["python -m venv .venv", ".venv/bin/python -m pip install -r requirements.txt"]
+
+
+class UvManager(RequirementsManager):
+    name = "uv"
+    tool = "uv"
+
+    def setup_commands(self):
+        return [("uv venv --quiet .venv", "Create virtual environment")]
+
+    def compile_command(self):
+        return "uv pip compile --quiet --output-file requirements.txt requirements.in"
+
+    def sync_command(self):
+        return "uv pip sync requirements.txt"
+
+    def ci_install(self):
+        return ["uv venv .venv", "uv pip sync requirements.txt"]
+
+
+PACKAGE_MANAGERS = {manager.name: manager for manager in (PipenvManager, PipToolsManager, UvManager)}
+
+
+def get_package_manager(name):
+    """
+    Instantiate the package manager registered under `name`.
+
+    :raises ValueError: If no such package manager exists.
+    """
+    try:
+        return PACKAGE_MANAGERS[name]()
+    except KeyError:
+        raise ValueError(f"Unsupported package manager '{name}' (expected {', '.join(PACKAGE_MANAGERS)}).") from None
@@ -0,0 +1,53 @@
+def _format_kb(kb):
+    """
+    Postgres memory setting, in the largest unit that divides it evenly.
+    """
+    kb = max(64, int(kb))
+    if kb % (1024 * 1024) == 0:
+        return f"{kb // (1024 * 1024)}GB"
+    if kb % 1024 == 0:
+        return f"{kb // 1024}MB"
+    return f"{kb}kB"
+
+
+def postgres_settings(memory_mb, cpus, max_connections=100, storage="ssd"):
+    """
+    Postgres settings for a web (OLTP) workload sized from the container's resources.
+
+    Follows the usual PGTune rules: a quarter of memory for shared buffers, three
+    quarters assumed available as cache, work_mem split across connections and
+    parallel workers, and WAL sized to keep checkpoints infrequent.
+
+    :param memory_mb: Memory available to the database container, in MiB.
+    :param cpus: CPUs available to the database container.
+    :param max_connections: Server connection limit (lower when behind PgBouncer).
+    :param storage: "ssd" or "hdd", which sets the planner's I/O cost assumptions.
+    :return: Ordered dict of setting name to value, ready for `postgres -c name=value`.
+    """
+    memory_kb = int(memory_mb) * 1024
+    cpus = max(1, int(round(float(cpus))))
+    shared_buffers = memory_kb // 4
+    parallel_per_gather = max(1, min(4, cpus // 2))
+
+    settings = {
+        "max_connections": int(max_connections),
+        "shared_buffers": _format_kb(shared_buffers),
+        "effective_cache_size": _format_kb(memory_kb * 3 // 4),
+        "maintenance_work_mem": _format_kb(min(memory_kb // 16, 2 * 1024 * 1024)),
+        "work_mem": _format_kb((memory_kb - shared_buffers) // (int(max_connections) * 3) // parallel_per_gather),
+        "wal_buffers": _format_kb(min(shared_buffers * 3 // 100, 16 * 1024)),
+        "min_wal_size": "1GB",
+        "max_wal_size": "4GB",
+        "checkpoint_completion_target": 0.9,
+        "default_statistics_target": 100,
+        "random_page_cost": 1.1 if storage == "ssd" else 4,
+        "effective_io_concurrency": 200 if storage == "ssd" else 2,
+    }
+    if cpus >= 2:
+        settings.update({
+            "max_worker_processes": cpus,
+            "max_parallel_workers": cpus,
+            "max_parallel_workers_per_gather": parallel_per_gather,
+            "max_parallel_maintenance_workers": parallel_per_gather,
+        })
+    return settings
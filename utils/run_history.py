@@ -0,0 +1,191 @@
+import json
+import sqlite3
+import statistics
+import time
+from pathlib import Path
+from utils.helpers import STATE_DIR
+
+HISTORY_PATH = STATE_DIR / "history.sqlite3"
+
+# Span categories stored per run; templates and I/O are too fine-grained to compare
+STAGE_CATEGORIES = ("handler", "command", "llm")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL NOT NULL,
+    duration_s REAL NOT NULL,
+    outcome TEXT NOT NULL,
+    error TEXT,
+    project_name TEXT,
+    resumed INTEGER NOT NULL DEFAULT 0,
+    toolchain TEXT,
+    cache_stats TEXT,
+    llm_usage TEXT
+);
+CREATE TABLE IF NOT EXISTS stages (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    duration_s REAL NOT NULL,
+    calls INTEGER NOT NULL,
+    skipped INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS stages_by_name ON stages (category, name, run_id);
+"""
+
+
+def stages_from_spans(spans):
+    """
+    Total duration and call count per (category, name) of the finished spans.
+    """
+    stages = {}
+    for span in spans:
+        if span.category not in STAGE_CATEGORIES or span.end_ns is None:
+            continue
+        stage = stages.setdefault((span.category, span.name), {"duration_s": 0.0, "calls": 0, "skipped": True, "failed": False})
+        stage["duration_s"] += span.duration_ms / 1000
+        stage["calls"] += 1
+        stage["skipped"] = stage["skipped"] and bool(span.attributes.get("skipped"))
+        stage["failed"] = stage["failed"] or bool(span.error) or span.attributes.get("exit_code", 0) != 0
+    return stages
+
+
+class RunHistory:
+    """
+    SQLite store of past generator runs: per-run outcome and environment plus per-stage timings.
+    """
+
+    def __init__(self, path=HISTORY_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def record_run(self, started, duration_s, outcome, spans, error=None, project_name=None, resumed=False,
+                   toolchain=None, cache_stats=None, llm_usage=None):
+        """
+        Store one run and its stage timings.
+
+        :param spans: Finished tracer spans of the run.
+        :return: The new run id.
+        """
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (started, duration_s, outcome, error, project_name, resumed, toolchain, cache_stats, llm_usage) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (started, duration_s, outcome, error, project_name, int(resumed),
+                 json.dumps(toolchain or {}), json.dumps(cache_stats or {}), json.dumps(llm_usage or {})),
+            )
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO stages (run_id, category, name, duration_s, calls, skipped, failed) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, category, name, stage["duration_s"], stage["calls"], int(stage["skipped"]), int(stage["failed"]))
+                 for (category, name), stage in stages_from_spans(spans).items()],
+            )
+        return run_id
+
+    def recent_runs(self, limit=10):
+        rows = self.connection.execute("SELECT * FROM runs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        runs = []
+        for row in rows:
+            run = dict(row)
+            for key in ("toolchain", "cache_stats", "llm_usage"):
+                run[key] = json.loads(run[key] or "{}")
+            runs.append(run)
+        return runs
+
+    def stage_durations(self, run_ids):
+        """
+        {(category, name): {run_id: duration_s}} of the stages that actually ran.
+        """
+        if not run_ids:
+            return {}
+        placeholders = ",".join("?" * len(run_ids))
+        rows = self.connection.execute(
+            f"SELECT run_id, category, name, duration_s FROM stages "
+            f"WHERE run_id IN ({placeholders}) AND skipped = 0 AND failed = 0",
+            list(run_ids),
+        ).fetchall()
+        durations = {}
+        for row in rows:
+            durations.setdefault((row["category"], row["name"]), {})[row["run_id"]] = row["duration_s"]
+        return durations
+
+    def detect_regressions(self, latest=1, baseline=10, threshold=1.5, min_seconds=0.5):
+        """
+        Compare the latest successful runs to a rolling baseline of the runs before them.
+
+        A stage regressed when its median duration over the latest runs exceeds
+        `threshold` times the baseline median by more than `min_seconds`.
+
+        :return: (regressions, toolchain_changes); each regression is a dict with
+            category, name, baseline_s, latest_s and ratio.
+        """
+        rows = self.connection.execute(
+            "SELECT id, toolchain FROM runs WHERE outcome = 'success' ORDER BY id DESC LIMIT ?",
+            (latest + baseline,),
+        ).fetchall()
+        latest_ids = [row["id"] for row in rows[:latest]]
+        baseline_ids = [row["id"] for row in rows[latest:]]
+        if not latest_ids or not baseline_ids:
+            return [], {}
+
+        durations = self.stage_durations(latest_ids + baseline_ids)
+        regressions = []
+        for (category, name), by_run in durations.items():
+            latest_values = [by_run[i] for i in latest_ids if i in by_run]
+            baseline_values = [by_run[i] for i in baseline_ids if i in by_run]
+            if not latest_values or not baseline_values:
+                continue
+            latest_s, baseline_s = statistics.median(latest_values), statistics.median(baseline_values)
+            if latest_s > baseline_s * threshold and latest_s - baseline_s > min_seconds:
+                regressions.append({
+                    "category": category, "name": name, "baseline_s": baseline_s,
+                    "latest_s": latest_s, "ratio": latest_s / baseline_s if baseline_s else float("inf"),
+                })
+        regressions.sort(key=lambda r: r["latest_s"] - r["baseline_s"], reverse=True)
+
+        # Tool versions that differ between the newest run and the baseline runs
+        current = json.loads(rows[0]["toolchain"] or "{}")
+        previous = {}
+        for row in rows[latest:]:
+            for tool, version in json.loads(row["toolchain"] or "{}").items():
+                previous.setdefault(tool, set()).add(version)
+        changes = {tool: {"before": sorted(str(v) for v in previous[tool]), "now": version}
+                   for tool, version in current.items() if tool in previous and previous[tool] != {version}}
+        return regressions, changes
+
+
+def record_current_run(started, outcome, context, error=None, resumed=False, path=HISTORY_PATH):
+    """
+    Store the run that just finished, using the process-wide tracer, cache counters and LLM ledger.
+    """
+    from llm.accounting.usage_ledger import get_run_ledger
+    from utils.metrics import cache_stats
+    from utils.tracing import get_tracer
+
+    llm_summary = get_run_ledger().summary()
+    history = RunHistory(path)
+    try:
+        return history.record_run(
+            started=started,
+            duration_s=time.time() - started,
+            outcome=outcome,
+            spans=list(get_tracer().spans),
+            error=error,
+            project_name=context.get("project_name"),
+            resumed=resumed,
+            toolchain={tool: info.get("version") for tool, info in (context.get("toolchain") or {}).items()},
+            cache_stats=cache_stats(),
+            llm_usage={key: llm_summary[key] for key in ("calls", "errors", "prompt_tokens", "completion_tokens",
+                                                         "cached_tokens", "latency_s")},
+        )
+    finally:
+        history.close()
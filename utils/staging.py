@@ -0,0 +1,320 @@
+import logging
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from jinja2 import Environment, FileSystemLoader, meta
+from utils.manifest import GenerationManifest, fingerprint
+from utils.metrics import record_cache
+from utils.tracing import get_tracer
+
+
+class RenderJob:
+    """
+    A single output: either a template to render or literal content, and where to put it.
+    """
+    def __init__(self, destination, template_name=None, context=None, template_dir=None, content=None, append=False):
+        self.destination = destination
+        self.template_name = template_name
+        self.context = context or {}
+        self.template_dir = template_dir
+        self.content = content
+        self.append = append
+
+
+class OutputStager:
+    """
+    Collects the files produced by the handlers and writes them safely.
+
+    For a new project, everything is written into a hidden staging directory next to
+    the final location and the whole tree is moved into place with a single rename on
+    `commit()`; `abort()` discards it. For an existing project, each file is written to
+    a temporary sibling and swapped in with `os.replace`, so a crash never leaves a
+    half-written file behind.
+
+    Templates are rendered in parallel on a thread pool when the pending jobs are
+    flushed, and fsyncs are batched per flush instead of issued per write. A
+    generation manifest stored in the project lets re-runs skip outputs whose
+    template and inputs did not change.
+    """
+
+    def __init__(self, final_dir, max_workers=None, staging_root=None):
+        """
+        :param final_dir: Directory the project must end up in.
+        :param max_workers: Size of the render pool (defaults to the CPU count, capped at 8).
+        :param staging_root: Existing staging directory to continue with (when resuming).
+        """
+        self.final_dir = Path(final_dir)
+        self.in_place = self.final_dir.exists() and staging_root is None
+        if staging_root is not None:
+            self.root = Path(staging_root)
+            if not self.root.exists():
+                raise FileNotFoundError(f"Staging directory '{self.root}' no longer exists.")
+        elif self.in_place:
+            self.root = self.final_dir
+        else:
+            self.final_dir.parent.mkdir(parents=True, exist_ok=True)
+            self.root = Path(tempfile.mkdtemp(prefix=f".{self.final_dir.name}.staging-", dir=self.final_dir.parent))
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.committed = False
+        self._jobs = []
+        self._environments = {}
+        self._template_info_cache = {}
+        self.manifest = GenerationManifest.load(self.root)
+        self.stats = {"rendered": 0, "skipped": 0, "written": 0}
+        self._unsynced_files = set()
+        self._unsynced_dirs = set()
+        logging.info(f"Staging output for {self.final_dir} in {self.root}")
+
+    def snapshot(self):
+        """
+        JSON-compatible description of the stager, used by the checkpoint journal.
+        """
+        return {"final_dir": str(self.final_dir), "root": str(self.root), "in_place": self.in_place}
+
+    @classmethod
+    def restore(cls, snapshot, max_workers=None):
+        """
+        Recreate a stager from `snapshot()` output, continuing in the same directory.
+        """
+        if snapshot["in_place"]:
+            return cls(snapshot["final_dir"], max_workers=max_workers)
+        return cls(snapshot["final_dir"], max_workers=max_workers, staging_root=snapshot["root"])
+
+    def path(self, relative_path=""):
+        """
+        Absolute path of a file inside the tree being generated.
+        """
+        return self.root / relative_path
+
+    def submit(self, template_name, context, destination, template_dir="handlers/templates", append=False):
+        """
+        Queue a template render.
+
+        :param template_name: Template file name inside `template_dir`.
+        :param context: Variables passed to the template.
+        :param destination: Output path, relative to the project or absolute inside it.
+        :param template_dir: Directory holding the template.
+        :param append: Append to the destination instead of overwriting it.
+        """
+        self._jobs.append(RenderJob(self._relative(destination), template_name=template_name, context=context,
+                                    template_dir=str(template_dir), append=append))
+
+    def submit_content(self, destination, content, append=False):
+        """
+        Queue literal content to be written.
+        """
+        self._jobs.append(RenderJob(self._relative(destination), content=content, append=append))
+
+    def flush(self):
+        """
+        Render all queued jobs in parallel and write out the ones that changed.
+
+        A job whose template, inputs and on-disk content match the manifest is not
+        rendered at all, and a rendered file identical to what is on disk is not
+        rewritten, so unchanged files keep their mtime. Writes happen in submission
+        order so appends to the same file stay ordered.
+        :return: List of paths written.
+        """
+        jobs, self._jobs = self._jobs, []
+        if not jobs:
+            return []
+
+        plans = [self._plan(job) for job in jobs]
+        to_render = [plan for plan in plans if not plan["current"]]
+        self.stats["skipped"] += len(plans) - len(to_render)
+
+        tracer = get_tracer()
+        render = partial(self._render, parent=tracer.current_span())
+        if len(to_render) <= 1 or self.max_workers == 1:
+            rendered = [render(plan["job"]) for plan in to_render]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(to_render))) as pool:
+                rendered = list(pool.map(render, [plan["job"] for plan in to_render]))
+        self.stats["rendered"] += len(to_render)
+
+        with tracer.span("write staged outputs", category="io", outputs=len(to_render)) as span:
+            written = self._write_all(to_render, rendered)
+            span.set_attributes(files_written=len(written), bytes_written=sum(path.stat().st_size for path in written))
+        self.manifest.save()
+        logging.info(
+            f"Staged {len(plans)} output(s): {len(written)} written, "
+            f"{len(plans) - len(written)} unchanged."
+        )
+        return written
+
+    def commit(self):
+        """
+        Flush pending jobs and move the staged tree into its final location.
+
+        :return: The final project directory.
+        """
+        self.flush()
+        if not self.in_place and not self.committed:
+            if self.final_dir.exists():
+                raise FileExistsError(f"Cannot commit staged project: '{self.final_dir}' already exists.")
+            self._sync()
+            # mkdtemp creates the staging root as 0700; give the project the mode a plain mkdir would have
+            os.chmod(self.root, 0o777 & ~self._umask())
+            # Paths recorded before the rename would be stale afterwards, hence syncing first
+            os.rename(self.root, self.final_dir)
+            self._fsync_path(self.final_dir.parent)
+            logging.info(f"Committed staged project to {self.final_dir}")
+            self.root = self.final_dir
+            self.manifest.rebase(self.final_dir)
+        self.committed = True
+        return self.final_dir
+
+    def abort(self):
+        """
+        Discard queued jobs and, for a new project, the whole staging directory.
+        """
+        self._jobs = []
+        if not self.in_place and not self.committed and self.root.exists():
+            shutil.rmtree(self.root, ignore_errors=True)
+            logging.info(f"Discarded staging directory {self.root}")
+
+    def _relative(self, destination):
+        destination = Path(destination)
+        if destination.is_absolute():
+            return destination.relative_to(self.root)
+        return destination
+
+    def _environment(self, template_dir):
+        # One environment per template directory, so compiled templates are cached across renders
+        if template_dir not in self._environments:
+            self._environments[template_dir] = Environment(loader=FileSystemLoader(template_dir))
+        return self._environments[template_dir]
+
+    def _template_info(self, template_dir, template_name):
+        """
+        Hash and referenced variables of a template, cached for the lifetime of the stager.
+        """
+        key = (template_dir, template_name)
+        record_cache("template", key in self._template_info_cache)
+        if key not in self._template_info_cache:
+            template_path = Path(template_dir) / template_name
+            if not template_path.exists():
+                raise FileNotFoundError(f"Template '{template_path}' not found.")
+            source = template_path.read_text()
+            variables = meta.find_undeclared_variables(self._environment(template_dir).parse(source))
+            self._template_info_cache[key] = (fingerprint(source.encode("utf-8")), sorted(variables))
+        return self._template_info_cache[key]
+
+    def _plan(self, job):
+        if job.template_name is None:
+            template_hash, inputs_hash = "content", fingerprint(job.content)
+        else:
+            template_hash, variables = self._template_info(job.template_dir, job.template_name)
+            # Only the variables the template references count as its inputs
+            inputs_hash = fingerprint({name: job.context.get(name) for name in variables})
+        key = str(job.destination)
+        if job.append:
+            key = f"{key}#{job.template_name or 'content'}"
+
+        current = not job.append and self.manifest.output_is_current(
+            key, template_hash, inputs_hash, self._disk_hash(self.root / job.destination)
+        )
+        if not job.append:
+            record_cache("output", current)
+        return {"job": job, "key": key, "template": template_hash, "inputs": inputs_hash, "current": current}
+
+    def _render(self, job, parent=None):
+        if job.template_name is None:
+            return job.content
+        with get_tracer().span(f"render {job.template_name}", category="template", parent=parent,
+                               template=job.template_name, destination=str(job.destination)) as span:
+            content = self._environment(job.template_dir).get_template(job.template_name).render(job.context)
+            span.set_attribute("bytes", len(content.encode("utf-8")))
+        return content
+
+    @staticmethod
+    def _disk_hash(path):
+        try:
+            return fingerprint(path.read_bytes())
+        except (FileNotFoundError, IsADirectoryError):
+            return None
+
+    def _write_all(self, plans, rendered):
+        # Appends are merged first so every destination is written at most once
+        outputs = {}
+        fragments = {}
+        for plan, content in zip(plans, rendered):
+            job = plan["job"]
+            target = self.root / job.destination
+            if job.append:
+                if target not in outputs:
+                    outputs[target] = target.read_text() if target.exists() else ""
+                fragment = "\n" + content + "\n"
+                previous = self.manifest.previous_fragment(plan["key"])
+                if previous and previous in outputs[target]:
+                    # Re-running replaces the fragment appended last time instead of duplicating it
+                    outputs[target] = outputs[target].replace(previous, fragment, 1)
+                else:
+                    outputs[target] += fragment
+                fragments[plan["key"]] = fragment
+            else:
+                outputs[target] = content
+
+        pending = []
+        for target, content in outputs.items():
+            if self._disk_hash(target) == fingerprint(content.encode("utf-8")):
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            # A new tree is invisible until commit, so files are written in place and synced
+            # once at commit; an existing tree gets temporary siblings that are synced as a
+            # batch and then swapped in.
+            path = target if not self.in_place else target.with_name(f".{target.name}.tmp-{os.getpid()}")
+            with open(path, "w") as f:
+                f.write(content)
+            pending.append((path, target))
+            self._unsynced_files.add(path)
+            self._unsynced_dirs.add(target.parent)
+
+        if self.in_place:
+            self._sync()
+            for path, target in pending:
+                os.replace(path, target)
+            for directory in {target.parent for _, target in pending}:
+                self._fsync_path(directory)
+
+        for plan in plans:
+            target = self.root / plan["job"].destination
+            self.manifest.record_output(
+                plan["key"], plan["template"], plan["inputs"],
+                fingerprint(outputs[target].encode("utf-8")), fragment=fragments.get(plan["key"]),
+            )
+        self.stats["written"] += len(pending)
+        return [target for _, target in pending]
+
+    def _sync(self):
+        for path in self._unsynced_files:
+            self._fsync_path(path)
+        for directory in self._unsynced_dirs:
+            self._fsync_path(directory)
+        self._unsynced_files.clear()
+        self._unsynced_dirs.clear()
+
+    @staticmethod
+    def _umask():
+        """
+        Current process umask (it can only be read by setting it).
+        """
+        mask = os.umask(0)
+        os.umask(mask)
+        return mask
+
+    @staticmethod
+    def _fsync_path(path):
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
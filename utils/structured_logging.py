@@ -0,0 +1,127 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import time
+from pathlib import Path
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Context and config keys whose values are never written to logs. "token" only matches as the
+# last word of a key (access_token, authToken), not counts such as prompt_tokens or max_tokens.
+SECRET_KEY_PATTERN = re.compile(
+    r"password|passwd|secret|api_?key|credential|private_key|(^|[_-])((access|refresh|auth|bearer|id)[_-]?)?token$",
+    re.IGNORECASE,
+)
+REDACTED = "***"
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener = None
+
+
+def redact(value):
+    """
+    Copy of a value with secret-looking keys masked, recursively.
+    """
+    if isinstance(value, dict):
+        return {k: REDACTED if SECRET_KEY_PATTERN.search(str(k)) else redact(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(v) for v in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, Path):
+        return str(value)
+    return repr(value)
+
+
+class redacted:
+    """
+    Log argument that is redacted and formatted only if the record is emitted:
+
+        logger.debug("Context: %s", redacted(context))
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        return json.dumps(redact(self.value), default=str)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line; fields passed with `extra=` are included (redacted).
+    """
+
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "thread": record.threadName,
+        }
+        fields = {k: v for k, v in vars(record).items() if k not in _RECORD_ATTRIBUTES}
+        if fields:
+            entry.update(redact(fields))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level="INFO", json_path=None, console=True):
+    """
+    Route all logging through a queue so callers never block on I/O.
+
+    Records below `level` are dropped before any formatting happens. Emitted
+    records are queued for a background listener, which does the encoding and
+    I/O: human-readable lines to stderr and, if `json_path` is given, JSON
+    lines to that file.
+
+    :return: The queue listener (already started; stopped at exit).
+    """
+    global _listener
+    stop_logging()
+
+    handlers = []
+    if console:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers.append(stream_handler)
+    if json_path:
+        json_path = Path(json_path)
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.FileHandler(json_path, encoding="utf-8")
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(os.getenv("BOILERPLATE_LOG_LEVEL", level).upper())
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging():
+    """
+    Drain the queue and stop the listener thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from utils.helpers import STATE_DIR
+
+TOOLCHAIN_CACHE_PATH = STATE_DIR / "toolchain.json"
+
+# Commands printing each tool's version; the first dotted number in the output is used
+VERSION_COMMANDS = {
+    "git": ["git", "--version"],
+    "node": ["node", "--version"],
+    "npm": ["npm", "--version"],
+    "yarn": ["yarn", "--version"],
+    "pnpm": ["pnpm", "--version"],
+    "pipenv": ["pipenv", "--version"],
+    "uv": ["uv", "--version"],
+    "python3": ["python3", "--version"],
+    "docker": ["docker", "version", "--format", "{{.Client.Version}}"],
+}
+
+# Oldest versions the generated projects work with
+MINIMUM_VERSIONS = {
+    "git": "2.28",  # init --initial-branch
+    "node": "18.0",
+    "docker": "20.10",
+}
+
+_VERSION_PATTERN = re.compile(r"\d+(?:\.\d+)+")
+
+
+def parse_version(text):
+    """
+    Tuple of the first dotted version number in a string, e.g. (2, 39, 2).
+    """
+    match = _VERSION_PATTERN.search(text or "")
+    return tuple(int(part) for part in match.group(0).split(".")) if match else None
+
+
+def _cache_key(paths):
+    # A tool upgrade changes its binary's mtime; a PATH change can select a different binary
+    digest = hashlib.sha256(os.environ.get("PATH", "").encode("utf-8"))
+    for tool in sorted(paths):
+        path = paths[tool]
+        try:
+            mtime = os.stat(path).st_mtime_ns if path else None
+        except OSError:
+            mtime = None
+        digest.update(f"\0{tool}={path}@{mtime}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _probe_version(tool, path):
+    command = [path] + VERSION_COMMANDS.get(tool, [tool, "--version"])[1:]
+    try:
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logging.warning(f"Could not determine the version of {tool}: {e}")
+        return None
+    if result.returncode != 0:
+        logging.warning(f"'{' '.join(command)}' exited with status {result.returncode}")
+        return None
+    version = parse_version(result.stdout)
+    return ".".join(str(part) for part in version) if version else None
+
+
+def probe_toolchain(tools, cache_path=TOOLCHAIN_CACHE_PATH):
+    """
+    Locate tools on PATH and determine their versions.
+
+    Tools are resolved in-process; versions are probed concurrently and cached
+    on disk, keyed by PATH and the binaries' mtimes, so an unchanged toolchain
+    costs no subprocesses.
+
+    :return: {tool: {"path": str or None, "version": str or None}}
+    """
+    paths = {tool: shutil.which(tool) for tool in tools}
+    key = _cache_key(paths)
+
+    cached = {}
+    try:
+        with open(cache_path, "r") as f:
+            data = json.load(f)
+        if data.get("key") == key:
+            cached = data.get("tools", {})
+    except (OSError, ValueError):
+        pass
+
+    toolchain = {tool: cached[tool] for tool in tools if tool in cached}
+    missing = [tool for tool in tools if tool not in toolchain]
+    if missing:
+        installed = [tool for tool in missing if paths[tool]]
+        with ThreadPoolExecutor(max_workers=max(1, len(installed))) as pool:
+            versions = dict(zip(installed, pool.map(lambda tool: _probe_version(tool, paths[tool]), installed)))
+        for tool in missing:
+            toolchain[tool] = {"path": paths[tool], "version": versions.get(tool)}
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, "w") as f:
+                json.dump({"key": key, "tools": {**cached, **toolchain}}, f, indent=2)
+        except OSError as e:
+            logging.warning(f"Could not write the toolchain cache: {e}")
+    else:
+        logging.info("Toolchain unchanged since the last run; using cached versions.")
+    return toolchain
+
+
+def check_minimum_versions(toolchain, minimums=MINIMUM_VERSIONS):
+    """
+    Tools whose detected version is older than required.
+
+    :return: {tool: (found, required)}
+    """
+    outdated = {}
+    for tool, required in minimums.items():
+        info = toolchain.get(tool)
+        if not info or not info.get("version"):
+            continue
+        if parse_version(info["version"]) < parse_version(required):
+            outdated[tool] = (info["version"], required)
+    return outdated
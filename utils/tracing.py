@@ -0,0 +1,204 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class Span:
+    """
+    A timed operation with attributes, e.g. one handler, one command or one LLM call.
+    """
+
+    def __init__(self, tracer, name, category, attributes, parent):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.attributes = dict(attributes)
+        self.parent = parent
+        self.span_id = os.urandom(8).hex()
+        self.thread_id = threading.get_ident()
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns = None
+        self.error = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes):
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self):
+        end_ns = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end_ns - self.start_ns) / 1e6
+
+    def epoch_ns(self, perf_ns):
+        return self.tracer.epoch_ns + (perf_ns - self.tracer.perf_origin_ns)
+
+
+class Tracer:
+    """
+    Collects spans for one run and exports them for offline viewing.
+
+    Spans nest per thread; work handed to a pool can pass `parent=` explicitly.
+    Listeners are notified when spans start and end, which lets metrics and
+    profilers hook the same instrumentation points.
+    """
+
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.epoch_ns = time.time_ns()
+        self.perf_origin_ns = time.perf_counter_ns()
+        self.spans = []
+        self.listeners = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def current_span(self):
+        stack = getattr(self._local, "stack", None)
+        return stack[-1] if stack else None
+
+    def add_listener(self, listener):
+        """
+        Register an object with optional `on_span_start(span)` / `on_span_end(span)` methods.
+        """
+        self.listeners.append(listener)
+
+    @contextmanager
+    def span(self, name, category="generator", parent=None, **attributes):
+        """
+        Time the enclosed block as a span.
+
+        :param name: Span name.
+        :param category: Coarse grouping (handler, command, template, llm, ...).
+        :param parent: Explicit parent span, for work running on another thread.
+        :param attributes: Initial span attributes.
+        """
+        span = Span(self, name, category, attributes, parent or self.current_span())
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        self._local.stack.append(span)
+        self._notify("on_span_start", span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_ns = time.perf_counter_ns()
+            self._local.stack.pop()
+            with self._lock:
+                self.spans.append(span)
+            self._notify("on_span_end", span)
+
+    def _notify(self, event, span):
+        for listener in self.listeners:
+            callback = getattr(listener, event, None)
+            if callback is None:
+                continue
+            try:
+                callback(span)
+            except Exception as e:
+                logging.warning(f"Span listener {listener.__class__.__name__} failed: {e}")
+
+    def slowest(self, limit=10, category=None):
+        """
+        Finished spans ordered by duration, longest first.
+        """
+        with self._lock:
+            spans = [s for s in self.spans if category is None or s.category == category]
+        return sorted(spans, key=lambda s: s.end_ns - s.start_ns, reverse=True)[:limit]
+
+    def to_chrome_trace(self):
+        """
+        Chrome trace-event format (chrome://tracing, Perfetto, speedscope).
+        """
+        pid = os.getpid()
+        events = []
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            args = dict(span.attributes)
+            if span.error:
+                args["error"] = span.error
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (span.start_ns - self.perf_origin_ns) / 1e3,
+                "dur": (span.end_ns - span.start_ns) / 1e3,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_otlp_json(self, service_name="boilerplate-generator"):
+        """
+        OpenTelemetry OTLP/JSON trace export.
+        """
+        with self._lock:
+            spans = list(self.spans)
+        otlp_spans = []
+        for span in spans:
+            otlp_span = {
+                "traceId": self.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(span.epoch_ns(span.start_ns)),
+                "endTimeUnixNano": str(span.epoch_ns(span.end_ns)),
+                "attributes": [_otlp_attribute("category", span.category)]
+                + [_otlp_attribute(key, value) for key, value in span.attributes.items()],
+                "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+            }
+            if span.parent is not None:
+                otlp_span["parentSpanId"] = span.parent.span_id
+            otlp_spans.append(otlp_span)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", service_name)]},
+                "scopeSpans": [{"scope": {"name": "boilerplate_generator.tracing"}, "spans": otlp_spans}],
+            }]
+        }
+
+    def export(self, output_dir):
+        """
+        Write `trace.chrome.json` and `trace.otlp.json` into the given directory.
+
+        :return: The paths written.
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for name, data in [("trace.chrome.json", self.to_chrome_trace()), ("trace.otlp.json", self.to_otlp_json())]:
+            path = output_dir / name
+            with open(path, "w") as f:
+                json.dump(data, f, default=str)
+            paths.append(path)
+        return paths
+
+
+def _otlp_attribute(key, value):
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+_tracer = Tracer()
+
+
+def get_tracer():
+    """
+    Process-wide tracer shared by the handlers, commands, renders and LLM calls.
+    """
+    return _tracer
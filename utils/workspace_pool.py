@@ -0,0 +1,171 @@
+import fcntl
+import logging
+import os
+import shutil
+import subprocess
+import uuid
+from pathlib import Path
+from utils.helpers import STATE_DIR, chain_handlers
+from utils.manifest import fingerprint
+from utils.staging import OutputStager
+from utils.tracing import get_tracer
+
+POOL_DIR = STATE_DIR / "pool"
+
+# Settings that change what a provisioned workspace contains; workspaces are pooled per combination
+WARM_KEYS = ("package_manager", "frontend_package_manager", "frontend_template", "cache_backend")
+
+# Name the workspaces are provisioned under; the claiming run re-renders everything that uses it
+PLACEHOLDER_NAME = "workspace"
+
+# Files holding credentials generated for the placeholder; the claiming run generates its own
+SECRET_FILES = ("backend/.env", "backend/.env.staging", "backend/.env.production")
+
+
+def pool_key(context):
+    """
+    Identifier of the workspaces that can serve a run with this context.
+    """
+    return fingerprint({key: context.get(key) for key in WARM_KEYS})[:16]
+
+
+class WorkspacePool:
+    """
+    Fully provisioned but unpersonalised project workspaces, kept ready on disk.
+
+    Provisioning runs the slow, project-independent handlers (dependency installs
+    and scaffolds) under a placeholder name. A run claims a ready workspace with
+    an atomic rename and uses it as its staging directory, so the full chain then
+    only applies the project-specific parts: install steps are skipped by the
+    generation manifest, while names, secrets, `.env` files, the Compose file and
+    the Git repository are rendered for the actual project.
+
+    Workspace states are encoded in the directory suffix: `.building` while being
+    provisioned, `.ready` when claimable and `.claimed-<pid>` once taken.
+    """
+
+    def __init__(self, root=POOL_DIR, size=2, fill_command=None):
+        """
+        :param root: Directory holding the pooled workspaces, one subdirectory per pool key.
+        :param size: Number of ready workspaces to keep per pool key.
+        :param fill_command: Command that refills the pool in a separate process.
+        """
+        self.root = Path(root)
+        self.size = size
+        self.fill_command = fill_command
+
+    def ready(self, key):
+        return sorted((self.root / key).glob("*.ready"))
+
+    def status(self):
+        """
+        {pool key: {"ready": n, "building": n, "claimed": n}}
+        """
+        counts = {}
+        if not self.root.is_dir():
+            return counts
+        for directory in sorted(path for path in self.root.iterdir() if path.is_dir()):
+            names = [path.name for path in directory.iterdir()]
+            counts[directory.name] = {
+                "ready": sum(name.endswith(".ready") for name in names),
+                "building": sum(name.endswith(".building") for name in names),
+                "claimed": sum(".claimed-" in name for name in names),
+            }
+        return counts
+
+    def claim(self, context, final_dir):
+        """
+        Take a ready workspace for a project that will be moved to `final_dir`.
+
+        :return: Path of the claimed workspace, or None if none is ready or usable.
+        """
+        final_dir = Path(final_dir)
+        if final_dir.exists():
+            return None  # Existing projects are updated in place
+        key = pool_key(context)
+        for workspace in self.ready(key):
+            # The workspace is moved into place with a rename, which cannot cross file systems
+            if os.stat(workspace).st_dev != os.stat(final_dir.parent).st_dev:
+                logging.info(f"Workspace pool {self.root} is on another file system than {final_dir.parent}.")
+                return None
+            claimed = workspace.with_name(f"{workspace.stem}.claimed-{os.getpid()}")
+            try:
+                os.rename(workspace, claimed)
+            except FileNotFoundError:
+                continue  # Claimed by a concurrent run
+            logging.info(f"Claimed warm workspace {claimed}")
+            return claimed
+        return None
+
+    def refill_async(self):
+        """
+        Start refilling the pool in a detached process that outlives this run.
+        """
+        if not self.fill_command:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / "fill.log", "ab") as log:
+            subprocess.Popen(self.fill_command, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                             start_new_session=True)
+
+    def fill(self, context, build_handlers):
+        """
+        Provision workspaces until `size` are ready for this context.
+
+        Only one filler runs per pool; a concurrent call returns immediately.
+
+        :param build_handlers: Callable returning the handlers that provision a workspace.
+        :return: Number of workspaces provisioned.
+        """
+        key = pool_key(context)
+        directory = self.root / key
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".lock", "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                logging.info("Another process is already filling the workspace pool.")
+                return 0
+            # Only the lock holder provisions, so leftovers of an interrupted filler are stale
+            for stale in directory.glob("*.building"):
+                shutil.rmtree(stale, ignore_errors=True)
+            built = 0
+            while len(self.ready(key)) < self.size:
+                self._provision(directory, context, build_handlers())
+                built += 1
+            return built
+
+    def _provision(self, directory, context, handlers):
+        workspace = directory / f"{uuid.uuid4().hex[:12]}.building"
+        workspace.mkdir()
+        stager = OutputStager(workspace)
+        warm_context = {
+            **context,
+            "project_name": PLACEHOLDER_NAME,
+            "project_dir": workspace,
+            "output_stager": stager,
+        }
+        try:
+            with get_tracer().span("provision workspace", category="pool", workspace=str(workspace)):
+                result = chain_handlers(handlers).handle(warm_context)
+                if result is not None:
+                    raise RuntimeError(result)
+                stager.flush()
+            for relative in SECRET_FILES:
+                (workspace / relative).unlink(missing_ok=True)
+            os.rename(workspace, workspace.with_suffix(".ready"))
+        except BaseException:
+            shutil.rmtree(workspace, ignore_errors=True)
+            raise
+        logging.info(f"Provisioned warm workspace {workspace.with_suffix('.ready')}")
+
+    def clear(self):
+        """
+        Remove every pooled workspace that has not been claimed.
+        """
+        removed = 0
+        for directory in (path for path in self.root.glob("*") if path.is_dir()):
+            for workspace in list(directory.glob("*.ready")) + list(directory.glob("*.building")):
+                shutil.rmtree(workspace, ignore_errors=True)
+                removed += 1
+        return removed